@@ -0,0 +1,323 @@
+import logging
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import shutil
+import time
+from typing import Callable, Optional, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from ConfigHandler import AlphaZeroConfig, ConfigHandler, GameConfig
+from Connect4Bitboard import NO_COLS, NO_ROWS
+from Connect4Game import Connect4
+from Connect4GameFactory import Connect4GameFactory
+from Connect4GameHandler import Connect4GameHandler
+from Connect4Players import MCTSPlayer
+from GameTurnHandler import GameTurnHandler
+from InferenceQueue import create_policy_value_evaluator
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory
+from NumpyPolicyValueModel import NumpyPolicyValueModel
+from RootParallelSearch import seed_numba_random_generator
+from SelfPlayDataset import Samples, SelfPlayDataset
+from TournamentRunner import MatchResult
+
+NO_CELLS = NO_ROWS * NO_COLS
+
+
+class PolicyValueNetwork(Protocol):
+    # interface of PolicyValueModel used for training
+    def do_gradient_step(
+        self,
+        states: npt.NDArray[np.float32],
+        policies: npt.NDArray[np.float32],
+        values: npt.NDArray[np.float32],
+    ) -> float: ...
+
+    def save_weights(self, path: str) -> None: ...
+
+    def load_weights(self, path: str) -> None: ...
+
+    def export_weights(self, path: str) -> None: ...
+
+
+class AlphaZeroTrainer:
+    """Policy iteration with MCTS self-play and a two-headed policy/value network.
+
+    Self-play worker processes play games between MCTS players guided by the best network so far and stream
+    (state, visit distribution, outcome) samples to a SelfPlayDataset. Meanwhile this process trains the network on
+    the newest samples. After every generation of training steps, the network plays a gating match against the best
+    network, and replaces it if its score reaches gating_threshold. Workers pick up a new best network at their next
+    shard.
+    """
+
+    _config: AlphaZeroConfig
+    _config_handler: ConfigHandler
+    _logger_handler: LoggerHandler
+    _logger: logging.Logger
+    _network: PolicyValueNetwork
+    _dataset: SelfPlayDataset
+    _rng: np.random.Generator
+    _workers: list[multiprocessing.Process]
+    _stop_event: multiprocessing.synchronize.Event
+    generation: int
+
+    def __init__(
+        self: "AlphaZeroTrainer",
+        config_handler: ConfigHandler,
+        logger_handler: LoggerHandler,
+        network: PolicyValueNetwork,
+        seed: int | None = None,
+    ) -> None:
+        self._config = AlphaZeroConfig(config_handler)
+        self._config_handler = config_handler
+        self._logger_handler = logger_handler
+        self._logger = logger_handler.get_logger(type(self).__name__)
+        self._network = network
+        self._dataset = SelfPlayDataset(self._config.dataset_path)
+        self._rng = np.random.default_rng(seed)
+        self._workers = []
+        self._stop_event = multiprocessing.Event()
+        self.generation = 0
+
+        # the initial network is the best network until a candidate wins a gating match
+        best_weights_path = get_best_weights_path(self._config.checkpoint_path)
+        if not os.path.exists(best_weights_path):
+            os.makedirs(os.path.dirname(best_weights_path) or ".", exist_ok=True)
+            self._network.export_weights(best_weights_path)
+
+    def get_dataset(self: "AlphaZeroTrainer") -> SelfPlayDataset:
+        return self._dataset
+
+    def run(self: "AlphaZeroTrainer", no_generations: int) -> None:
+        self.start_self_play_workers()
+        try:
+            for _ in range(no_generations):
+                self._wait_for_dataset()
+                self.train_generation()
+        finally:
+            self.stop_self_play_workers()
+
+    def start_self_play_workers(self: "AlphaZeroTrainer") -> None:
+        self._stop_event.clear()
+        seeds = self._rng.integers(0, 2**31 - 1, size=self._config.no_self_play_workers)
+        self._workers = [
+            multiprocessing.Process(
+                target=run_self_play_worker,
+                args=(self._config_handler, int(seed), None, self._stop_event),
+                daemon=True,
+            )
+            for seed in seeds
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._logger.info(f"Started [{len(self._workers)}] self-play workers.")
+
+    def stop_self_play_workers(self: "AlphaZeroTrainer") -> None:
+        # workers finish their current game, the samples of an incomplete shard are discarded
+        self._stop_event.set()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def train_generation(self: "AlphaZeroTrainer") -> MatchResult:
+        states, policies, values = self._dataset.read_latest(self._config.window_size)
+        losses = []
+        for _ in range(self._config.training_steps_per_generation):
+            idx = self._rng.integers(0, len(values), size=self._config.minibatch_size)
+            losses.append(self._network.do_gradient_step(states[idx], policies[idx], values[idx]))
+        self.generation += 1
+        self._logger.info(
+            f"Generation [{self.generation}]: trained on [{len(values)}] samples with loss=[{np.mean(losses):.5f}]",
+        )
+
+        candidate_weights_path = get_candidate_weights_path(self._config.checkpoint_path)
+        self._network.save_weights(get_weights_path(self._config.checkpoint_path))
+        self._network.export_weights(candidate_weights_path)
+
+        match_result = self.play_gating_match(
+            candidate_weights_path,
+            get_best_weights_path(self._config.checkpoint_path),
+        )
+        if match_result.get_score() >= self._config.gating_threshold:
+            # the copy is renamed, so workers never load a partially written file
+            temporary_path = f"{self._config.checkpoint_path}_best.tmp.npz"
+            shutil.copyfile(candidate_weights_path, temporary_path)
+            os.replace(temporary_path, get_best_weights_path(self._config.checkpoint_path))
+            self._logger.info(f"Generation [{self.generation}]: new best network, {match_result}")
+        else:
+            self._logger.info(f"Generation [{self.generation}]: best network is kept, {match_result}")
+        return match_result
+
+    def play_gating_match(
+        self: "AlphaZeroTrainer",
+        candidate_weights_path: str,
+        best_weights_path: str,
+    ) -> MatchResult:
+        # the candidate is player0, the starting player alternates between games
+        game = Connect4GameFactory.create_game(
+            GameConfig(self._config_handler).engine,
+            game_turn_handler=GameTurnHandler([1, -1]),
+        )
+        candidate_player, best_player = (
+            MCTSPlayerFactory.create_player(
+                game,
+                player,
+                -player,
+                self._config.player_name,
+                self._config_handler,
+                self._logger_handler,
+                evaluator=create_policy_value_evaluator(NumpyPolicyValueModel(path).predict),
+            )
+            for player, path in [(1, candidate_weights_path), (-1, best_weights_path)]
+        )
+        game_handler = Connect4GameHandler(
+            game,
+            candidate_player,
+            best_player,
+            self._logger_handler,
+            self._config_handler,
+        )
+
+        match_result = MatchResult("candidate", "best")
+        for game_number in range(self._config.no_gating_games):
+            winner, end_round = game_handler.play_single_game(game_number)
+            match_result.add_game(winner, end_round + 1)
+        game_handler.close()
+        return match_result
+
+    def _wait_for_dataset(self: "AlphaZeroTrainer") -> None:
+        while self._dataset.get_number_of_samples() < self._config.min_dataset_size:
+            if self._workers and not any(worker.is_alive() for worker in self._workers):
+                raise RuntimeError("All self-play workers stopped before the dataset was large enough.")
+            time.sleep(1)
+
+
+def play_self_play_game(
+    game: Connect4,
+    players: list[MCTSPlayer],
+    game_number: int,
+) -> Samples:
+    # plays one game between players[0] (player value 1) and players[1], the starting player alternates with the
+    # game number. Returns the boards seen from the player to move, the visit distributions of their searches and
+    # the outcomes for the player to move.
+    game.reset()
+    for player in players:
+        player.reset()
+    for _ in range(game_number % len(players)):
+        game.next_turn()
+
+    states = []
+    policies = []
+    movers = []
+    for _ in range(game.get_max_rounds()):
+        current_player = game.get_current_player()
+        mcts_player = players[game.get_current_player_turn()]
+        available_actions = game.get_clever_available_actions()
+        action = mcts_player.make_action(game, available_actions)
+
+        states.append(game._get_board().flatten() * current_player)
+        if mcts_player.action_probabilities is not None:
+            policies.append(mcts_player.action_probabilities)
+        else:
+            policies.append(np.eye(game.get_number_of_actions())[action])
+        movers.append(current_player)
+
+        if game.place_disc(action):
+            break
+        game.next_turn()
+
+    winner = game.get_winner()
+    values = np.zeros(len(movers)) if winner is None else np.where(np.array(movers) == winner, 1.0, -1.0)
+    return (
+        np.array(states, dtype=np.float32),
+        np.array(policies, dtype=np.float32),
+        values.astype(np.float32),
+    )
+
+
+def run_self_play_worker(
+    config_handler: ConfigHandler,
+    seed: int,
+    no_games: Optional[int] = None,
+    stop_event: Optional[multiprocessing.synchronize.Event] = None,
+) -> int:
+    # runs in a worker process until no_games are played or the stop event is set, returns the number of games
+    np.random.seed(seed)  # noqa: NPY002
+    seed_numba_random_generator(seed)
+
+    config = AlphaZeroConfig(config_handler)
+    logger_handler = LoggerHandler(config_handler)
+    dataset = SelfPlayDataset(config.dataset_path)
+    best_weights_path = get_best_weights_path(config.checkpoint_path)
+    game_engine = GameConfig(config_handler).engine
+    game = Connect4GameFactory.create_game(game_engine, game_turn_handler=GameTurnHandler([1, -1]))
+
+    def is_stopped(game_number: int) -> bool:
+        return (no_games is not None and game_number >= no_games) or (stop_event is not None and stop_event.is_set())
+
+    game_number = 0
+    weights_modification_time = None
+    players: list[MCTSPlayer] = []
+    while not is_stopped(game_number):
+        # the players are created again when the best network changed
+        if os.path.getmtime(best_weights_path) != weights_modification_time:
+            weights_modification_time = os.path.getmtime(best_weights_path)
+            evaluator = create_policy_value_evaluator(NumpyPolicyValueModel(best_weights_path).predict)
+            players = create_self_play_players(game, config.player_name, config_handler, logger_handler, evaluator)
+
+        shard = []
+        while len(shard) < config.games_per_shard and not is_stopped(game_number):
+            shard.append(play_self_play_game(game, players, game_number))
+            game_number += 1
+
+        # a shard cut short by the stop event is discarded, the last shard of a fixed number of games is kept
+        if len(shard) == config.games_per_shard or (no_games is not None and shard):
+            dataset.write_shard(*(np.concatenate(arrays) for arrays in zip(*shard)))
+
+    for player in players:
+        player.close()
+    return game_number
+
+
+def create_self_play_players(
+    game: Connect4,
+    player_name: str,
+    config_handler: ConfigHandler,
+    logger_handler: LoggerHandler,
+    evaluator: Callable,
+) -> list[MCTSPlayer]:
+    return [
+        MCTSPlayerFactory.create_player(game, player, -player, player_name, config_handler, logger_handler, evaluator)
+        for player in [1, -1]
+    ]
+
+
+def get_best_weights_path(checkpoint_path: str) -> str:
+    return f"{checkpoint_path}_best.npz"
+
+
+def get_candidate_weights_path(checkpoint_path: str) -> str:
+    return f"{checkpoint_path}_candidate.npz"
+
+
+def get_weights_path(checkpoint_path: str) -> str:
+    # keras weights of the trained network, to continue training
+    return f"{checkpoint_path}.weights.h5"
+
+
+if __name__ == "__main__":
+    # tensorflow is only needed for training, the self-play workers use NumpyPolicyValueModel
+    from PolicyValueModel import PolicyValueModel
+
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    config = AlphaZeroConfig(config_handler)
+    network = PolicyValueModel(NO_CELLS, NO_COLS, config.no_layers, config.units, learning_rate=config.learning_rate)
+    if os.path.exists(get_weights_path(config.checkpoint_path)):
+        network.load_weights(get_weights_path(config.checkpoint_path))
+
+    trainer = AlphaZeroTrainer(config_handler, logger_handler, network)
+    trainer.run(int(1e9))
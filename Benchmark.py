@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+
+from ConfigHandler import BenchmarkConfig, ConfigHandler, GameConfig, MCTSPlayerConfig
+from Connect4Game import Connect4
+from Connect4GameFactory import Connect4GameEngines, Connect4GameFactory
+from Connect4GameHandler import Connect4GameHandler
+from Connect4Players import MCTSPlayer, RandomPlayer
+from GameTurnHandler import GameTurnHandler
+from IPlayer import IPlayer
+from LoggerHandler import LoggerHandler
+from RootParallelSearch import seed_numba_random_generator
+from Tree import select_node_action_ucb1_numba
+from TreeFactory import TreeTypes
+
+RANDOM_PLAYER_NAME = "random"
+# metrics with this suffix are better when smaller, all others when larger
+LOWER_IS_BETTER_SUFFIX = "_bytes_per_node"
+
+
+class Benchmark:
+    """Reproducible benchmarks of the game engines, the MCTS kernels and complete games.
+
+    Every benchmark is run once before it is timed, so numba compilation is not part of the timings. Results are a
+    flat dict of metric name to value, which is saved as JSON and compared against a baseline run.
+    """
+
+    _config: BenchmarkConfig
+    _config_handler: ConfigHandler
+    _logger_handler: LoggerHandler
+    _logger: logging.Logger
+
+    def __init__(self: "Benchmark", config_handler: ConfigHandler, logger_handler: LoggerHandler) -> None:
+        self._config = BenchmarkConfig(config_handler)
+        self._config_handler = config_handler
+        self._logger_handler = logger_handler
+        self._logger = logger_handler.get_logger(type(self).__name__)
+
+    def run(self: "Benchmark") -> dict[str, float]:
+        results: dict[str, float] = {}
+        for engine in [Connect4GameEngines.numpy, Connect4GameEngines.bitboard]:
+            results.update(self.benchmark_game_engine(engine))
+        results.update(self.benchmark_selection_kernel())
+        for name in self._config.difficulties:
+            results.update(self.benchmark_search(name))
+        for tree_type in [TreeTypes.dictionary, TreeTypes.array]:
+            results.update(self.benchmark_tree_memory(tree_type))
+        for name in self._config.game_player_names:
+            results.update(self.benchmark_games(name))
+
+        for metric, value in results.items():
+            self._logger.info(f"{metric}=[{value:.1f}]")
+        return results
+
+    def benchmark_game_engine(self: "Benchmark", engine: str) -> dict[str, float]:
+        self._seed()
+        action_sequences = get_random_action_sequences(10)
+        game = Connect4GameFactory.create_game(engine, game_turn_handler=GameTurnHandler([1, -1]))
+        no_moves = sum(len(actions) for actions in action_sequences)
+
+        def play_action_sequences() -> None:
+            for actions in action_sequences:
+                game.reset()
+                for action in actions:
+                    game.place_disc(action)
+                    game.next_turn()
+
+        # positions in the middle of the game
+        mid_game = Connect4GameFactory.create_game(engine, game_turn_handler=GameTurnHandler([1, -1]))
+        for action in action_sequences[0][: len(action_sequences[0]) // 2]:
+            mid_game.place_disc(action)
+            mid_game.next_turn()
+
+        return {
+            f"place_disc_per_second.{engine}": no_moves * measure_rate(play_action_sequences, self._config.min_time_s),
+            f"copy_per_second.{engine}": measure_rate(mid_game.copy, self._config.min_time_s),
+            f"get_clever_available_actions_per_second.{engine}": measure_rate(
+                mid_game.get_clever_available_actions,
+                self._config.min_time_s,
+            ),
+        }
+
+    def benchmark_selection_kernel(self: "Benchmark") -> dict[str, float]:
+        self._seed()
+        rng = np.random.default_rng(self._config.seed)
+        no_visits_actions = rng.integers(1, 100, size=7).astype(np.float64)
+        arguments = (
+            rng.random(7),
+            int(np.sum(no_visits_actions)),
+            no_visits_actions,
+            4.0,
+            rng.random(7),
+            rng.integers(1, 100, size=7).astype(np.float64),
+            True,
+            1.0,
+            np.arange(7),
+            True,
+            np.full(7, 1 / 7),
+            np.zeros(7, dtype=np.int64),
+            0.0,
+        )
+
+        def select() -> None:
+            select_node_action_ucb1_numba(*arguments)
+
+        return {"select_node_action_ucb1_numba_per_second": measure_rate(select, self._config.min_time_s)}
+
+    def benchmark_search(self: "Benchmark", name: str) -> dict[str, float]:
+        # searches of a new player from the first positions of a random game, warmed up on the empty board
+        self._seed()
+        self._create_mcts_player(name).make_action(*get_game_and_actions([]))
+
+        no_playouts = 0
+        search_time = 0.0
+        for actions in get_random_action_sequences(self._config.no_search_positions):
+            game, available_actions = get_game_and_actions(actions[: len(actions) // 3])
+            mcts_player = self._create_mcts_player(name)
+            start_time = time.perf_counter()
+            mcts_player.make_action(game, available_actions)
+            search_time += time.perf_counter() - start_time
+            no_playouts += mcts_player.number_of_playouts
+            mcts_player.close()
+        return {f"simulations_per_second.{name}": no_playouts / search_time}
+
+    def benchmark_tree_memory(self: "Benchmark", tree_type: str) -> dict[str, float]:
+        # memory allocated while building a tree from the empty board, divided by its number of nodes. The last
+        # difficulty builds the largest tree, so preallocated capacity of the array tree weighs least
+        name = self._config.difficulties[-1]
+        self._seed()
+        self._create_mcts_player(name, tree_type).make_action(*get_game_and_actions([]))
+
+        self._seed()
+        tracemalloc.start()
+        memory_before_search = tracemalloc.get_traced_memory()[0]
+        mcts_player = self._create_mcts_player(name, tree_type)
+        mcts_player.make_action(*get_game_and_actions([]))
+        tree_memory = tracemalloc.get_traced_memory()[0] - memory_before_search
+        tracemalloc.stop()
+
+        no_nodes = mcts_player.get_number_of_nodes()
+        mcts_player.close()
+        return {f"tree_bytes_per_node.{tree_type}": tree_memory / no_nodes}
+
+    def benchmark_games(self: "Benchmark", name: str) -> dict[str, float]:
+        self._seed()
+        game = Connect4GameFactory.create_game(
+            GameConfig(self._config_handler).engine,
+            game_turn_handler=GameTurnHandler([1, -1]),
+        )
+        players = [self._create_player(name, game, player) for player in [1, -1]]
+        game_handler = Connect4GameHandler(game, players[0], players[1], self._logger_handler, self._config_handler)
+        game_handler.play_n_games(1)
+
+        start_time = time.perf_counter()
+        game_handler.play_n_games(self._config.no_games)
+        games_time = time.perf_counter() - start_time
+        game_handler.close()
+        return {f"games_per_second.{name}": self._config.no_games / games_time}
+
+    def _create_player(self: "Benchmark", name: str, game: Connect4, player: int) -> IPlayer:
+        if name == RANDOM_PLAYER_NAME:
+            return RandomPlayer()
+        return self._create_mcts_player(name, game=game, player=player)
+
+    def _create_mcts_player(
+        self: "Benchmark",
+        name: str,
+        tree_type: str | None = None,
+        game: Connect4 | None = None,
+        player: int = 1,
+    ) -> MCTSPlayer:
+        # pondering would search in the background of the timed searches
+        mcts_config = MCTSPlayerConfig(self._config_handler, name)
+        mcts_config.ponder = False
+        if tree_type is not None:
+            mcts_config.tree_type = tree_type
+        if game is None:
+            game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        return MCTSPlayer(game, player, -player, mcts_config, self._logger_handler)
+
+    def _seed(self: "Benchmark") -> None:
+        np.random.seed(self._config.seed)  # noqa: NPY002
+        seed_numba_random_generator(self._config.seed)
+
+
+def measure_rate(function: Callable[[], object], min_time_s: float) -> float:
+    # calls per second of function, measured in rounds of doubling length after a warm-up call
+    function()
+
+    no_calls = 0
+    elapsed_time = 0.0
+    no_calls_round = 1
+    while elapsed_time < min_time_s:
+        start_time = time.perf_counter()
+        for _ in range(no_calls_round):
+            function()
+        elapsed_time += time.perf_counter() - start_time
+        no_calls += no_calls_round
+        no_calls_round *= 2
+    return no_calls / elapsed_time
+
+
+def get_random_action_sequences(no_games: int) -> list[list[int]]:
+    # actions of complete random games, drawn from the numpy random state
+    action_sequences = []
+    for _ in range(no_games):
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        actions = []
+        for _ in range(game.get_max_rounds()):
+            action = int(np.random.choice(game.get_available_actions()))  # noqa: NPY002
+            actions.append(action)
+            if game.place_disc(action):
+                break
+            game.next_turn()
+        action_sequences.append(actions)
+    return action_sequences
+
+
+def get_game_and_actions(actions: list[int]) -> tuple[Connect4, list[int]]:
+    game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+    for action in actions:
+        game.place_disc(action)
+        game.next_turn()
+    return game, game.get_clever_available_actions()
+
+
+def compare_to_baseline(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    regression_threshold: float,
+) -> list[str]:
+    # metrics which are worse than the baseline by more than the relative regression threshold
+    regressions = []
+    for metric, value in results.items():
+        if metric not in baseline:
+            continue
+        if metric.split(".")[0].endswith(LOWER_IS_BETTER_SUFFIX):
+            relative_change = value / baseline[metric] - 1
+        else:
+            relative_change = 1 - value / baseline[metric]
+        if relative_change > regression_threshold:
+            regressions.append(
+                f"{metric}: [{value:.1f}] is [{100 * relative_change:.1f}%] worse than "
+                f"baseline [{baseline[metric]:.1f}]",
+            )
+    return regressions
+
+
+def save_results(path: str, results: dict[str, float]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+def load_results(path: str) -> dict[str, float]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def main() -> None:
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    config = BenchmarkConfig(config_handler)
+    logger = logger_handler.get_logger(Benchmark.__name__)
+
+    results = Benchmark(config_handler, logger_handler).run()
+    save_results(config.results_path, results)
+    logger.info(f"Saved benchmark results to [{config.results_path}].")
+
+    if config.baseline_path is None:
+        return
+    regressions = compare_to_baseline(results, load_results(config.baseline_path), config.regression_threshold)
+    for regression in regressions:
+        logger.warning(regression)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
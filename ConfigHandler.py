@@ -55,6 +55,19 @@ class MCTSPlayerConfig:
     reuse_tree: bool
     randomize_action: bool
     rollout_weight: float
+    game_engine: str
+    compiled_rollout: bool
+    tree_type: str
+    root_parallel_workers: int
+    tree_parallel_threads: int
+    virtual_loss: float
+    time_limit_ms: float | None
+    ponder: bool
+    prune_tree: bool
+    max_number_of_nodes: int | None
+    opening_book_path: str | None
+    symmetric_tree: bool
+    collect_statistics: bool
     _config_section: str
     _config_section_default: str
     _config_handler: ConfigHandler
@@ -72,6 +85,19 @@ class MCTSPlayerConfig:
         self._get_reuse_tree()
         self._get_randomize_action()
         self._get_rollout_weight()
+        self._get_game_engine()
+        self._get_compiled_rollout()
+        self._get_tree_type()
+        self._get_root_parallel_workers()
+        self._get_tree_parallel_threads()
+        self._get_virtual_loss()
+        self._get_time_limit_ms()
+        self._get_ponder()
+        self._get_prune_tree()
+        self._get_max_number_of_nodes()
+        self._get_opening_book_path()
+        self._get_symmetric_tree()
+        self._get_collect_statistics()
 
     def _get_max_count(self: "MCTSPlayerConfig") -> None:
         max_count = self._config_handler.get_config_or_alternative(
@@ -130,6 +156,255 @@ class MCTSPlayerConfig:
         if rollout_weight_float is not None:
             self.rollout_weight = rollout_weight_float  # Okay for rav_param to be None
 
+    def _get_game_engine(self: "MCTSPlayerConfig") -> None:
+        self.game_engine = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "game_engine",
+        )
+
+    def _get_compiled_rollout(self: "MCTSPlayerConfig") -> None:
+        compiled_rollout = self._config_handler.get_config_boolean_or_alternative(
+            self._config_section,
+            self._config_section_default,
+            "compiled_rollout",
+        )
+        self.compiled_rollout = compiled_rollout
+
+    def _get_tree_type(self: "MCTSPlayerConfig") -> None:
+        self.tree_type = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "tree_type",
+        )
+
+    def _get_root_parallel_workers(self: "MCTSPlayerConfig") -> None:
+        root_parallel_workers = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "root_parallel_workers",
+        )
+        root_parallel_workers_int = ConfigTypeConverter.to_int(root_parallel_workers)
+        if root_parallel_workers_int is not None:
+            self.root_parallel_workers = root_parallel_workers_int
+
+    def _get_tree_parallel_threads(self: "MCTSPlayerConfig") -> None:
+        tree_parallel_threads = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "tree_parallel_threads",
+        )
+        tree_parallel_threads_int = ConfigTypeConverter.to_int(tree_parallel_threads)
+        if tree_parallel_threads_int is not None:
+            self.tree_parallel_threads = tree_parallel_threads_int
+
+    def _get_virtual_loss(self: "MCTSPlayerConfig") -> None:
+        virtual_loss = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "virtual_loss",
+        )
+        virtual_loss_float = ConfigTypeConverter.to_float(virtual_loss)
+        if virtual_loss_float is not None:
+            self.virtual_loss = virtual_loss_float
+
+    def _get_time_limit_ms(self: "MCTSPlayerConfig") -> None:
+        time_limit_ms = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "time_limit_ms",
+        )
+        self.time_limit_ms = ConfigTypeConverter.to_float(time_limit_ms)  # Okay for time_limit_ms to be None
+
+    def _get_ponder(self: "MCTSPlayerConfig") -> None:
+        ponder = self._config_handler.get_config_boolean_or_alternative(
+            self._config_section,
+            self._config_section_default,
+            "ponder",
+        )
+        self.ponder = ponder
+
+    def _get_prune_tree(self: "MCTSPlayerConfig") -> None:
+        prune_tree = self._config_handler.get_config_boolean_or_alternative(
+            self._config_section,
+            self._config_section_default,
+            "prune_tree",
+        )
+        self.prune_tree = prune_tree
+
+    def _get_max_number_of_nodes(self: "MCTSPlayerConfig") -> None:
+        max_number_of_nodes = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "max_number_of_nodes",
+        )
+        self.max_number_of_nodes = ConfigTypeConverter.to_int(max_number_of_nodes)  # Okay to be None (no cap)
+
+    def _get_opening_book_path(self: "MCTSPlayerConfig") -> None:
+        opening_book_path = self._config_handler.get_config_or_alternative(
+            self._config_section, self._config_section_default, "opening_book_path",
+        )
+        self.opening_book_path = opening_book_path if opening_book_path != "None" else None  # Okay to be None
+
+    def _get_symmetric_tree(self: "MCTSPlayerConfig") -> None:
+        symmetric_tree = self._config_handler.get_config_boolean_or_alternative(
+            self._config_section,
+            self._config_section_default,
+            "symmetric_tree",
+        )
+        self.symmetric_tree = symmetric_tree
+
+    def _get_collect_statistics(self: "MCTSPlayerConfig") -> None:
+        collect_statistics = self._config_handler.get_config_boolean_or_alternative(
+            self._config_section,
+            self._config_section_default,
+            "collect_statistics",
+        )
+        self.collect_statistics = collect_statistics
+
+
+class GameConfig:
+    engine: str
+    record_path: str | None
+
+    def __init__(self: "GameConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "game"
+
+        # Get configs from config_handler
+        self.engine = config_handler.get_config(config_section, "engine")
+        record_path = config_handler.get_config(config_section, "record_path")
+        self.record_path = record_path if record_path != "None" else None  # Okay to be None
+
+
+class TournamentConfig:
+    number_of_workers: int
+    min_number_of_games: int
+    confidence_z: float
+
+    def __init__(self: "TournamentConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "tournament"
+
+        # Get configs from config_handler
+        self.number_of_workers = int(float(config_handler.get_config(config_section, "number_of_workers")))
+        self.min_number_of_games = int(float(config_handler.get_config(config_section, "min_number_of_games")))
+        self.confidence_z = float(config_handler.get_config(config_section, "confidence_z"))
+
+
+class OpeningBookConfig:
+    path: str
+    no_plies: int
+    player_name: str
+
+    def __init__(self: "OpeningBookConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "opening_book"
+
+        # Get configs from config_handler
+        self.path = config_handler.get_config(config_section, "path")
+        self.no_plies = int(float(config_handler.get_config(config_section, "no_plies")))
+        self.player_name = config_handler.get_config(config_section, "player_name")
+
+
+class SolverConfig:
+    time_limit_ms: float | None
+    transposition_table_size_log2: int
+
+    def __init__(self: "SolverConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "solver"
+
+        # Get configs from config_handler
+        self.time_limit_ms = ConfigTypeConverter.to_float(config_handler.get_config(config_section, "time_limit_ms"))
+        self.transposition_table_size_log2 = int(
+            float(config_handler.get_config(config_section, "transposition_table_size_log2")),
+        )
+
+
+class DQNConfig:
+    no_environments: int
+    replay_buffer_size: int
+    min_replay_buffer_size: int
+    minibatch_size: int
+    discount: float
+    no_layers: int
+    units: int
+    learning_rate: float
+    epsilon_start: float
+    epsilon_end: float
+    epsilon_decay_steps: int
+    target_sync_interval: int
+    checkpoint_interval: int
+    checkpoint_path: str
+
+    def __init__(self: "DQNConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "dqn"
+
+        # Get configs from config_handler
+        self.no_environments = int(float(config_handler.get_config(config_section, "no_environments")))
+        self.replay_buffer_size = int(float(config_handler.get_config(config_section, "replay_buffer_size")))
+        self.min_replay_buffer_size = int(float(config_handler.get_config(config_section, "min_replay_buffer_size")))
+        self.minibatch_size = int(float(config_handler.get_config(config_section, "minibatch_size")))
+        self.discount = float(config_handler.get_config(config_section, "discount"))
+        self.no_layers = int(float(config_handler.get_config(config_section, "no_layers")))
+        self.units = int(float(config_handler.get_config(config_section, "units")))
+        self.learning_rate = float(config_handler.get_config(config_section, "learning_rate"))
+        self.epsilon_start = float(config_handler.get_config(config_section, "epsilon_start"))
+        self.epsilon_end = float(config_handler.get_config(config_section, "epsilon_end"))
+        self.epsilon_decay_steps = int(float(config_handler.get_config(config_section, "epsilon_decay_steps")))
+        self.target_sync_interval = int(float(config_handler.get_config(config_section, "target_sync_interval")))
+        self.checkpoint_interval = int(float(config_handler.get_config(config_section, "checkpoint_interval")))
+        self.checkpoint_path = config_handler.get_config(config_section, "checkpoint_path")
+
+
+class AlphaZeroConfig:
+    no_self_play_workers: int
+    player_name: str
+    dataset_path: str
+    games_per_shard: int
+    window_size: int
+    min_dataset_size: int
+    minibatch_size: int
+    no_layers: int
+    units: int
+    learning_rate: float
+    training_steps_per_generation: int
+    no_gating_games: int
+    gating_threshold: float
+    checkpoint_path: str
+
+    def __init__(self: "AlphaZeroConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "alphazero"
+
+        # Get configs from config_handler
+        self.no_self_play_workers = int(float(config_handler.get_config(config_section, "no_self_play_workers")))
+        self.player_name = config_handler.get_config(config_section, "player_name")
+        self.dataset_path = config_handler.get_config(config_section, "dataset_path")
+        self.games_per_shard = int(float(config_handler.get_config(config_section, "games_per_shard")))
+        self.window_size = int(float(config_handler.get_config(config_section, "window_size")))
+        self.min_dataset_size = int(float(config_handler.get_config(config_section, "min_dataset_size")))
+        self.minibatch_size = int(float(config_handler.get_config(config_section, "minibatch_size")))
+        self.no_layers = int(float(config_handler.get_config(config_section, "no_layers")))
+        self.units = int(float(config_handler.get_config(config_section, "units")))
+        self.learning_rate = float(config_handler.get_config(config_section, "learning_rate"))
+        self.training_steps_per_generation = int(
+            float(config_handler.get_config(config_section, "training_steps_per_generation")),
+        )
+        self.no_gating_games = int(float(config_handler.get_config(config_section, "no_gating_games")))
+        self.gating_threshold = float(config_handler.get_config(config_section, "gating_threshold"))
+        self.checkpoint_path = config_handler.get_config(config_section, "checkpoint_path")
+
+
+class BenchmarkConfig:
+    seed: int
+    min_time_s: float
+    no_search_positions: int
+    difficulties: list[str]
+    game_player_names: list[str]
+    no_games: int
+    results_path: str
+    baseline_path: str | None
+    regression_threshold: float
+
+    def __init__(self: "BenchmarkConfig", config_handler: ConfigHandler) -> None:
+        config_section: str = "benchmark"
+
+        # Get configs from config_handler
+        self.seed = int(float(config_handler.get_config(config_section, "seed")))
+        self.min_time_s = float(config_handler.get_config(config_section, "min_time_s"))
+        self.no_search_positions = int(float(config_handler.get_config(config_section, "no_search_positions")))
+        self.difficulties = config_handler.get_config(config_section, "difficulties").split(",")
+        self.game_player_names = config_handler.get_config(config_section, "game_player_names").split(",")
+        self.no_games = int(float(config_handler.get_config(config_section, "no_games")))
+        self.results_path = config_handler.get_config(config_section, "results_path")
+        baseline_path = config_handler.get_config(config_section, "baseline_path")
+        self.baseline_path = baseline_path if baseline_path != "None" else None  # Okay to be None
+        self.regression_threshold = float(config_handler.get_config(config_section, "regression_threshold"))
+
+
 class LoggerConfig:
     log_path: str
     log_level: str
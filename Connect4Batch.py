@@ -0,0 +1,237 @@
+from typing import Optional, Tuple
+
+import numba  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Bitboard import (
+    BOARD_MASK,
+    BOTTOM_MASK,
+    COLUMN_HEIGHT,
+    COLUMN_MASKS,
+    NO_COLS,
+    NO_ROWS,
+    find_clever_action_bits,
+    has_four_in_a_row,
+)
+
+
+class Connect4Batch:
+    """Batch of Connect4 games on bitboards that are advanced in lockstep.
+
+    Game i is given by _positions[i] (discs of player value 1), _masks[i] (all discs) and _current_players[i].
+    step applies one action per game and resets the games that are finished. The player starting a game
+    alternates between consecutive games of the same slot.
+    """
+
+    _batch_size: int
+    _positions: npt.NDArray[np.int64]
+    _masks: npt.NDArray[np.int64]
+    _next_row_heights: npt.NDArray[np.int64]
+    _rounds: npt.NDArray[np.int64]
+    _current_players: npt.NDArray[np.int64]
+    _starting_players: npt.NDArray[np.int64]
+    _last_players: npt.NDArray[np.int64]
+
+    def __init__(
+        self: "Connect4Batch",
+        batch_size: int,
+        starting_players: Optional[npt.NDArray[np.int64]] = None,
+    ) -> None:
+        self._batch_size = batch_size
+        if starting_players is None:
+            # every second slot starts with player -1
+            starting_players = np.where(np.arange(batch_size) % 2 == 0, 1, -1)
+        self._starting_players = np.array(starting_players, dtype=np.int64)
+
+        self._positions = np.zeros(batch_size, dtype=np.int64)
+        self._masks = np.zeros(batch_size, dtype=np.int64)
+        self._next_row_heights = np.zeros((batch_size, NO_COLS), dtype=np.int64)
+        self._rounds = np.zeros(batch_size, dtype=np.int64)
+        self._current_players = self._starting_players.copy()
+        self._last_players = np.zeros(batch_size, dtype=np.int64)
+
+    def reset(self: "Connect4Batch") -> None:
+        self._positions[:] = 0
+        self._masks[:] = 0
+        self._next_row_heights[:] = 0
+        self._rounds[:] = 0
+        self._current_players[:] = self._starting_players
+        self._last_players[:] = 0
+
+    def step(
+        self: "Connect4Batch",
+        actions: npt.NDArray[np.int64],
+    ) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        # actions < 0 leave a game untouched, returns masks of the games that were won and drawn by the actions
+        return step_batch(
+            self._positions,
+            self._masks,
+            self._next_row_heights,
+            self._rounds,
+            self._current_players,
+            self._starting_players,
+            self._last_players,
+            np.asarray(actions, dtype=np.int64),
+        )
+
+    def get_batch_size(self: "Connect4Batch") -> int:
+        return self._batch_size
+
+    def get_current_players(self: "Connect4Batch") -> npt.NDArray[np.int64]:
+        return self._current_players
+
+    def get_starting_players(self: "Connect4Batch") -> npt.NDArray[np.int64]:
+        return self._starting_players
+
+    def get_last_players(self: "Connect4Batch") -> npt.NDArray[np.int64]:
+        # player who made the latest action of every game (also after a finished game is reset)
+        return self._last_players
+
+    def get_rounds(self: "Connect4Batch") -> npt.NDArray[np.int64]:
+        return self._rounds
+
+    def get_boards(self: "Connect4Batch") -> npt.NDArray[np.float64]:
+        # (batch_size, no_rows, no_cols) boards in the layout of Connect4._get_board
+        bits = np.arange(NO_COLS)[None, :] * COLUMN_HEIGHT + np.arange(NO_ROWS)[:, None]
+        occupied = (self._masks[:, None, None] >> bits) & 1
+        player_one = (self._positions[:, None, None] >> bits) & 1
+        return (occupied * (2 * player_one - 1)).astype(np.float64)
+
+    def get_available_actions(self: "Connect4Batch") -> npt.NDArray[np.bool_]:
+        return bits_to_action_masks((self._masks + BOTTOM_MASK) & BOARD_MASK)
+
+    def get_clever_available_actions(self: "Connect4Batch") -> npt.NDArray[np.bool_]:
+        return bits_to_action_masks(find_clever_action_bits_batch(self._positions, self._masks, self._current_players))
+
+    def make_random_actions(self: "Connect4Batch", clever: bool = True) -> npt.NDArray[np.int64]:
+        action_masks = self.get_clever_available_actions() if clever else self.get_available_actions()
+        return choose_random_actions(action_masks)
+
+
+def play_random_games(
+    no_games: int,
+    batch_size: int = 1024,
+    clever: bool = True,
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # plays no_games random (or clever random) games, returns the winners (0 for a draw) and the starting players
+    batch = Connect4Batch(min(batch_size, no_games))
+    winners = np.empty(no_games, dtype=np.int64)
+    starting_players = np.empty(no_games, dtype=np.int64)
+    active = np.ones(batch.get_batch_size(), dtype=np.bool_)
+    no_started_games = batch.get_batch_size()
+    no_finished_games = 0
+
+    while no_finished_games < no_games:
+        slot_starting_players = batch.get_starting_players().copy()
+        actions = np.where(active, batch.make_random_actions(clever), -1)
+        is_won, is_draw = batch.step(actions)
+
+        finished = np.flatnonzero(is_won | is_draw)
+        game_idx = np.arange(no_finished_games, no_finished_games + len(finished))
+        winners[game_idx] = np.where(is_won[finished], batch.get_last_players()[finished], 0)
+        starting_players[game_idx] = slot_starting_players[finished]
+        no_finished_games += len(finished)
+
+        # slots are stopped once all games are started
+        for slot in finished:
+            if no_started_games < no_games:
+                no_started_games += 1
+            else:
+                active[slot] = False
+
+    return winners, starting_players
+
+
+@numba.njit
+def step_batch(
+    positions: npt.NDArray[np.int64],
+    masks: npt.NDArray[np.int64],
+    next_row_heights: npt.NDArray[np.int64],
+    rounds: npt.NDArray[np.int64],
+    current_players: npt.NDArray[np.int64],
+    starting_players: npt.NDArray[np.int64],
+    last_players: npt.NDArray[np.int64],
+    actions: npt.NDArray[np.int64],
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+    batch_size = len(actions)
+    is_won = np.zeros(batch_size, dtype=np.bool_)
+    is_draw = np.zeros(batch_size, dtype=np.bool_)
+
+    for idx in range(batch_size):
+        action = actions[idx]
+        if action < 0:
+            continue
+
+        # place disc
+        player = current_players[idx]
+        move = np.int64(1) << (action * COLUMN_HEIGHT + next_row_heights[idx, action])
+        masks[idx] |= move
+        if player == 1:
+            positions[idx] |= move
+        next_row_heights[idx, action] += 1
+        rounds[idx] += 1
+        last_players[idx] = player
+
+        # check for win or draw
+        player_position = positions[idx] if player == 1 else masks[idx] ^ positions[idx]
+        if has_four_in_a_row(player_position):
+            is_won[idx] = True
+        elif rounds[idx] == NO_ROWS * NO_COLS:
+            is_draw[idx] = True
+        else:
+            current_players[idx] = -player
+            continue
+
+        # reset finished game, the other player starts the next game
+        positions[idx] = 0
+        masks[idx] = 0
+        next_row_heights[idx, :] = 0
+        rounds[idx] = 0
+        starting_players[idx] = -starting_players[idx]
+        current_players[idx] = starting_players[idx]
+
+    return is_won, is_draw
+
+
+@numba.njit
+def find_clever_action_bits_batch(
+    positions: npt.NDArray[np.int64],
+    masks: npt.NDArray[np.int64],
+    current_players: npt.NDArray[np.int64],
+) -> npt.NDArray[np.int64]:
+    clever_action_bits = np.empty(len(masks), dtype=np.int64)
+    for idx in range(len(masks)):
+        foe_position = masks[idx] ^ positions[idx]
+        if current_players[idx] == 1:
+            clever_action_bits[idx] = find_clever_action_bits(positions[idx], foe_position, masks[idx])
+        else:
+            clever_action_bits[idx] = find_clever_action_bits(foe_position, positions[idx], masks[idx])
+    return clever_action_bits
+
+
+@numba.njit
+def bits_to_action_masks(bits: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+    action_masks = np.zeros((len(bits), NO_COLS), dtype=np.bool_)
+    for idx in range(len(bits)):
+        for col in range(NO_COLS):
+            action_masks[idx, col] = (bits[idx] & COLUMN_MASKS[col]) != 0
+    return action_masks
+
+
+@numba.njit
+def choose_random_actions(action_masks: npt.NDArray[np.bool_]) -> npt.NDArray[np.int64]:
+    # uniform choice among the allowed actions of every game, -1 if no action is allowed
+    actions = np.full(len(action_masks), -1, dtype=np.int64)
+    for idx in range(len(action_masks)):
+        no_actions = np.sum(action_masks[idx])
+        if no_actions == 0:
+            continue
+        choice = np.random.randint(no_actions)  # noqa: NPY002
+        for col in range(NO_COLS):
+            if action_masks[idx, col]:
+                if choice == 0:
+                    actions[idx] = col
+                    break
+                choice -= 1
+    return actions
@@ -0,0 +1,312 @@
+from typing import Optional, Tuple
+
+import numba  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Game import Connect4
+
+# Bitboard layout: every column uses (no_rows + 1) bits, bit index = col * (no_rows + 1) + row.
+# The extra bit on top of each column is a sentinel, so shifts never wrap into the next column.
+NO_ROWS = 6
+NO_COLS = 7
+COLUMN_HEIGHT = NO_ROWS + 1
+
+BOTTOM_MASK = sum(1 << (col * COLUMN_HEIGHT) for col in range(NO_COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << NO_ROWS) - 1)
+COLUMN_MASKS = tuple(((1 << NO_ROWS) - 1) << (col * COLUMN_HEIGHT) for col in range(NO_COLS))
+
+
+class Connect4Bitboard(Connect4):
+    """Connect4 game backed by two integer bitboards.
+
+    _mask holds every disc on the board and _position holds the discs of player value 1.
+    The discs of player value -1 are therefore given by _mask ^ _position.
+    """
+
+    _mask: int
+    _position: int
+    _winner: int | None
+    _last_player: int | None
+    _round: int
+    _starting_player: int
+
+    def place_disc(self: "Connect4Bitboard", col: int) -> bool:
+        return self._place_disc(col, self.get_current_player())
+
+    def _place_disc(self: "Connect4Bitboard", col: int, player: int) -> bool:
+        # place disc
+        row = int(self.next_row_height[col])
+        move = 1 << (int(col) * COLUMN_HEIGHT + row)
+        self._mask |= move
+        if player == 1:
+            self._position |= move
+
+        # update next_row_height
+        self.next_row_height[col] += 1
+        #update last_player
+        self._last_player = player
+        #update round
+        self._round += 1
+
+        # check for win
+        if self._winner is not None:
+            return True
+        elif has_four_in_a_row(self._get_player_position(player)):
+            self._winner = player
+            return True
+        else:
+            return False
+
+    def get_last_player(self: "Connect4Bitboard") -> int | None:
+        return self._last_player
+
+    def get_winner(self: "Connect4Bitboard") -> int | None:
+        return self._winner
+
+    def get_round(self: "Connect4Bitboard") -> int:
+        return self._round
+
+    def _get_starting_player(self: "Connect4Bitboard") -> int:
+        return self._starting_player
+
+    def _set_starting_player(self: "Connect4Bitboard", starting_player: int) -> None:
+        self._starting_player = starting_player
+
+    def _get_player_position(self: "Connect4Bitboard", player: int) -> int:
+        return self._position if player == 1 else self._mask ^ self._position
+
+    def _get_board(self: "Connect4Bitboard") -> npt.NDArray[np.float64]:
+        return bitboard_to_board(self._position, self._mask)
+
+    def get_state_hash(self: "Connect4Bitboard") -> int:
+        # position + mask is a unique key for a position (the sentinel bits keep columns apart)
+        return self._position + self._mask
+
+    def get_mirrored_state_hash(self: "Connect4Bitboard") -> int:
+        # columns of position + mask do not overlap, so the key can be mirrored as a whole
+        return mirror_bitboard(self._position + self._mask)
+
+    def reset(self: "Connect4Bitboard", game: Optional[Connect4] = None) -> None:
+        if game is None:
+            self._mask = 0
+            self._position = 0
+            self.next_row_height = np.zeros((self._no_cols,), dtype=int)
+            self._winner = None
+            self._last_player = None
+            self._round = 0
+            self._starting_player = 1
+            if hasattr(self, "_game_turn_handler"):
+                self._game_turn_handler.reset()
+                self._starting_player = self._game_turn_handler.get_current_player_value()
+        else:
+            if isinstance(game, Connect4Bitboard):
+                self._mask = game._mask
+                self._position = game._position
+            else:
+                self._position, self._mask = board_to_bitboard(game._get_board())
+            self.next_row_height = game.next_row_height.copy()
+            self._winner = game.get_winner()
+            self._last_player = game.get_last_player()
+            self._round = game.get_round()
+            self._starting_player = game._get_starting_player()
+            self._game_turn_handler = game.get_turn_handler().copy()
+
+    def restore(self: "Connect4Bitboard", game: Connect4) -> None:
+        # resets to the position of another bitboard game, copying into the arrays of this game
+        self._mask = game._mask
+        self._position = game._position
+        np.copyto(self.next_row_height, game.next_row_height)
+        self._winner = game._winner
+        self._last_player = game._last_player
+        self._round = game._round
+        self._starting_player = game._starting_player
+        self._game_turn_handler.restore(game.get_turn_handler())
+
+    def copy(self: "Connect4Bitboard") -> "Connect4Bitboard":
+        return Connect4Bitboard(self)
+
+    def get_available_actions(self: "Connect4Bitboard") -> list[int]:
+        return bits_to_actions((self._mask + BOTTOM_MASK) & BOARD_MASK)
+
+    def get_clever_available_actions(self: "Connect4Bitboard") -> list[int]:
+        player = self.get_current_player()
+        return find_clever_actions_bitboard(
+            self._get_player_position(player),
+            self._get_player_position(-player),
+            self._mask,
+        )
+
+    def random_rollout(self: "Connect4Bitboard") -> Tuple[float, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        # play random clever actions until the game is over, all inside one compiled function
+        if self._winner is not None:
+            return 1.0, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        player = self.get_current_player()
+        next_player = -player
+        (
+            last_player_reward,
+            is_game_won,
+            position,
+            foe_position,
+            self._mask,
+            rollout_actions,
+            rollout_row_heights,
+        ) = random_rollout_bitboard(
+            self._get_player_position(player),
+            self._get_player_position(next_player),
+            self._mask,
+            self.next_row_height,
+            self.get_max_rounds() - self._round,
+        )
+        self._position = position if player == 1 else foe_position
+
+        no_rollout_actions = len(rollout_actions)
+        if no_rollout_actions > 0:
+            self._round += no_rollout_actions
+            # players alternate, so the last player is the current player if an odd number of actions was played
+            self._last_player = player if no_rollout_actions % 2 == 1 else next_player
+            if is_game_won:
+                self._winner = self._last_player
+
+        return last_player_reward, rollout_actions, rollout_row_heights
+
+
+@numba.njit(nogil=True)
+def random_rollout_bitboard(
+    position: int,
+    foe_position: int,
+    mask: int,
+    next_row_heights: npt.NDArray[np.int64],
+    max_no_actions: int,
+) -> Tuple[float, bool, int, int, int, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # position belongs to the player to move, next_row_heights is updated in place
+    positions = np.array([position, foe_position], dtype=np.int64)
+    rollout_actions = np.empty(max_no_actions, dtype=np.int64)
+    rollout_row_heights = np.empty(max_no_actions, dtype=np.int64)
+
+    for idx in range(max_no_actions):
+        turn = idx % 2
+        clever_available_actions = find_clever_actions_bitboard(positions[turn], positions[1 - turn], mask)
+        action = np.random.choice(clever_available_actions)
+        row = next_row_heights[action]
+        rollout_actions[idx] = action
+        rollout_row_heights[idx] = row
+
+        # place disc
+        move = np.int64(1) << (action * COLUMN_HEIGHT + row)
+        positions[turn] |= move
+        mask |= move
+        next_row_heights[action] += 1
+
+        # check for win
+        if has_four_in_a_row(positions[turn]):
+            return (
+                1.0,
+                True,
+                positions[0],
+                positions[1],
+                mask,
+                rollout_actions[: idx + 1],
+                rollout_row_heights[: idx + 1],
+            )
+
+    # board is full
+    return 0.5, False, positions[0], positions[1], mask, rollout_actions, rollout_row_heights
+
+
+@numba.njit
+def has_four_in_a_row(position: int) -> bool:
+    # vertical, horizontal and the two diagonals
+    for shift in (1, COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1):
+        pairs = position & (position >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+@numba.njit
+def compute_winning_positions(position: int) -> int:
+    # cells (occupied or not) that would complete four in a row for the owner of position
+    # vertical
+    winning_positions = (position << 1) & (position << 2) & (position << 3)
+
+    for shift in (COLUMN_HEIGHT, COLUMN_HEIGHT - 1, COLUMN_HEIGHT + 1):
+        pairs = (position << shift) & (position << (2 * shift))
+        winning_positions |= pairs & (position << (3 * shift))
+        winning_positions |= pairs & (position >> shift)
+
+        pairs = (position >> shift) & (position >> (2 * shift))
+        winning_positions |= pairs & (position << shift)
+        winning_positions |= pairs & (position >> (3 * shift))
+
+    return winning_positions & BOARD_MASK
+
+
+@numba.njit
+def find_clever_actions_bitboard(position: int, foe_position: int, mask: int) -> npt.NDArray[np.int64]:
+    return bits_to_actions(find_clever_action_bits(position, foe_position, mask))
+
+
+@numba.njit
+def find_clever_action_bits(position: int, foe_position: int, mask: int) -> int:
+    # bits of the cells where the clever actions would place a disc
+    possible = (mask + BOTTOM_MASK) & BOARD_MASK
+
+    winning_actions = possible & compute_winning_positions(position)
+    if winning_actions:
+        return winning_actions
+
+    foe_winning_positions = compute_winning_positions(foe_position)
+    must_block_actions = possible & foe_winning_positions
+    if must_block_actions:
+        return must_block_actions
+
+    # avoid playing directly below a cell where the foe would win
+    filtered_actions = possible & ~(foe_winning_positions >> 1)
+    if filtered_actions:
+        return filtered_actions
+    else:
+        return possible
+
+
+@numba.njit
+def bits_to_actions(bits: int) -> npt.NDArray[np.int64]:
+    actions = np.empty(NO_COLS, dtype=np.int64)
+    no_actions = 0
+    for col in range(NO_COLS):
+        if bits & COLUMN_MASKS[col]:
+            actions[no_actions] = col
+            no_actions += 1
+    return actions[:no_actions]
+
+
+@numba.njit
+def mirror_bitboard(bits: int) -> int:
+    # reflect the board left to right, column col becomes column NO_COLS - 1 - col
+    mirrored_bits = 0
+    for col in range(NO_COLS):
+        column_bits = (bits >> (col * COLUMN_HEIGHT)) & ((1 << COLUMN_HEIGHT) - 1)
+        mirrored_bits |= column_bits << ((NO_COLS - 1 - col) * COLUMN_HEIGHT)
+    return mirrored_bits
+
+
+def bitboard_to_board(position: int, mask: int) -> npt.NDArray[np.float64]:
+    board = np.zeros((NO_ROWS, NO_COLS))
+    for col in range(NO_COLS):
+        for row in range(NO_ROWS):
+            bit = 1 << (col * COLUMN_HEIGHT + row)
+            if mask & bit:
+                board[row, col] = 1 if position & bit else -1
+    return board
+
+
+def board_to_bitboard(board: npt.NDArray[np.float64]) -> tuple[int, int]:
+    position = 0
+    mask = 0
+    for row, col in zip(*np.nonzero(board)):
+        bit = 1 << (int(col) * COLUMN_HEIGHT + int(row))
+        mask |= bit
+        if board[row, col] == 1:
+            position |= bit
+    return position, mask
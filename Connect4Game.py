@@ -1,5 +1,4 @@
-import copy
-from typing import Optional
+from typing import Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numba  # type: ignore
@@ -8,14 +7,51 @@ import numpy.typing as npt
 
 from GameTurnHandler import GameTurnHandler
 
+# Zobrist keys indexed by (player index, row, col). A fixed seed keeps state hashes stable across processes.
+ZOBRIST_SEED = 4
+ZOBRIST_KEYS = np.random.default_rng(ZOBRIST_SEED).integers(
+    np.iinfo(np.int64).min,
+    np.iinfo(np.int64).max,
+    size=(2, 6, 7),
+    dtype=np.int64,
+)
+
+# Packed game state, which compiled functions take as a one-element array (see create_state). Player values are 1
+# and -1, winner and last_player are 0 while there is none. The winning possibilities (threat maps) are indexed by
+# get_player_index. The players alternate, so the side to move follows from round and starting_player (see
+# get_current_player_state).
+CONNECT4_STATE_DTYPE = np.dtype(
+    [
+        ("board", np.float64, (6, 7)),
+        ("next_row_heights", np.int64, (7,)),
+        ("winning_possibilities", np.float64, (2, 6, 7)),
+        ("round", np.int64),
+        ("winner", np.int64),
+        ("last_player", np.int64),
+        ("starting_player", np.int64),
+        ("state_hash", np.int64),
+    ],
+)
+
 
 class Connect4:
+    """Connect4 game backed by a packed state array, which compiled functions can take as a whole.
+
+    The state is the only copy of the position. _board and next_row_height are views into it, the scalars are read
+    through one-element views. The side to move follows from the round and the starting player, so the turn handler
+    only keeps the turn of the starting player.
+    """
+
     _game_turn_handler: GameTurnHandler
-    _winner: int | None
+    _state: npt.NDArray[np.void]
+    _state_bytes: npt.NDArray[np.uint8]
     _board: npt.NDArray[np.float64]
-    next_row_height: npt.NDArray[np.float64]
-    _last_player: int | None
-    _round: int
+    next_row_height: npt.NDArray[np.int64]
+    _round_view: npt.NDArray[np.int64]
+    _winner_view: npt.NDArray[np.int64]
+    _last_player_view: npt.NDArray[np.int64]
+    _starting_player_view: npt.NDArray[np.int64]
+    _state_hash_view: npt.NDArray[np.int64]
 
     def __init__(
         self: "Connect4",
@@ -38,45 +74,19 @@ class Connect4:
         return self._no_cols * self._no_rows
 
     def place_disc(self: "Connect4", col: int) -> bool:
-        return self._place_disc(col, self._game_turn_handler.get_current_player_value())
+        return place_disc_state(self._state, col, ZOBRIST_KEYS)
 
     def _place_disc(self: "Connect4", col: int, player: int) -> bool:
-        # place disc
-        row = self.next_row_height[col]
-        self._board[row, col] = player
-
-        # update next_row_height
-        self.next_row_height[col] += 1
-        #update last_player
-        self._last_player = player
-        #update round
-        self._round += 1
-
-        # check for win
-        if self._winner is not None:
-            return True
-        elif self._current_winning_possibilities[player][row, col] == 1:
-            self._winner = player
-            return True
-        else:
-            # update current winning_possibilities
-            update_winning_possibilities(
-                self._get_board(),
-                self._current_winning_possibilities[player],
-                player,
-                col,
-                row,
-            )
-            return False
+        return place_player_disc_state(self._state, col, player, ZOBRIST_KEYS)
 
     def get_last_player(self: "Connect4") -> int | None:
-        return self._last_player
+        return self._last_player_view.item() or None
 
     def get_winner(self: "Connect4") -> int | None:
-        return self._winner
+        return self._winner_view.item() or None
 
     def get_round(self: "Connect4") -> int:
-        return self._round
+        return self._round_view.item()
 
     def is_draw(self: "Connect4") -> int:
         return self.get_round() == self.get_max_rounds()
@@ -85,39 +95,74 @@ class Connect4:
         return self._board
 
     def get_state_hash(self: "Connect4") -> int:
-        return hash(self._get_board().tobytes())
+        return self._state_hash_view.item()
+
+    def get_mirrored_state_hash(self: "Connect4") -> int:
+        # state hash of the position reflected left to right
+        return get_zobrist_hash_from_board(np.ascontiguousarray(self._board[:, ::-1]), ZOBRIST_KEYS)
 
     def next_turn(self: "Connect4") -> None:
-        self._game_turn_handler.next_turn()
+        # the side to move follows from the round and the starting player, so only the first move can be passed
+        if self.get_round() == 0:
+            self._game_turn_handler.next_turn()
+            self._set_starting_player(self._game_turn_handler.get_current_player_value())
 
     def get_current_player(self: "Connect4") -> int:
-        return self._game_turn_handler.get_current_player_value()
+        starting_player = self._get_starting_player()
+        return starting_player if self.get_round() % 2 == 0 else -starting_player
 
     def get_current_player_turn(self: "Connect4") -> int:
-        return self._game_turn_handler.get_current_player_turn()
+        # the turn handler keeps the turn of the starting player, the two players alternate from there
+        return (self._game_turn_handler.get_current_player_turn() + self.get_round()) % 2
+
+    def _get_starting_player(self: "Connect4") -> int:
+        return self._starting_player_view.item()
+
+    def _set_starting_player(self: "Connect4", starting_player: int) -> None:
+        self._starting_player_view[0] = starting_player
 
     def reset(self: "Connect4", game: Optional["Connect4"] = None) -> None:
         if game is None:
-            self._board = np.zeros((self._no_rows, self._no_cols))
-            self.next_row_height = np.zeros((self._no_cols,), dtype=int)
-            self._current_winning_possibilities = {
-                1: np.zeros((self._no_rows, self._no_cols)),
-                -1: np.zeros((self._no_rows, self._no_cols)),
-            }
-            self._winner = None
-            self._last_player = None
-            self._round = 0
+            self._set_state(create_state())
             if hasattr(self, "_game_turn_handler"):
                 self._game_turn_handler.reset()
+                self._set_starting_player(self._game_turn_handler.get_current_player_value())
+        elif hasattr(game, "_state"):
+            self._set_state(game._state_bytes.copy().view(CONNECT4_STATE_DTYPE))
+            self._game_turn_handler = game.get_turn_handler().copy()
         else:
-            self._board = copy.deepcopy(game._get_board())
-            self.next_row_height = copy.deepcopy(game.next_row_height)
-            self._current_winning_possibilities = copy.deepcopy(game._current_winning_possibilities)
-            self._winner = game._winner
-            self._last_player = game._last_player
-            self._round = game.get_round()
+            # game from another engine, rebuild winning possibilities and the state hash from the board
+            self._set_state(create_state())
+            self._board[:] = game._get_board()
+            self.next_row_height[:] = game.next_row_height
+            # indexed like get_player_index
+            winning_possibilities = self._state["winning_possibilities"][0]
+            winning_possibilities[0] = get_winning_possibilities_from_board(self._board, 1)
+            winning_possibilities[1] = get_winning_possibilities_from_board(self._board, -1)
+            self._round_view[0] = game.get_round()
+            self._winner_view[0] = game.get_winner() or 0
+            self._last_player_view[0] = game.get_last_player() or 0
+            self._state_hash_view[0] = get_zobrist_hash_from_board(self._board, ZOBRIST_KEYS)
+            self._set_starting_player(game._get_starting_player())
             self._game_turn_handler = game.get_turn_handler().copy()
 
+    def _set_state(self: "Connect4", state: npt.NDArray[np.void]) -> None:
+        self._state = state
+        # numpy copies structured arrays field by field, the bytes of the state are copied much faster
+        self._state_bytes = state.view(np.uint8)
+        self._board = state["board"][0]
+        self.next_row_height = state["next_row_heights"][0]
+        self._round_view = state["round"]
+        self._winner_view = state["winner"]
+        self._last_player_view = state["last_player"]
+        self._starting_player_view = state["starting_player"]
+        self._state_hash_view = state["state_hash"]
+
+    def restore(self: "Connect4", game: "Connect4") -> None:
+        # resets to the position of a game of the same engine and size, copying into the state of this game
+        np.copyto(self._state_bytes, game._state_bytes)
+        self._game_turn_handler.restore(game.get_turn_handler())
+
     def get_turn_handler(self: "Connect4") -> GameTurnHandler:
         return self._game_turn_handler
 
@@ -128,41 +173,14 @@ class Connect4:
         return get_available_actions_numba(self._get_board())
 
     def get_clever_available_actions(self: "Connect4") -> list[int]:
-        return self._get_clever_available_actions(
-            self._game_turn_handler.get_current_player_value(),
-            self._game_turn_handler.get_next_player_value(),
-        )
+        return get_clever_available_actions_state(self._state)
 
-    def _get_clever_available_actions(self: "Connect4", player: int, next_player: int) -> list[int]:
-        winning_actions = find_available_winning_actions(
-            self._current_winning_possibilities[player],
-            self.next_row_height,
-            self._no_cols,
-            self._no_rows,
-        )
-        if len(winning_actions) > 0:
-            return winning_actions
-
-        must_block_actions = find_available_winning_actions(
-            self._current_winning_possibilities[next_player],
-            self.next_row_height,
-            self._no_cols,
-            self._no_rows,
-        )
-        if len(must_block_actions) > 0:
-            return must_block_actions
-
-        all_available_actions = self.get_available_actions()
-        filtered_actions = exclude_must_avoid_actions(
-            all_available_actions,
-            self._current_winning_possibilities[next_player],
-            self.next_row_height,
-            self._no_rows,
-        )
-        if len(filtered_actions) > 0:
-            return filtered_actions
-        else:
-            return all_available_actions
+    def random_rollout(self: "Connect4") -> Tuple[float, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        # play random clever actions until the game is over, all inside one compiled function
+        if self.get_winner() is not None:
+            return 1.0, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        return random_rollout_state(self._state, ZOBRIST_KEYS)
 
     def plot_board_state(
         self: "Connect4",
@@ -207,6 +225,103 @@ class Connect4:
             self.fig.canvas.flush_events()
 
 
+def create_state(starting_player: int = 1) -> npt.NDArray[np.void]:
+    # state of the empty board
+    state = np.zeros(1, dtype=CONNECT4_STATE_DTYPE)
+    state["starting_player"] = starting_player
+    return state
+
+
+@numba.njit
+def get_current_player_state(state: npt.NDArray[np.void]) -> int:
+    # the starting player moves at even rounds
+    game_state = state[0]
+    return game_state.starting_player if game_state.round % 2 == 0 else -game_state.starting_player
+
+
+@numba.njit
+def place_disc_state(state: npt.NDArray[np.void], col: int, zobrist_keys: npt.NDArray[np.int64]) -> bool:
+    # places a disc of the player to move in col and returns whether the game is won
+    return place_player_disc_state(state, col, get_current_player_state(state), zobrist_keys)
+
+
+@numba.njit
+def place_player_disc_state(
+    state: npt.NDArray[np.void],
+    col: int,
+    player: int,
+    zobrist_keys: npt.NDArray[np.int64],
+) -> bool:
+    # places a disc of player in col and returns whether the game is won
+    game_state = state[0]
+    row = game_state.next_row_heights[col]
+    game_state.board[row, col] = player
+    game_state.next_row_heights[col] += 1
+    game_state.state_hash ^= zobrist_keys[get_player_index(player), row, col]
+    game_state.last_player = player
+    game_state.round += 1
+
+    # check for win
+    if game_state.winner != 0:
+        return True
+    current_possibilities = game_state.winning_possibilities[get_player_index(player)]
+    if current_possibilities[row, col] == 1:
+        game_state.winner = player
+        return True
+    update_winning_possibilities(game_state.board, current_possibilities, player, col, row)
+    return False
+
+
+@numba.njit
+def get_available_actions_state(state: npt.NDArray[np.void]) -> npt.ArrayLike:
+    return get_available_actions_numba(state[0].board)
+
+
+@numba.njit
+def get_clever_available_actions_state(state: npt.NDArray[np.void]) -> npt.ArrayLike:
+    # clever actions of the player to move
+    game_state = state[0]
+    player = get_current_player_state(state)
+    return get_clever_available_actions_numba(
+        game_state.board,
+        game_state.next_row_heights,
+        game_state.winning_possibilities[get_player_index(player)],
+        game_state.winning_possibilities[get_player_index(-player)],
+    )
+
+
+@numba.njit(nogil=True)
+def random_rollout_state(
+    state: npt.NDArray[np.void],
+    zobrist_keys: npt.NDArray[np.int64],
+) -> Tuple[float, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # random_rollout_numba on the state from the player to move, which also updates the scalars of the state
+    game_state = state[0]
+    player = get_current_player_state(state)
+    next_player = -player
+    max_no_actions = game_state.board.size - game_state.round
+    last_player_reward, is_game_won, rollout_actions, rollout_row_heights, state_hash_change = random_rollout_numba(
+        game_state.board,
+        game_state.next_row_heights,
+        game_state.winning_possibilities[get_player_index(player)],
+        game_state.winning_possibilities[get_player_index(next_player)],
+        player,
+        next_player,
+        max_no_actions,
+        zobrist_keys,
+    )
+
+    no_rollout_actions = len(rollout_actions)
+    if no_rollout_actions > 0:
+        game_state.round += no_rollout_actions
+        game_state.state_hash ^= state_hash_change
+        # players alternate, so the last player is the current player if an odd number of actions was played
+        game_state.last_player = player if no_rollout_actions % 2 == 1 else next_player
+        if is_game_won:
+            game_state.winner = game_state.last_player
+    return last_player_reward, rollout_actions, rollout_row_heights
+
+
 @numba.njit
 def update_winning_possibilities(
     board: npt.NDArray[np.float64],
@@ -262,6 +377,20 @@ def update_winning_possibilities(
                 current_possibilities[row + i * row_dir, col + i * col_dir] = 1
 
 
+@numba.njit
+def get_winning_possibilities_from_board(
+    board: npt.NDArray[np.float64],
+    player: int,
+) -> npt.NDArray[np.float64]:
+    current_possibilities = np.zeros(board.shape)
+    max_rows, max_cols = board.shape
+    for row in range(max_rows):
+        for col in range(max_cols):
+            if board[row, col] == player:
+                update_winning_possibilities(board, current_possibilities, player, col, row)
+    return current_possibilities
+
+
 @numba.njit
 def find_available_winning_actions(
     current_possibilities: npt.NDArray[np.float64],
@@ -284,13 +413,107 @@ def exclude_must_avoid_actions(
     no_rows: int,
 ) -> npt.ArrayLike:
     action_filter = np.ones(len(available_actions))  # formatted as vector of 0 or 1 (1 being winning move)
-    for action in available_actions:
+    for idx, action in enumerate(available_actions):
         tmp_next_foe_row_height = next_row_heights[action] + 1
         if tmp_next_foe_row_height < no_rows and current_foe_possibilities[tmp_next_foe_row_height, action] == 1:
-            action_filter[action] = 0
+            action_filter[idx] = 0
     return available_actions[np.where(action_filter == 1)[0]]
 
 
+@numba.njit
+def get_clever_available_actions_numba(
+    board: npt.NDArray[np.float64],
+    next_row_heights: npt.NDArray[np.int64],
+    current_possibilities: npt.NDArray[np.float64],
+    current_foe_possibilities: npt.NDArray[np.float64],
+) -> npt.ArrayLike:
+    no_rows, no_cols = board.shape
+
+    winning_actions = find_available_winning_actions(current_possibilities, next_row_heights, no_cols, no_rows)
+    if len(winning_actions) > 0:
+        return winning_actions
+
+    must_block_actions = find_available_winning_actions(current_foe_possibilities, next_row_heights, no_cols, no_rows)
+    if len(must_block_actions) > 0:
+        return must_block_actions
+
+    all_available_actions = get_available_actions_numba(board)
+    filtered_actions = exclude_must_avoid_actions(
+        all_available_actions,
+        current_foe_possibilities,
+        next_row_heights,
+        no_rows,
+    )
+    if len(filtered_actions) > 0:
+        return filtered_actions
+    else:
+        return all_available_actions
+
+
+@numba.njit(nogil=True)
+def random_rollout_numba(
+    board: npt.NDArray[np.float64],
+    next_row_heights: npt.NDArray[np.int64],
+    current_possibilities: npt.NDArray[np.float64],
+    current_foe_possibilities: npt.NDArray[np.float64],
+    player: int,
+    next_player: int,
+    max_no_actions: int,
+    zobrist_keys: npt.NDArray[np.int64],
+) -> Tuple[float, bool, npt.NDArray[np.int64], npt.NDArray[np.int64], int]:
+    # updates board, next_row_heights and the winning possibilities in place
+    # and returns the change of the zobrist state hash
+    rollout_actions = np.empty(max_no_actions, dtype=np.int64)
+    rollout_row_heights = np.empty(max_no_actions, dtype=np.int64)
+    state_hash_change = 0
+
+    for idx in range(max_no_actions):
+        clever_available_actions = get_clever_available_actions_numba(
+            board,
+            next_row_heights,
+            current_possibilities,
+            current_foe_possibilities,
+        )
+        action = np.random.choice(clever_available_actions)
+        row = next_row_heights[action]
+        rollout_actions[idx] = action
+        rollout_row_heights[idx] = row
+
+        # place disc
+        board[row, action] = player
+        next_row_heights[action] += 1
+        state_hash_change ^= zobrist_keys[get_player_index(player), row, action]
+
+        # check for win
+        if current_possibilities[row, action] == 1:
+            return 1.0, True, rollout_actions[: idx + 1], rollout_row_heights[: idx + 1], state_hash_change
+        update_winning_possibilities(board, current_possibilities, player, action, row)
+
+        # next turn
+        player, next_player = next_player, player
+        current_possibilities, current_foe_possibilities = current_foe_possibilities, current_possibilities
+
+    # board is full
+    return 0.5, False, rollout_actions, rollout_row_heights, state_hash_change
+
+
+@numba.njit
+def get_player_index(player: int) -> int:
+    # player value 1 has index 0 and player value -1 has index 1
+    return (1 - player) // 2
+
+
+@numba.njit
+def get_zobrist_hash_from_board(board: npt.NDArray[np.float64], zobrist_keys: npt.NDArray[np.int64]) -> int:
+    state_hash = 0
+    max_rows, max_cols = board.shape
+    for row in range(max_rows):
+        for col in range(max_cols):
+            if board[row, col] != 0:
+                state_hash ^= zobrist_keys[get_player_index(int(board[row, col])), row, col]
+    return state_hash
+
+
 @numba.njit
 def get_available_actions_numba(board: npt.NDArray[np.float64]) -> npt.ArrayLike:
     board_top_row = board[-1, :]
@@ -0,0 +1,26 @@
+from typing import Optional
+
+from Connect4Bitboard import Connect4Bitboard
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+
+
+class Connect4GameFactory:
+    @staticmethod
+    def create_game(
+        engine: str,
+        game: Optional[Connect4] = None,
+        game_turn_handler: Optional[GameTurnHandler] = None,
+    ) -> Connect4:
+        # create game of the requested engine, optionally as a copy of another game (of any engine)
+        if engine == Connect4GameEngines.numpy:
+            return Connect4(game=game, game_turn_handler=game_turn_handler)
+        elif engine == Connect4GameEngines.bitboard:
+            return Connect4Bitboard(game=game, game_turn_handler=game_turn_handler)
+
+        raise ValueError(f"Unknown game engine [{engine}].")
+
+
+class Connect4GameEngines:
+    numpy: str = "numpy"
+    bitboard: str = "bitboard"
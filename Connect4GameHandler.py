@@ -1,7 +1,10 @@
 import logging
+from typing import Optional, Tuple
 
 import ConfigHandler
 from Connect4Game import Connect4
+from Connect4Players import MCTSPlayer
+from GameRecord import GameRecordWriter
 from IPlayer import IPlayer
 from LoggerHandler import LoggerHandler
 
@@ -11,6 +14,7 @@ class Connect4GameHandler:
     game: Connect4
     _logger: logging.Logger
     _config_handler: ConfigHandler.ConfigHandler
+    _game_record_writer: GameRecordWriter | None
 
     def __init__(
         self: "Connect4GameHandler",
@@ -19,6 +23,7 @@ class Connect4GameHandler:
         player1: IPlayer,
         logger_handler: LoggerHandler,
         config_handler: ConfigHandler.ConfigHandler,
+        game_record_writer: Optional[GameRecordWriter] = None,
     ) -> None:
         self.game = game
         self.game_size = self.game.get_max_rounds()
@@ -28,9 +33,17 @@ class Connect4GameHandler:
 
         self._logger = logger_handler.get_logger(type(self).__name__)
         self._config_handler = config_handler
+        # every finished game is appended to the game records, if a writer is given
+        self._game_record_writer = game_record_writer
 
         self.reset_game()
 
+    def close(self: "Connect4GameHandler") -> None:
+        # stops pondering and the worker processes of root parallel searches
+        for player in self.players:
+            if isinstance(player, MCTSPlayer):
+                player.close()
+
     def reset_game(self: "Connect4GameHandler") -> None:
         self.game.reset()
 
@@ -38,6 +51,9 @@ class Connect4GameHandler:
             player.reset()
 
     def play_game(self: "Connect4GameHandler") -> int:
+        starting_player = self.game.get_current_player()
+        moves: list[int] = []
+
         for round in range(self.game_size):
             current_player_turn = self.game.get_current_player_turn()
 
@@ -52,6 +68,7 @@ class Connect4GameHandler:
 
             # perform new action
             is_game_won = self.game.place_disc(action)
+            moves.append(action)
 
             # check if game is done
             if is_game_won:
@@ -60,6 +77,9 @@ class Connect4GameHandler:
             # update player turn
             self.game.next_turn()
 
+        if self._game_record_writer is not None:
+            self._game_record_writer.write(starting_player, moves, self.game.get_winner())
+
         return round
 
     def play_n_games(self: "Connect4GameHandler", no_games: int, plot: bool = False) -> list[int]:
@@ -67,21 +87,26 @@ class Connect4GameHandler:
         self.rounds: list[int] = []
 
         for game_number in range(no_games):
-            self._logger.debug(f"Game [{game_number}] starting.")
-
-            self.reset_game()
-
-            for _ in range(game_number % self.no_players):
-                self.game.next_turn()
-
-            end_round = self.play_game()
+            winner, end_round = self.play_single_game(game_number)
             self.rounds.append(end_round)
-
-            winner = self.game.get_winner()
-            self._logger.debug(f"Game  [{game_number}]: was won by player=[{winner}].")
-            winner = winner if winner is not None else 0
             self.winners.append(winner)
 
             if plot:
                 self.game.plot_board_state()
         return self.winners
+
+    def play_single_game(self: "Connect4GameHandler", game_number: int) -> Tuple[int, int]:
+        # the starting player alternates with the game number, returns the winner (0 if draw) and the end round
+        self._logger.debug(f"Game [{game_number}] starting.")
+
+        self.reset_game()
+
+        for _ in range(game_number % self.no_players):
+            self.game.next_turn()
+
+        end_round = self.play_game()
+
+        winner = self.game.get_winner()
+        self._logger.debug(f"Game  [{game_number}]: was won by player=[{winner}].")
+        winner = winner if winner is not None else 0
+        return winner, end_round
@@ -1,16 +1,22 @@
 import logging
-from typing import Tuple
+import threading
+from typing import Callable, Optional, Tuple
 
 import numba  # type: ignore
 import numpy as np
 import numpy.typing as npt
 
-from ConfigHandler import MCTSPlayerConfig
+from ConfigHandler import MCTSPlayerConfig, SolverConfig
 from Connect4Game import Connect4
+from Connect4Solver import Connect4Solver, score_to_winning_probability
 from IPlayer import IPlayer
 from LoggerHandler import LoggerHandler
 from MonteCarloTreeSearch import MonteCarloTreeSearchEngine
-from Tree import Tree
+from OpeningBook import OpeningBook
+from RootParallelSearch import RootParallelSearch
+from SearchStatistics import SearchStatistics
+from Tree import ArrayTree, Tree
+from TreeFactory import TreeFactory
 
 
 class RandomPlayer(IPlayer):
@@ -30,17 +36,22 @@ class RandomPlayer(IPlayer):
 
 
 class DQPlayer(IPlayer):
+    _name: str
+
     def __init__(self: "DQPlayer", qmodel, epsilon: float) -> None:
+        # qmodel is a DeepQModel or a NumpyQModel, its states are boards seen from the player to move
+        self._name = "dq"
         self.qmodel = qmodel
         self.epsilon = epsilon
         self.RandomPlayer = RandomPlayer()
 
     def make_action(self: "DQPlayer", game: Connect4, available_actions: list[int]) -> int:
-        uniform: float = np.random.Generator.random()
+        uniform: float = np.random.random()  # noqa: NPY002
         if uniform < self.epsilon:
             return self.RandomPlayer.make_action(game, available_actions)
         else:
-            q_values = self.QModel.predict(np.expand_dims(game._get_board().flatten(), axis=0))
+            state = game._get_board().flatten() * game.get_current_player()
+            q_values = self.qmodel.predict(np.expand_dims(state, axis=0))
             q_values_available = q_values[0, available_actions]
             action = available_actions[np.argmax(q_values_available)]
             return action
@@ -48,6 +59,45 @@ class DQPlayer(IPlayer):
     def reset(self: "DQPlayer") -> None:
         pass
 
+    def get_name(self: "DQPlayer") -> str:
+        return self._name
+
+
+class SolverPlayer(IPlayer):
+    """Plays the action of an alpha-beta search, which is perfect if the position is solved within the time limit."""
+
+    _name: str
+    _solver_config: SolverConfig
+    _solver: Connect4Solver
+    _logger: logging.Logger
+    winning_probability: float | None
+    score: int | None
+
+    def __init__(self: "SolverPlayer", solver_config: SolverConfig, logger_handler: LoggerHandler) -> None:
+        self._name = "perfect"
+        self._solver_config = solver_config
+        self._solver = Connect4Solver(solver_config.transposition_table_size_log2)
+        self._logger = logger_handler.get_logger(type(self).__name__)
+        self.reset()
+
+    def make_action(self: "SolverPlayer", game: Connect4, available_actions: list[int]) -> int:
+        action, score, is_exact = self._solver.solve(game, self._solver_config.time_limit_ms)
+        if action not in available_actions:
+            action = make_random_choice(available_actions)
+
+        self.score = score if is_exact else None
+        self.winning_probability = score_to_winning_probability(score) if is_exact else None
+        self._logger.debug(f"Name=[{self._name}] found action=[{action}] with score=[{score}] exact=[{is_exact}]")
+        return action
+
+    def reset(self: "SolverPlayer") -> None:
+        # entries of the transposition table stay valid between games
+        self.winning_probability = None
+        self.score = None
+
+    def get_name(self: "SolverPlayer") -> str:
+        return self._name
+
 
 class MCTSPlayer(IPlayer):
     _name: str
@@ -56,10 +106,19 @@ class MCTSPlayer(IPlayer):
     _next_player: int
     _mcts_config: MCTSPlayerConfig
     winning_probability: float | None
+    action_probabilities: npt.NDArray[np.float64] | None
+    search_statistics: SearchStatistics | None
+    number_of_playouts: int
+    number_of_ponder_playouts: int
     _rollout_player: RandomPlayer = RandomPlayer()
-    _tree: Tree
+    _tree: Tree | ArrayTree
+    _evaluator: Callable
     _logger: logging.Logger
     _mcts_engine: MonteCarloTreeSearchEngine
+    _root_parallel_search: RootParallelSearch | None
+    _ponder_thread: threading.Thread | None
+    _ponder_stop_event: threading.Event
+    _opening_book: OpeningBook | None
 
     def __init__(
         self: "MCTSPlayer",
@@ -68,25 +127,66 @@ class MCTSPlayer(IPlayer):
         next_player: int,
         mcts_config: MCTSPlayerConfig,
         logger_handler: LoggerHandler,
+        evaluator: Optional[Callable] = None,
     ) -> None:
         self._game = game
         self._player = player
         self._next_player = next_player
         self._mcts_config = mcts_config
         self._logger = logger_handler.get_logger(type(self).__name__)
+        # evaluator of new leaves, for example InferenceQueue.evaluate to batch the evaluations of several searches
+        self._evaluator = standard_evaluator if evaluator is None else evaluator
 
         self._name = self._mcts_config.name
 
+        self._ponder_thread = None
+        self._ponder_stop_event = threading.Event()
         self.reset()
 
+        if self._mcts_config.opening_book_path is not None:
+            self._opening_book = OpeningBook(self._mcts_config.opening_book_path)
+        else:
+            self._opening_book = None
+
+        if self._mcts_config.root_parallel_workers > 1:
+            self._root_parallel_search = RootParallelSearch(
+                self._player,
+                self._mcts_config,
+                self._rollout_player,
+                self._evaluator,
+            )
+        else:
+            self._root_parallel_search = None
+
     def make_action(self: "MCTSPlayer", game: Connect4, available_actions: list[int]) -> int:
+        self.stop_pondering()
+
+        opening_book_action = self._get_opening_book_action(game, available_actions)
+        if opening_book_action is not None:
+            return opening_book_action
+
         if not self._mcts_config.reuse_tree:
             self._get_new_tree()
 
         self._game = game
+        self._mcts_engine.set_game(self._game)
+        self._prune_tree()
 
         #Perform monte carlo tree search
-        self._mcts_engine.perform_search(self._mcts_config.max_count)
+        if self._root_parallel_search is not None:
+            self.number_of_playouts = self._perform_root_parallel_search(self._root_parallel_search)
+        else:
+            self.number_of_playouts = self._mcts_engine.perform_search(
+                self._mcts_config.max_count,
+                self._mcts_config.time_limit_ms,
+            )
+        self._logger.debug(f"Name=[{self._mcts_config.name}] performed [{self.number_of_playouts}] playouts")
+        self.search_statistics = self._mcts_engine.statistics
+        if self.search_statistics is not None:
+            self._logger.debug(f"Name=[{self._mcts_config.name}] search statistics: {self.search_statistics}")
+
+        # visit distribution of the root, for example as policy target of self-play training
+        self.action_probabilities = self._mcts_engine.get_action_probabilities(temperature=1)
 
         if not self._mcts_config.randomize_action:
             #Get best action and winning probability
@@ -101,21 +201,100 @@ class MCTSPlayer(IPlayer):
             return best_action
 
         else:
-            action_probabilities = self._tree.get_action_probabilities(self._game, temperature=1)
-            action = np.random.choice(self._game.get_number_of_actions(), p=action_probabilities)  # noqa: NPY002
+            action = np.random.choice(  # noqa: NPY002
+                self._game.get_number_of_actions(),
+                p=self.action_probabilities,
+            )
             return action
 
     def reset(self: "MCTSPlayer") -> None:
-        self._evaluator = standard_evaluator
+        self.stop_pondering()
         self.winning_probability = None
+        self.action_probabilities = None
+        self.search_statistics = None
+        self.number_of_playouts = 0
+        self.number_of_ponder_playouts = 0
         self._get_new_tree()
         self._get_new_mcts_engine()
 
     def get_name(self: "MCTSPlayer") -> str:
         return self._name
 
+    def get_number_of_nodes(self: "MCTSPlayer") -> int:
+        return self._tree.get_number_of_nodes()
+
+    def start_pondering(self: "MCTSPlayer", game: Connect4) -> None:
+        # search from the position where the opponent is to move, the reused tree keeps the subtree of the actual move
+        if not (self._mcts_config.ponder and self._mcts_config.reuse_tree):
+            return
+
+        self.stop_pondering()
+        self._ponder_stop_event.clear()
+        self._mcts_engine.set_game(game.copy())
+        self._prune_tree()
+        self._ponder_thread = threading.Thread(target=self._ponder, daemon=True)
+        self._ponder_thread.start()
+
+    def stop_pondering(self: "MCTSPlayer") -> None:
+        if self._ponder_thread is None:
+            return
+
+        self._ponder_stop_event.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        self._logger.debug(
+            f"Name=[{self._mcts_config.name}] performed [{self.number_of_ponder_playouts}] playouts while pondering",
+        )
+
+    def close(self: "MCTSPlayer") -> None:
+        self.stop_pondering()
+        if self._root_parallel_search is not None:
+            self._root_parallel_search.close()
+
+    def _get_opening_book_action(self: "MCTSPlayer", game: Connect4, available_actions: list[int]) -> int | None:
+        if self._opening_book is None:
+            return None
+
+        opening_book_entry = self._opening_book.lookup(game)
+        if opening_book_entry is None or opening_book_entry[0] not in available_actions:
+            return None
+
+        action, self.winning_probability = opening_book_entry
+        self.action_probabilities = None
+        self.search_statistics = None
+        self.number_of_playouts = 0
+        self._logger.debug(f"Name=[{self._mcts_config.name}] found action=[{action}] in opening book")
+        return action
+
+    def _prune_tree(self: "MCTSPlayer") -> None:
+        # a reused tree only keeps the nodes which can still be reached from the current position
+        if not (self._mcts_config.reuse_tree and self._mcts_config.prune_tree):
+            return
+
+        no_removed_nodes = self._mcts_engine.prune_tree(self._mcts_config.max_number_of_nodes)
+        self._logger.debug(
+            f"Name=[{self._mcts_config.name}] pruned [{no_removed_nodes}] nodes, [{self.get_number_of_nodes()}] nodes are left",  # noqa: E501
+        )
+
+    def _ponder(self: "MCTSPlayer") -> None:
+        # pondering is limited to max_count simulations to bound the size of the tree
+        self.number_of_ponder_playouts = self._mcts_engine.perform_search(
+            self._mcts_config.max_count,
+            stop_event=self._ponder_stop_event,
+        )
+
+    def _perform_root_parallel_search(self: "MCTSPlayer", root_parallel_search: RootParallelSearch) -> int:
+        # workers search their share while this process searches its own, then the root statistics are merged
+        number_of_rounds = root_parallel_search.get_number_of_rounds_per_worker(self._mcts_config.max_count)
+        futures = root_parallel_search.start_search(self._game, number_of_rounds)
+        number_of_playouts = self._mcts_engine.perform_search(number_of_rounds, self._mcts_config.time_limit_ms)
+        for root_statistics in root_parallel_search.get_results(futures):
+            self._mcts_engine.merge_root_statistics(*root_statistics)
+            number_of_playouts += int(np.sum(root_statistics[1]))
+        return number_of_playouts
+
     def _get_new_tree(self: "MCTSPlayer") -> None:
-        self._tree = Tree()
+        self._tree = TreeFactory.create_tree(self._mcts_config.tree_type, self._game.get_number_of_actions())
         if hasattr(self, "_mcts_engine"):
             self._mcts_engine.set_tree(self._tree)
 
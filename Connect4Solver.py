@@ -0,0 +1,295 @@
+import time
+from typing import Tuple
+
+import numba  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Bitboard import (
+    BOARD_MASK,
+    BOTTOM_MASK,
+    COLUMN_MASKS,
+    NO_COLS,
+    NO_ROWS,
+    board_to_bitboard,
+    compute_winning_positions,
+)
+from Connect4Game import Connect4
+
+NO_CELLS = NO_ROWS * NO_COLS
+# scores are (no_cells + 1 - no_moves) // 2 for a win with the no_moves-th move, so they fit in [-MAX_SCORE, MAX_SCORE]
+MAX_SCORE = (NO_CELLS + 1) // 2
+# columns are searched from the center outwards
+CENTER_FIRST_COLUMNS = np.array([3, 2, 4, 1, 5, 0, 6], dtype=np.int64)
+# bound types of transposition table entries
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+# the deadline is only checked once per this number of nodes
+DEADLINE_CHECK_INTERVAL = 1 << 16
+
+
+class Connect4Solver:
+    """Negamax alpha-beta solver on bitboards with iterative deepening and a transposition table.
+
+    Scores are from the perspective of the player to move: positive if it wins, negative if it loses and
+    zero for a draw (or an unknown result beyond the search depth). A win with fewer discs scores higher.
+    """
+
+    _tt_keys: npt.NDArray[np.int64]
+    _tt_values: npt.NDArray[np.int8]
+    _tt_depths: npt.NDArray[np.int8]
+    _tt_flags: npt.NDArray[np.int8]
+
+    def __init__(self: "Connect4Solver", transposition_table_size_log2: int = 22) -> None:
+        size = 1 << transposition_table_size_log2
+        self._tt_keys = np.full(size, -1, dtype=np.int64)
+        self._tt_values = np.zeros(size, dtype=np.int8)
+        self._tt_depths = np.zeros(size, dtype=np.int8)
+        self._tt_flags = np.zeros(size, dtype=np.int8)
+
+    def reset(self: "Connect4Solver") -> None:
+        self._tt_keys[:] = -1
+
+    def solve(self: "Connect4Solver", game: Connect4, time_limit_ms: float | None = None) -> Tuple[int, int, bool]:
+        # returns the best action, its score and whether the score is exact
+        position, mask = board_to_bitboard(game._get_board())
+        own_position = position if game.get_current_player() == 1 else mask ^ position
+        no_moves = game.get_round()
+        no_remaining_moves = NO_CELLS - no_moves
+        deadline = np.inf if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+        search_state = np.zeros(2, dtype=np.int64)  # number of nodes, aborted
+
+        best_action, best_score, is_exact = -1, 0, False
+        for depth in range(1, no_remaining_moves + 1):
+            search_state[:] = 0
+            action, score = solve_root(
+                own_position,
+                mask,
+                no_moves,
+                depth,
+                deadline,
+                search_state,
+                self._tt_keys,
+                self._tt_values,
+                self._tt_depths,
+                self._tt_flags,
+            )
+            if search_state[1] and best_action >= 0:
+                # search was aborted at the deadline, use the result of the previous depth
+                break
+
+            best_action, best_score = action, score
+            # a decided result, or a search to the end of the game, is exact
+            is_exact = score != 0 or depth == no_remaining_moves
+            if is_exact or search_state[1]:
+                break
+
+        return best_action, best_score, is_exact
+
+
+@numba.njit
+def solve_root(
+    position: int,
+    mask: int,
+    no_moves: int,
+    depth: int,
+    deadline: float,
+    search_state: npt.NDArray[np.int64],
+    tt_keys: npt.NDArray[np.int64],
+    tt_values: npt.NDArray[np.int8],
+    tt_depths: npt.NDArray[np.int8],
+    tt_flags: npt.NDArray[np.int8],
+) -> Tuple[int, int]:
+    possible = (mask + BOTTOM_MASK) & BOARD_MASK
+
+    # win directly
+    winning_moves = possible & compute_winning_positions(position)
+    if winning_moves:
+        for col in CENTER_FIRST_COLUMNS:
+            if winning_moves & COLUMN_MASKS[col]:
+                return col, (NO_CELLS + 1 - no_moves) // 2
+
+    moves = order_moves(position, mask, get_non_losing_moves(position, mask))
+    if len(moves) == 0:
+        # every move loses, play any possible move
+        for col in CENTER_FIRST_COLUMNS:
+            if possible & COLUMN_MASKS[col]:
+                return col, -((NO_CELLS - no_moves) // 2)
+
+    alpha = -MAX_SCORE
+    beta = MAX_SCORE
+    best_col = column_of_move(moves[0])
+    for move in moves:
+        score = -negamax(
+            position ^ mask,
+            mask | move,
+            no_moves + 1,
+            depth - 1,
+            -beta,
+            -alpha,
+            deadline,
+            search_state,
+            tt_keys,
+            tt_values,
+            tt_depths,
+            tt_flags,
+        )
+        if score > alpha:
+            alpha = score
+            best_col = column_of_move(move)
+    return best_col, alpha
+
+
+@numba.njit
+def negamax(
+    position: int,
+    mask: int,
+    no_moves: int,
+    depth: int,
+    alpha: int,
+    beta: int,
+    deadline: float,
+    search_state: npt.NDArray[np.int64],
+    tt_keys: npt.NDArray[np.int64],
+    tt_values: npt.NDArray[np.int8],
+    tt_depths: npt.NDArray[np.int8],
+    tt_flags: npt.NDArray[np.int8],
+) -> int:
+    # position holds the discs of the player to move, who can not win directly (checked by the caller)
+    search_state[0] += 1
+    if search_state[0] % DEADLINE_CHECK_INTERVAL == 0:
+        with numba.objmode(now="float64"):
+            now = time.perf_counter()
+        if now > deadline:
+            search_state[1] = 1
+    if search_state[1]:
+        return 0
+
+    possible = (mask + BOTTOM_MASK) & BOARD_MASK
+    if possible & compute_winning_positions(position):
+        return (NO_CELLS + 1 - no_moves) // 2
+
+    non_losing_moves = get_non_losing_moves(position, mask)
+    if non_losing_moves == 0:
+        return -((NO_CELLS - no_moves) // 2)
+    if no_moves >= NO_CELLS - 2:
+        return 0
+
+    # the opponent can not win with its next move, and this player can not win before its second move
+    alpha = max(alpha, -((NO_CELLS - 2 - no_moves) // 2))
+    beta = min(beta, (NO_CELLS - 1 - no_moves) // 2)
+    if alpha >= beta:
+        return alpha
+    if depth <= 0:
+        # unknown beyond the search depth
+        return min(max(0, alpha), beta)
+
+    key = position + mask
+    slot = key & (len(tt_keys) - 1)
+    if tt_keys[slot] == key and tt_depths[slot] >= depth:
+        value = tt_values[slot]
+        if tt_flags[slot] == EXACT:
+            return value
+        elif tt_flags[slot] == LOWER_BOUND:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    original_alpha = alpha
+    best_score = -MAX_SCORE
+    for move in order_moves(position, mask, non_losing_moves):
+        score = -negamax(
+            position ^ mask,
+            mask | move,
+            no_moves + 1,
+            depth - 1,
+            -beta,
+            -alpha,
+            deadline,
+            search_state,
+            tt_keys,
+            tt_values,
+            tt_depths,
+            tt_flags,
+        )
+        if score > best_score:
+            best_score = score
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+
+    if search_state[1]:
+        # results of an aborted search are not stored
+        return best_score
+
+    tt_keys[slot] = key
+    tt_values[slot] = best_score
+    tt_depths[slot] = min(depth, 127)
+    if best_score <= original_alpha:
+        tt_flags[slot] = UPPER_BOUND
+    elif best_score >= beta:
+        tt_flags[slot] = LOWER_BOUND
+    else:
+        tt_flags[slot] = EXACT
+    return best_score
+
+
+@numba.njit
+def get_non_losing_moves(position: int, mask: int) -> int:
+    # same threat logic as find_clever_action_bits: block a single opponent threat, never play below one
+    possible = (mask + BOTTOM_MASK) & BOARD_MASK
+    opponent_winning_positions = compute_winning_positions(position ^ mask)
+    forced_moves = possible & opponent_winning_positions
+    if forced_moves:
+        if forced_moves & (forced_moves - 1):
+            # two threats can not both be blocked
+            return 0
+        possible = forced_moves
+    return possible & ~(opponent_winning_positions >> 1)
+
+
+@numba.njit
+def order_moves(position: int, mask: int, moves: int) -> npt.NDArray[np.int64]:
+    # moves creating more own threats first, ties are broken center first
+    ordered_moves = np.empty(NO_COLS, dtype=np.int64)
+    scores = np.empty(NO_COLS, dtype=np.int64)
+    no_moves = 0
+    for col in CENTER_FIRST_COLUMNS:
+        move = moves & COLUMN_MASKS[col]
+        if move:
+            score = count_bits(compute_winning_positions(position | move) & ~(mask | move) & BOARD_MASK)
+            idx = no_moves
+            while idx > 0 and scores[idx - 1] < score:
+                ordered_moves[idx] = ordered_moves[idx - 1]
+                scores[idx] = scores[idx - 1]
+                idx -= 1
+            ordered_moves[idx] = move
+            scores[idx] = score
+            no_moves += 1
+    return ordered_moves[:no_moves]
+
+
+@numba.njit
+def column_of_move(move: int) -> int:
+    for col in range(NO_COLS):
+        if move & COLUMN_MASKS[col]:
+            return col
+    return -1
+
+
+@numba.njit
+def count_bits(bits: int) -> int:
+    count = 0
+    while bits:
+        bits &= bits - 1
+        count += 1
+    return count
+
+
+def score_to_winning_probability(score: int) -> float:
+    return 0.5 if score == 0 else float(score > 0)
+
@@ -0,0 +1,200 @@
+import logging
+import os
+import time
+from typing import Callable, Protocol, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ConfigHandler import ConfigHandler, DQNConfig
+from Connect4Batch import Connect4Batch
+from Connect4Bitboard import NO_COLS, NO_ROWS
+from LoggerHandler import LoggerHandler
+from ReplayBuffer import ReplayBuffer, Transitions
+
+NO_CELLS = NO_ROWS * NO_COLS
+
+
+class QModel(Protocol):
+    # interface of DeepQModel used for training
+    def predict(self, states: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]: ...
+
+    def do_gradient_step(
+        self,
+        init_states: npt.NDArray[np.float32],
+        actions: npt.NDArray[np.int64],
+        rewards: npt.NDArray[np.float32],
+        next_states: npt.NDArray[np.float32],
+        terminations: npt.NDArray[np.float32],
+        discount: float,
+    ) -> float: ...
+
+    def update_target_model(self) -> None: ...
+
+    def save_weights(self, path: str) -> None: ...
+
+    def load_weights(self, path: str) -> None: ...
+
+    def export_weights(self, path: str) -> None: ...
+
+
+class SelfPlayEnvironment:
+    """Batch of self-play games which produces one transition per game and step.
+
+    States are the boards seen from the player to move (its discs are 1), so a single network plays both sides. The
+    reward is 1 if the action wins and 0 otherwise. Next states are seen from the opponent, who moves next.
+    """
+
+    _games: Connect4Batch
+    _states: npt.NDArray[np.float32]
+
+    def __init__(self: "SelfPlayEnvironment", no_environments: int) -> None:
+        self._games = Connect4Batch(no_environments)
+        self._states = self._get_states()
+
+    def get_states(self: "SelfPlayEnvironment") -> npt.NDArray[np.float32]:
+        return self._states
+
+    def step(
+        self: "SelfPlayEnvironment",
+        predict: Callable[[npt.NDArray[np.float32]], npt.NDArray[np.float32]],
+        epsilon: float,
+        rng: np.random.Generator,
+    ) -> Transitions:
+        # epsilon-greedy actions of all games, chosen with one batched prediction
+        states = self._states
+        available_actions = self._games.get_available_actions()
+        q_values = np.where(available_actions, predict(states), -np.inf)
+        actions = np.argmax(q_values, axis=1)
+
+        is_random = rng.random(len(actions)) < epsilon
+        if np.any(is_random):
+            random_scores = np.where(available_actions[is_random], rng.random((np.sum(is_random), NO_COLS)), -1.0)
+            actions[is_random] = np.argmax(random_scores, axis=1)
+
+        # finished games are reset by the step, their next states are masked by the terminations
+        wins, draws = self._games.step(actions)
+        rewards = wins.astype(np.float32)
+        terminations = (wins | draws).astype(np.float32)
+        self._states = self._get_states()
+
+        return states, actions.astype(np.int64), rewards, self._states, terminations
+
+    def _get_states(self: "SelfPlayEnvironment") -> npt.NDArray[np.float32]:
+        boards = self._games.get_boards().reshape(-1, NO_CELLS)
+        return (boards * self._games.get_current_players()[:, None]).astype(np.float32)
+
+
+class DQNTrainer:
+    """Trains a DeepQModel with experience of batched self-play games.
+
+    Every step plays one move in each environment, stores the transitions in a replay buffer and does one gradient
+    step on a sampled minibatch. The target network is synced every target_sync_interval steps, and the weights, the
+    exported numpy weights and the replay buffer are saved every checkpoint_interval steps.
+    """
+
+    _config: DQNConfig
+    _logger: logging.Logger
+    _q_model: QModel
+    _replay_buffer: ReplayBuffer
+    _environment: SelfPlayEnvironment
+    _rng: np.random.Generator
+    step: int
+
+    def __init__(
+        self: "DQNTrainer",
+        config_handler: ConfigHandler,
+        logger_handler: LoggerHandler,
+        q_model: QModel,
+        seed: int | None = None,
+    ) -> None:
+        self._config = DQNConfig(config_handler)
+        self._logger = logger_handler.get_logger(type(self).__name__)
+        self._q_model = q_model
+        self._replay_buffer = ReplayBuffer(self._config.replay_buffer_size, NO_CELLS)
+        self._environment = SelfPlayEnvironment(self._config.no_environments)
+        self._rng = np.random.default_rng(seed)
+        self.step = 0
+
+    def get_replay_buffer(self: "DQNTrainer") -> ReplayBuffer:
+        return self._replay_buffer
+
+    def get_epsilon(self: "DQNTrainer") -> float:
+        # linear decay from epsilon_start to epsilon_end
+        fraction = min(self.step / max(self._config.epsilon_decay_steps, 1), 1.0)
+        return self._config.epsilon_start + fraction * (self._config.epsilon_end - self._config.epsilon_start)
+
+    def train(self: "DQNTrainer", no_steps: int) -> None:
+        start_time = time.perf_counter()
+        start_step = self.step
+        losses: list[float] = []
+        for _ in range(no_steps):
+            losses.extend(self.train_step())
+
+            if self.step % self._config.checkpoint_interval == 0:
+                self.save_checkpoint()
+                elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+                transitions_per_second = self._config.no_environments * (self.step - start_step) / elapsed_time
+                self._logger.info(
+                    f"Step [{self.step}]: epsilon=[{self.get_epsilon():.3f}] "
+                    f"loss=[{np.mean(losses) if losses else float('nan'):.5f}] "
+                    f"transitions per second=[{transitions_per_second:.0f}]"
+                )
+                start_time = time.perf_counter()
+                start_step = self.step
+                losses = []
+
+    def train_step(self: "DQNTrainer") -> list[float]:
+        # returns the loss of the gradient step, if there was one
+        transitions = self._environment.step(self._q_model.predict, self.get_epsilon(), self._rng)
+        self._replay_buffer.add_transitions(*transitions)
+        self.step += 1
+
+        losses = []
+        if self._replay_buffer.get_number_of_transitions() >= self._config.min_replay_buffer_size:
+            minibatch = self._replay_buffer.sample(self._config.minibatch_size, self._rng)
+            losses.append(self._q_model.do_gradient_step(*minibatch, discount=self._config.discount))
+
+        if self.step % self._config.target_sync_interval == 0:
+            self._q_model.update_target_model()
+
+        return losses
+
+    def save_checkpoint(self: "DQNTrainer") -> None:
+        paths = self._get_checkpoint_paths()
+        os.makedirs(os.path.dirname(paths[0]) or ".", exist_ok=True)
+        self._q_model.save_weights(paths[0])
+        self._q_model.export_weights(paths[1])
+        self._replay_buffer.save(paths[2])
+        np.save(paths[3], self.step)
+        self._logger.debug(f"Saved checkpoint of step [{self.step}] to [{self._config.checkpoint_path}].")
+
+    def load_checkpoint(self: "DQNTrainer") -> None:
+        paths = self._get_checkpoint_paths()
+        self._q_model.load_weights(paths[0])
+        self._replay_buffer.load(paths[2])
+        self.step = int(np.load(paths[3]))
+        self._logger.info(f"Loaded checkpoint of step [{self.step}] from [{self._config.checkpoint_path}].")
+
+    def has_checkpoint(self: "DQNTrainer") -> bool:
+        return all(os.path.exists(path) for path in self._get_checkpoint_paths())
+
+    def _get_checkpoint_paths(self: "DQNTrainer") -> Tuple[str, str, str, str]:
+        # keras weights, numpy weights for NumpyQModel, replay buffer and step
+        path = self._config.checkpoint_path
+        return f"{path}.weights.h5", f"{path}.npz", f"{path}_replay_buffer.npz", f"{path}_step.npy"
+
+
+if __name__ == "__main__":
+    # tensorflow is only needed for training
+    from DeepQModel import DeepQModel
+
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    config = DQNConfig(config_handler)
+    q_model = DeepQModel(NO_CELLS, NO_COLS, config.no_layers, config.units, learning_rate=config.learning_rate)
+
+    trainer = DQNTrainer(config_handler, logger_handler, q_model)
+    if trainer.has_checkpoint():
+        trainer.load_checkpoint()
+    trainer.train(int(1e9))
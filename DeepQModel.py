@@ -2,6 +2,8 @@
 
 import tensorflow as tf
 
+from NumpyQModel import save_q_model_weights
+
 
 def create_NN(input_dim, output_dim, no_layers, units, activation = "elu"):
         model = tf.keras.Sequential()
@@ -16,6 +18,7 @@ def create_NN(input_dim, output_dim, no_layers, units, activation = "elu"):
 class DeepQModel:
     def __init__(self,input_dim, output_dim, no_layers, units, activation = "elu",learning_rate = 0.001):
         self.output_dim = output_dim
+        self.activation = activation
 
         self.model = create_NN(input_dim, output_dim, no_layers, units, activation)
         self.model_target = create_NN(input_dim, output_dim, no_layers, units, activation)
@@ -24,9 +27,15 @@ class DeepQModel:
 
         self.loss_funciton = tf.keras.losses.MeanSquaredError()
 
-    def do_gradient_step(self,init_states, actions, rewards, next_states, terminations):
+    def predict(self, states):
+        #q values of a batch of states, without the overhead of model.predict for small batches
+        return self.model(states, training=False).numpy()
+
+    def do_gradient_step(self,init_states, actions, rewards, next_states, terminations, discount = 1.0):
         #calculate targets from rewards and 'future rewards' from target_model
-        targets = rewards + (terminations-2)*(-1)*tf.reduce_max(self.model_target.predict(next_states),axis=1)
+        #next states are seen from the opponent, so its best q value counts against the player who acted
+        next_q_values = tf.reduce_max(self.model_target(next_states, training=False),axis=1)
+        targets = rewards - discount*(1-terminations)*next_q_values
 
         masks = tf.one_hot(actions, self.output_dim)
 
@@ -39,7 +48,21 @@ class DeepQModel:
         # Backpropagation
         grads = tape.gradient(loss, self.model.trainable_variables)
         self.optimizer.apply_gradients(zip(grads, self.model.trainable_variables))
+        return float(loss)
 
 
     def update_target_model(self):
         self.model_target.set_weights(self.model.get_weights())
+
+    def save_weights(self, path):
+        #keras weights of the model, to continue training from a checkpoint
+        self.model.save_weights(path)
+
+    def load_weights(self, path):
+        self.model.load_weights(path)
+        self.update_target_model()
+
+    def export_weights(self, path):
+        #save weights as .npz, which NumpyQModel can load without tensorflow
+        weights = self.model.get_weights()
+        save_q_model_weights(path, weights[0::2], weights[1::2], self.activation, "softsign")
@@ -0,0 +1,171 @@
+import os
+import struct
+from typing import BinaryIO, Iterator, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Game import Connect4
+from Connect4GameFactory import Connect4GameFactory, Connect4GameEngines
+from GameTurnHandler import GameTurnHandler
+
+# file header: magic, version, number of rows and columns of the board
+FILE_MAGIC = b"C4GR"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sBBB")
+# game header: starting player and number of moves, followed by one byte per move and the winner (0 if draw)
+GAME_HEADER = struct.Struct("<bB")
+GAME_RESULT = struct.Struct("<b")
+
+GameRecordBatch = Tuple[
+    npt.NDArray[np.int8],
+    npt.NDArray[np.int8],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int8],
+]
+
+
+class GameRecord:
+    """Moves and result of one game. Moves are columns, the players alternate starting with starting_player."""
+
+    starting_player: int
+    moves: npt.NDArray[np.int8]
+    winner: int
+
+    def __init__(self: "GameRecord", starting_player: int, moves: npt.ArrayLike, winner: int | None) -> None:
+        self.starting_player = starting_player
+        self.moves = np.asarray(moves, dtype=np.int8)
+        self.winner = winner if winner is not None else 0
+
+    def __eq__(self: "GameRecord", other: object) -> bool:
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (
+            self.starting_player == other.starting_player
+            and np.array_equal(self.moves, other.moves)
+            and self.winner == other.winner
+        )
+
+    def __repr__(self: "GameRecord") -> str:
+        return f"GameRecord(starting_player={self.starting_player}, moves={self.moves.tolist()}, winner={self.winner})"
+
+
+class GameRecordWriter:
+    """Appends games to a binary game record file, three bytes plus one byte per move for every game.
+
+    Games are written through a buffered file, so writing a game does not flush to disk. The file header is only
+    written to new files, so several sessions can append to the same file.
+    """
+
+    _path: str
+    _file: BinaryIO | None
+    number_of_games: int
+
+    def __init__(self: "GameRecordWriter", path: str, no_rows: int = 6, no_cols: int = 7) -> None:
+        self._path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")  # noqa: SIM115
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, no_rows, no_cols))
+        else:
+            read_file_header(path)
+        self.number_of_games = 0
+
+    def write(self: "GameRecordWriter", starting_player: int, moves: npt.ArrayLike, winner: int | None) -> None:
+        if self._file is None:
+            raise ValueError(f"Game record file [{self._path}] is closed.")
+
+        move_bytes = np.asarray(moves, dtype=np.int8).tobytes()
+        self._file.write(GAME_HEADER.pack(starting_player, len(move_bytes)))
+        self._file.write(move_bytes)
+        self._file.write(GAME_RESULT.pack(winner if winner is not None else 0))
+        self.number_of_games += 1
+
+    def write_record(self: "GameRecordWriter", game_record: GameRecord) -> None:
+        self.write(game_record.starting_player, game_record.moves, game_record.winner)
+
+    def flush(self: "GameRecordWriter") -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self: "GameRecordWriter") -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self: "GameRecordWriter") -> "GameRecordWriter":
+        return self
+
+    def __exit__(self: "GameRecordWriter", *args: object) -> None:
+        self.close()
+
+
+def read_file_header(path: str) -> Tuple[int, int]:
+    # returns the number of rows and columns of the board
+    with open(path, "rb") as file:
+        return _read_file_header(file, path)
+
+
+def _read_file_header(file: BinaryIO, path: str) -> Tuple[int, int]:
+    header = file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError(f"Unknown game record format [{path}].")
+    magic, version, no_rows, no_cols = FILE_HEADER.unpack(header)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+        raise ValueError(f"Unknown game record format [{path}].")
+    return no_rows, no_cols
+
+
+def read_game_records(path: str) -> Iterator[GameRecord]:
+    # yields the games one by one, without loading the whole file
+    with open(path, "rb") as file:
+        _read_file_header(file, path)
+        while True:
+            header = file.read(GAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < GAME_HEADER.size:
+                raise ValueError(f"Truncated game record in [{path}].")
+
+            starting_player, no_moves = GAME_HEADER.unpack(header)
+            body = file.read(no_moves + GAME_RESULT.size)
+            if len(body) < no_moves + GAME_RESULT.size:
+                raise ValueError(f"Truncated game record in [{path}].")
+
+            moves = np.frombuffer(body, dtype=np.int8, count=no_moves)
+            (winner,) = GAME_RESULT.unpack_from(body, no_moves)
+            yield GameRecord(starting_player, moves, winner)
+
+
+def read_game_record_batches(path: str, batch_size: int) -> Iterator[GameRecordBatch]:
+    # yields starting players, moves padded with -1 to shape (batch_size, max rounds), numbers of moves and winners
+    no_rows, no_cols = read_file_header(path)
+    batch: list[GameRecord] = []
+    for game_record in read_game_records(path):
+        batch.append(game_record)
+        if len(batch) == batch_size:
+            yield _to_batch(batch, no_rows * no_cols)
+            batch = []
+    if batch:
+        yield _to_batch(batch, no_rows * no_cols)
+
+
+def _to_batch(batch: list[GameRecord], max_rounds: int) -> GameRecordBatch:
+    moves = np.full((len(batch), max_rounds), -1, dtype=np.int8)
+    no_moves = np.array([len(game_record.moves) for game_record in batch], dtype=np.int64)
+    for idx, game_record in enumerate(batch):
+        moves[idx, : no_moves[idx]] = game_record.moves
+    starting_players = np.array([game_record.starting_player for game_record in batch], dtype=np.int8)
+    winners = np.array([game_record.winner for game_record in batch], dtype=np.int8)
+    return starting_players, moves, no_moves, winners
+
+
+def replay_game_record(game_record: GameRecord, engine: str = Connect4GameEngines.numpy) -> Connect4:
+    # the game after all moves of the record
+    game = Connect4GameFactory.create_game(engine, game_turn_handler=GameTurnHandler([1, -1]))
+    if game_record.starting_player == -1:
+        game.next_turn()
+
+    for move in game_record.moves:
+        game.place_disc(int(move))
+    return game
@@ -1,10 +1,13 @@
-import itertools
+class GameTurnHandler:
+    """Turn order of the players, the player values take turns in the order of player_values.
 
+    Turns are integer indices into player_values, so next_turn, copy and restore only do integer arithmetic.
+    """
 
-class GameTurnHandler:
     _current_player_value: int
     _next_player_value: int
     _player_values: list[int]
+    _no_players: int
     _starting_position: int
     _current_player_turn: int
     _next_player_turn: int
@@ -17,14 +20,11 @@ class GameTurnHandler:
 
     def setup(self: "GameTurnHandler", player_values: list[int], starting_position: int = 0) -> None:
         self._player_values = player_values
+        self._no_players = len(player_values)
         self._starting_position = starting_position
 
-        cycle = itertools.cycle(range(len(self._player_values)))
-        self._player_turn_cycle = itertools.islice(cycle, starting_position, None)
-
-        self._current_player_turn = next(self._player_turn_cycle)
-        self._next_player_turn = next(self._player_turn_cycle)
-
+        self._current_player_turn = starting_position % self._no_players
+        self._next_player_turn = (self._current_player_turn + 1) % self._no_players
         self._current_player_value = self._player_values[self._current_player_turn]
         self._next_player_value = self._player_values[self._next_player_turn]
 
@@ -38,13 +38,23 @@ class GameTurnHandler:
         self._current_player_turn = self._next_player_turn
         self._current_player_value = self._next_player_value
 
-        self._next_player_turn = next(self._player_turn_cycle)
+        self._next_player_turn = (self._next_player_turn + 1) % self._no_players
         self._next_player_value = self._player_values[self._next_player_turn]
 
     def copy(self: "GameTurnHandler") -> "GameTurnHandler":
         new_game_handler = GameTurnHandler(self._player_values, self._current_player_turn)
         return new_game_handler
 
+    def restore(self: "GameTurnHandler", game_turn_handler: "GameTurnHandler") -> None:
+        # continues from the turn of another handler, like copy, but keeps this handler
+        self._player_values = game_turn_handler._player_values
+        self._no_players = game_turn_handler._no_players
+        self._starting_position = game_turn_handler._current_player_turn
+        self._current_player_turn = game_turn_handler._current_player_turn
+        self._next_player_turn = game_turn_handler._next_player_turn
+        self._current_player_value = game_turn_handler._current_player_value
+        self._next_player_value = game_turn_handler._next_player_value
+
     def reset(self: "GameTurnHandler") -> None:
         self.setup(self._player_values, self._starting_position)
 
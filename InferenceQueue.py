@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Game import Connect4
+
+# evaluates a batch of positions, returns priors of shape (no_positions, no_actions) and win predictions
+BatchEvaluator = Callable[[list[Connect4]], Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]
+
+
+class InferenceQueue:
+    """Evaluates the positions of concurrent searches in batches.
+
+    Threads call evaluate like any other evaluator and wait until their position is evaluated. A worker thread collects
+    waiting positions until batch_size of them are waiting or max_wait_ms passed since the first one, and evaluates
+    them with one call of the batch evaluator. Searches sharing a queue should use virtual loss, so that their
+    selections stay diverse while they wait.
+    """
+
+    _batch_evaluator: BatchEvaluator
+    _batch_size: int
+    _max_wait_ms: float
+    _requests: queue.Queue
+    _worker_thread: threading.Thread | None
+    number_of_batches: int
+    number_of_evaluations: int
+
+    def __init__(
+        self: "InferenceQueue",
+        batch_evaluator: BatchEvaluator,
+        batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        self._batch_evaluator = batch_evaluator
+        self._batch_size = batch_size
+        self._max_wait_ms = max_wait_ms
+        self._requests = queue.Queue()
+        self.number_of_batches = 0
+        self.number_of_evaluations = 0
+
+        self._worker_thread = threading.Thread(target=self._evaluate_requests, daemon=True)
+        self._worker_thread.start()
+
+    def evaluate(self: "InferenceQueue", game: Connect4) -> Tuple[npt.NDArray[np.float64], float]:
+        # the game is not copied, it must not change until the evaluation is returned
+        future: Future = Future()
+        self._requests.put((game, future))
+        return future.result()
+
+    def get_average_batch_size(self: "InferenceQueue") -> float:
+        return self.number_of_evaluations / max(self.number_of_batches, 1)
+
+    def close(self: "InferenceQueue") -> None:
+        if self._worker_thread is None:
+            return
+
+        self._requests.put(None)
+        self._worker_thread.join()
+        self._worker_thread = None
+
+    def _evaluate_requests(self: "InferenceQueue") -> None:
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            is_closed = False
+            deadline = time.perf_counter() + self._max_wait_ms / 1000
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    is_closed = True
+                    break
+                batch.append(request)
+
+            self._evaluate_batch(batch)
+            if is_closed:
+                return
+
+    def _evaluate_batch(self: "InferenceQueue", batch: list[Tuple[Connect4, Future]]) -> None:
+        games = [game for game, _ in batch]
+        try:
+            priors, win_predictions = self._batch_evaluator(games)
+        except Exception as exception:  # noqa: BLE001
+            # the waiting threads raise the exception of the batch evaluator
+            for _, future in batch:
+                future.set_exception(exception)
+            return
+
+        self.number_of_batches += 1
+        self.number_of_evaluations += len(batch)
+        for idx, (_, future) in enumerate(batch):
+            future.set_result((priors[idx], float(win_predictions[idx])))
+
+
+def uniform_batch_evaluator(games: list[Connect4]) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    # batched version of standard_evaluator
+    number_of_actions = games[0].get_number_of_actions()
+    return np.full((len(games), number_of_actions), 1 / number_of_actions), np.full(len(games), 0.5)
+
+
+def create_q_value_batch_evaluator(
+    predict: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]],
+    temperature: Optional[float] = 1.0,
+) -> BatchEvaluator:
+    # predict maps boards of shape (no_positions, no_cells), where the player to move has discs 1, to q values in
+    # [-1, 1] of the player to move (as DeepQModel). The priors are a softmax of the q values, and the win
+    # prediction is that of the player who moved last, as expected by the search.
+    def q_value_batch_evaluator(
+        games: list[Connect4],
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        boards = np.stack([game._get_board().flatten() * game.get_current_player() for game in games])
+        q_values = np.asarray(predict(boards), dtype=np.float64)
+
+        if temperature is None:
+            priors = np.full(q_values.shape, 1 / q_values.shape[1])
+        else:
+            logits = (q_values - np.max(q_values, axis=1, keepdims=True)) / temperature
+            priors = np.exp(logits) / np.sum(np.exp(logits), axis=1, keepdims=True)
+        win_predictions = (1 - np.max(q_values, axis=1)) / 2
+        return priors, win_predictions
+
+    return q_value_batch_evaluator
+
+
+def create_q_value_evaluator(
+    predict: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]],
+    temperature: Optional[float] = 1.0,
+) -> Callable[[Connect4], Tuple[npt.NDArray[np.float64], float]]:
+    # evaluator of single positions, for searches which do not share an inference queue
+    q_value_batch_evaluator = create_q_value_batch_evaluator(predict, temperature)
+
+    def q_value_evaluator(game: Connect4) -> Tuple[npt.NDArray[np.float64], float]:
+        priors, win_predictions = q_value_batch_evaluator([game])
+        return priors[0], float(win_predictions[0])
+
+    return q_value_evaluator
+
+
+def create_policy_value_batch_evaluator(
+    predict: Callable[[npt.NDArray[np.float64]], Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]],
+) -> BatchEvaluator:
+    # predict maps boards as in create_q_value_batch_evaluator to policies and values in [-1, 1] of the player to
+    # move (as NumpyPolicyValueModel). The policies are the priors, and the win prediction is that of the player who
+    # moved last.
+    def policy_value_batch_evaluator(
+        games: list[Connect4],
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        boards = np.stack([game._get_board().flatten() * game.get_current_player() for game in games])
+        policies, values = predict(boards)
+        return np.asarray(policies, dtype=np.float64), (1 - np.asarray(values, dtype=np.float64)) / 2
+
+    return policy_value_batch_evaluator
+
+
+def create_policy_value_evaluator(
+    predict: Callable[[npt.NDArray[np.float64]], Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]],
+) -> Callable[[Connect4], Tuple[npt.NDArray[np.float64], float]]:
+    policy_value_batch_evaluator = create_policy_value_batch_evaluator(predict)
+
+    def policy_value_evaluator(game: Connect4) -> Tuple[npt.NDArray[np.float64], float]:
+        priors, win_predictions = policy_value_batch_evaluator([game])
+        return priors[0], float(win_predictions[0])
+
+    return policy_value_evaluator
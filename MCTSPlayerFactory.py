@@ -1,3 +1,5 @@
+from typing import Callable, Optional
+
 import ConfigHandler
 from Connect4Game import Connect4
 from Connect4Players import MCTSPlayer
@@ -13,11 +15,12 @@ class MCTSPlayerFactory:
         name: str,
         config_handler: ConfigHandler.ConfigHandler,
         logger_handler: LoggerHandler,
+        evaluator: Optional[Callable] = None,
     ) -> MCTSPlayer:
         # get config from config_handler based on inputted name
         mctsplayer_config = ConfigHandler.MCTSPlayerConfig(config_handler, name)
         # create mctsplayer using config and inputs
-        mctsplayer = MCTSPlayer(game, player, next_player, mctsplayer_config, logger_handler)
+        mctsplayer = MCTSPlayer(game, player, next_player, mctsplayer_config, logger_handler, evaluator)
         return mctsplayer
 
 
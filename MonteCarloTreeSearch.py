@@ -1,36 +1,99 @@
-from typing import Callable, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
 
-import numba  # type: ignore
 import numpy as np
 import numpy.typing as npt
 
 import Connect4Game
 from ConfigHandler import MCTSPlayerConfig
+from Connect4GameFactory import Connect4GameFactory
 from IPlayer import IPlayer
-from Tree import Tree
+from SearchStatistics import SearchStatistics
+from Tree import ArrayTree, Tree
+
+# a time limited search only checks the clock once per this number of simulations
+TIME_CHECK_INTERVAL = 16
+
+
+class SimulationPath:
+    """Visited states and actions of one simulation, in buffers preallocated for the longest game.
+
+    The buffers are reused by every simulation, reset only sets their lengths to zero. The action at index idx is
+    played in the state at index idx, the row height is the row of its disc.
+    """
+
+    state_hashes: list[int]
+    states_mirrored: npt.NDArray[np.bool_]
+    actions: npt.NDArray[np.int64]
+    row_heights: npt.NDArray[np.int64]
+    no_states: int
+    no_actions: int
+
+    def __init__(self: "SimulationPath", max_no_actions: int) -> None:
+        self.state_hashes = [0] * (max_no_actions + 1)
+        self.states_mirrored = np.zeros(max_no_actions + 1, dtype=np.bool_)
+        self.actions = np.zeros(max_no_actions, dtype=np.int64)
+        self.row_heights = np.zeros(max_no_actions, dtype=np.int64)
+        self.reset()
+
+    def reset(self: "SimulationPath") -> None:
+        self.no_states = 0
+        self.no_actions = 0
+
+    def add_state(self: "SimulationPath", state_hash: int, is_mirrored: bool) -> None:
+        self.state_hashes[self.no_states] = state_hash
+        self.states_mirrored[self.no_states] = is_mirrored
+        self.no_states += 1
+
+    def add_action(self: "SimulationPath", action: int, row_height: int) -> None:
+        self.actions[self.no_actions] = action
+        self.row_heights[self.no_actions] = row_height
+        self.no_actions += 1
+
+    def add_actions(
+        self: "SimulationPath",
+        actions: npt.NDArray[np.int64],
+        row_heights: npt.NDArray[np.int64],
+    ) -> None:
+        no_actions = self.no_actions + len(actions)
+        self.actions[self.no_actions : no_actions] = actions
+        self.row_heights[self.no_actions : no_actions] = row_heights
+        self.no_actions = no_actions
+
+    def get_last_action(self: "SimulationPath") -> int:
+        return int(self.actions[self.no_actions - 1])
 
 
 class MctsSimulationState:
+    root_game: Connect4Game.Connect4
     game: Connect4Game.Connect4
-    visited_state_hashes: list[int]
-    actions: list[int]
-    new_row_heights: list[int]
+    path: SimulationPath
     terminal_bool: bool
-    current_node: dict
+    current_node: dict | int | None
     last_player_reward: float
-
-    def __init__(self: "MctsSimulationState", game: Connect4Game.Connect4) -> None:
-        self.game = game.copy()
-
-    def reset(self: "MctsSimulationState", game: Connect4Game.Connect4) -> None:
-        self.game.reset(game)
-
-        self.visited_state_hashes = []
-        self.actions = []
-        self.new_row_heights = []
+    no_selected_actions: int
+    _game_engine: str
+
+    def __init__(self: "MctsSimulationState", game: Connect4Game.Connect4, game_engine: str) -> None:
+        self._game_engine = game_engine
+        self.set_root(game)
+        self.game = self.root_game.copy()
+        self.path = SimulationPath(self.game.get_max_rounds())
+
+    def set_root(self: "MctsSimulationState", game: Connect4Game.Connect4) -> None:
+        # convert the root position to the simulation game engine once per search
+        self.root_game = Connect4GameFactory.create_game(self._game_engine, game=game)
+
+    def reset(self: "MctsSimulationState") -> None:
+        # the game and the path buffers are reused, so a simulation does not allocate new containers
+        self.game.restore(self.root_game)
+        self.path.reset()
         self.terminal_bool = False
-        self.current_node = {}
+        self.current_node = -1
         self.last_player_reward = 0
+        self.no_selected_actions = 0
 
 
 class MonteCarloTreeSearchEngine:
@@ -38,10 +101,16 @@ class MonteCarloTreeSearchEngine:
     _player: int
     _config: MCTSPlayerConfig
     _rollout_player: IPlayer
-    _tree: Tree
+    _tree: Tree | ArrayTree
     _evaluator: Callable
     _use_rave: bool
     _simulation_state: MctsSimulationState
+    _tree_lock: threading.Lock
+    _remaining_rounds: int
+    _no_performed_rounds: int
+    _deadline: Optional[float]
+    _stop_event: Optional[threading.Event]
+    statistics: Optional[SearchStatistics]
 
     def __init__(
         self: "MonteCarloTreeSearchEngine",
@@ -49,7 +118,7 @@ class MonteCarloTreeSearchEngine:
         player: int,
         config: MCTSPlayerConfig,
         rollout_player: IPlayer,
-        tree: Tree,
+        tree: Tree | ArrayTree,
         evaluator: Callable,
     ) -> None:
         self._game = game
@@ -61,237 +130,352 @@ class MonteCarloTreeSearchEngine:
 
         self._use_rave = self._config.rave_param is not None
 
-        self._simulation_state = MctsSimulationState(self._game)
+        self._simulation_state = MctsSimulationState(self._game, self._config.game_engine)
+        self._tree_lock = threading.Lock()
+        self._remaining_rounds = 0
+        self._no_performed_rounds = 0
+        self._deadline = None
+        self._stop_event = None
+        self.statistics = None
 
-    def set_tree(self: "MonteCarloTreeSearchEngine", tree: Tree) -> None:
+    def set_tree(self: "MonteCarloTreeSearchEngine", tree: Tree | ArrayTree) -> None:
         self._tree = tree
 
-    def perform_search(self: "MonteCarloTreeSearchEngine", number_of_rounds: int) -> None:
-        for _ in range(number_of_rounds):
-            self._simulation_state.reset(self._game)
-            self._perform_single_simulation()
-            # mcts_single_simulation(
-            #     self._simulation_state.game,
-            #     self._tree,
-            #     self._config.confidence_value,
-            #     self._config.rave_param,
-            #     self._use_rave,
-            #     self._config.max_depth,
-            #     self._player,
-            #     self._evaluator,
-            #     self._config.rollout_weight,
-            #     self._rollout_player,
-            # )
+    def set_game(self: "MonteCarloTreeSearchEngine", game: Connect4Game.Connect4) -> None:
+        self._game = game
+
+    def perform_search(
+        self: "MonteCarloTreeSearchEngine",
+        number_of_rounds: int,
+        time_limit_ms: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> int:
+        # stops after number_of_rounds simulations, at the time limit or when stop_event is set
+        # returns the number of simulations performed, the counters of the search are kept in statistics
+        self._simulation_state.set_root(self._game)
+        self._deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+        self._stop_event = stop_event
+        self.statistics = SearchStatistics(self._config.max_depth) if self._config.collect_statistics else None
+
+        start_time = time.perf_counter()
+        if self._config.tree_parallel_threads > 1:
+            number_of_simulations = self._perform_tree_parallel_search(number_of_rounds)
+        else:
+            number_of_simulations = self._perform_sequential_search(number_of_rounds)
+
+        if self.statistics is not None:
+            self.statistics.finish(
+                time.perf_counter() - start_time,
+                self._tree.get_number_of_nodes(),
+                self.get_action_probabilities() if number_of_simulations > 0 else None,
+            )
+        return number_of_simulations
+
+    def _perform_sequential_search(self: "MonteCarloTreeSearchEngine", number_of_rounds: int) -> int:
+        for round_number in range(number_of_rounds):
+            if self._is_search_stopped(round_number):
+                return round_number
+            self._simulation_state.reset()
+            self._perform_single_simulation(self._simulation_state)
+        return number_of_rounds
 
     def get_best_root_action(self: "MonteCarloTreeSearchEngine") -> Tuple[int, float]:
-        start_node = self._tree.get_node(self._game.get_state_hash())
-        best_root_action = select_node_action_ucb1(start_node, 0, None)
-        winning_probability = start_node["q_values"][start_node["actions_idx"][best_root_action]]
-        return best_root_action, winning_probability
+        root_game = self._get_root_game()
+        root_state_hash, is_mirrored = get_tree_state_hash(root_game, self._config.symmetric_tree)
+        start_node = self._tree.get_node(root_state_hash)
+        best_root_action = self._tree.select_node_action(start_node, 0, None)
+        winning_probability = self._tree.get_q_value(start_node, best_root_action)
+        return mirror_action_if(root_game, best_root_action, is_mirrored), winning_probability
+
+    def get_action_probabilities(
+        self: "MonteCarloTreeSearchEngine",
+        temperature: float = 1,
+    ) -> npt.NDArray[np.float64]:
+        root_game = self._get_root_game()
+        root_state_hash, is_mirrored = get_tree_state_hash(root_game, self._config.symmetric_tree)
+        action_probabilities = self._tree.get_action_probabilities(
+            root_game,
+            temperature=temperature,
+            state_hash=root_state_hash,
+        )
+        return action_probabilities[::-1] if is_mirrored else action_probabilities
 
-    def _perform_single_simulation(self: "MonteCarloTreeSearchEngine") -> None:
+    def get_root_statistics(
+        self: "MonteCarloTreeSearchEngine",
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        # actions, number of visits and q values of the root node
+        root_game = self._get_root_game()
+        root_state_hash, is_mirrored = get_tree_state_hash(root_game, self._config.symmetric_tree)
+        actions, no_visits_actions, q_values = self._tree.get_action_statistics(self._tree.get_node(root_state_hash))
+        return mirror_action_if(root_game, np.asarray(actions), is_mirrored), no_visits_actions, q_values
+
+    def merge_root_statistics(
+        self: "MonteCarloTreeSearchEngine",
+        actions: npt.NDArray[np.int64],
+        no_visits_actions: npt.NDArray[np.int64],
+        q_values: npt.NDArray[np.float64],
+    ) -> None:
+        # add root statistics of an independent search from the same root position
+        root_game = self._get_root_game()
+        root_state_hash, is_mirrored = get_tree_state_hash(root_game, self._config.symmetric_tree)
+        root_node = self._tree.get_node(root_state_hash)
+        self._tree.add_action_statistics(
+            root_node,
+            mirror_action_if(root_game, actions, is_mirrored),
+            no_visits_actions,
+            q_values,
+        )
+
+    def prune_tree(self: "MonteCarloTreeSearchEngine", max_number_of_nodes: Optional[int] = None) -> int:
+        # remove nodes which can no longer be reached from the current root position
+        root_state_hash, _ = get_tree_state_hash(self._get_root_game(), self._config.symmetric_tree)
+        return self._tree.prune(root_state_hash, max_number_of_nodes)
+
+    def _get_root_game(self: "MonteCarloTreeSearchEngine") -> Connect4Game.Connect4:
+        # the tree is keyed by state hashes of the simulation game engine
+        self._simulation_state.set_root(self._game)
+        return self._simulation_state.root_game
+
+    def _is_search_stopped(self: "MonteCarloTreeSearchEngine", round_number: int) -> bool:
+        if self._stop_event is not None and self._stop_event.is_set():
+            return True
+
+        # at least TIME_CHECK_INTERVAL simulations are performed, so the root is always expanded
+        if self._deadline is None or round_number == 0 or round_number % TIME_CHECK_INTERVAL != 0:
+            return False
+        return time.perf_counter() >= self._deadline
+
+    def _perform_tree_parallel_search(self: "MonteCarloTreeSearchEngine", number_of_rounds: int) -> int:
+        # worker threads share one tree, which is only accessed while holding the tree lock
+        self._remaining_rounds = number_of_rounds
+        self._no_performed_rounds = 0
+        number_of_threads = self._config.tree_parallel_threads
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            futures = [
+                executor.submit(
+                    self._tree_parallel_worker,
+                    MctsSimulationState(self._simulation_state.root_game, self._config.game_engine),
+                )
+                for _ in range(number_of_threads)
+            ]
+            for future in futures:
+                future.result()
+
+        return self._no_performed_rounds
+
+    def _tree_parallel_worker(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
+        while self._claim_round():
+            simulation_state.reset()
+            start_time = time.perf_counter()
+            with self._tree_lock:
+                self._select(simulation_state, self._config.virtual_loss, defer_expansion=True)
+            selection_end_time = time.perf_counter()
+
+            # leaves are evaluated without the tree lock, so an inference queue can batch the evaluations of the threads
+            self._expand_deferred_leaf(simulation_state)
+            expansion_end_time = time.perf_counter()
+
+            # the compiled rollout kernels release the gil, so rollouts of the threads overlap
+            self._simulate(simulation_state)
+            rollout_end_time = time.perf_counter()
+
+            with self._tree_lock:
+                self._backpropagate(simulation_state)
+                self._remove_virtual_losses(simulation_state)
+                self._add_simulation_statistics(
+                    simulation_state,
+                    selection_end_time - start_time,
+                    rollout_end_time - expansion_end_time,
+                    time.perf_counter() - rollout_end_time,
+                )
+
+    def _claim_round(self: "MonteCarloTreeSearchEngine") -> bool:
+        with self._tree_lock:
+            if self._remaining_rounds <= 0 or self._is_search_stopped(self._no_performed_rounds):
+                return False
+            self._remaining_rounds -= 1
+            self._no_performed_rounds += 1
+            return True
+
+    def _perform_single_simulation(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
+        if self.statistics is None:
+            self._select(simulation_state)
+            self._simulate(simulation_state)
+            self._backpropagate(simulation_state)
+            return
+
+        # the expansion time of the selection is counted by mcts_selection
+        expansion_time = self.statistics.expansion_time
+        start_time = time.perf_counter()
+        self._select(simulation_state)
+        selection_end_time = time.perf_counter()
+        self._simulate(simulation_state)
+        rollout_end_time = time.perf_counter()
+        self._backpropagate(simulation_state)
+        self._add_simulation_statistics(
+            simulation_state,
+            selection_end_time - start_time - (self.statistics.expansion_time - expansion_time),
+            rollout_end_time - selection_end_time,
+            time.perf_counter() - rollout_end_time,
+        )
+
+    def _add_simulation_statistics(
+        self: "MonteCarloTreeSearchEngine",
+        simulation_state: MctsSimulationState,
+        selection_time: float,
+        rollout_time: float,
+        backpropagation_time: float,
+    ) -> None:
+        if self.statistics is None:
+            return
+
+        self.statistics.add_simulation(
+            selection_time,
+            rollout_time,
+            backpropagation_time,
+            simulation_state.no_selected_actions,
+            simulation_state.path.no_actions - simulation_state.no_selected_actions,
+        )
+
+    def _select(
+        self: "MonteCarloTreeSearchEngine",
+        simulation_state: MctsSimulationState,
+        virtual_loss: float = 0.0,
+        defer_expansion: bool = False,
+    ) -> None:
         ##selection
-        # self._selection()
         (
-            self._simulation_state.terminal_bool,
-            self._simulation_state.last_player_reward,
-            self._simulation_state.current_node,
+            simulation_state.terminal_bool,
+            simulation_state.last_player_reward,
+            simulation_state.current_node,
         ) = mcts_selection(
-            self._simulation_state.game,
+            simulation_state.game,
             self._tree,
             self._config.confidence_value,
             self._config.rave_param,
             self._config.max_depth,
             self._player,
             self._evaluator,
-            self._simulation_state.actions,
-            self._simulation_state.new_row_heights,
-            self._simulation_state.visited_state_hashes,
+            simulation_state.path,
+            virtual_loss,
+            self._config.symmetric_tree,
+            defer_expansion,
+            self.statistics,
         )
+        simulation_state.no_selected_actions = simulation_state.path.no_actions
+
+    def _expand_deferred_leaf(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
+        if simulation_state.current_node is not None:
+            return
+
+        start_time = time.perf_counter()
+        evaluation = self._evaluator(simulation_state.game)
+        with self._tree_lock:
+            number_of_nodes = self._tree.get_number_of_nodes()
+            simulation_state.current_node = mcts_deferred_expansion(
+                simulation_state.game,
+                self._tree,
+                evaluation,
+                simulation_state.path,
+            )
+            # another thread may have expanded the leaf while it was evaluated
+            if self.statistics is not None and self._tree.get_number_of_nodes() > number_of_nodes:
+                self.statistics.add_expansion(time.perf_counter() - start_time)
 
+    def _simulate(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
         ##simulation
-        if not self._simulation_state.terminal_bool:
-            self._simulation_state.last_player_reward = mcts_simulation(
-                self._simulation_state.game,
+        if not simulation_state.terminal_bool:
+            simulation_state.last_player_reward = mcts_simulation(
+                simulation_state.game,
                 self._config.rollout_weight,
                 self._rollout_player,
-                self._simulation_state.actions,
-                self._simulation_state.new_row_heights,
-                self._simulation_state.current_node,
+                simulation_state.path,
+                self._tree.get_prior_win_prediction(simulation_state.current_node),
+                self._config.compiled_rollout,
             )
 
+    def _backpropagate(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
         player_reward = (
-            self._simulation_state.last_player_reward
-            if (self._simulation_state.game.get_last_player() == self._player)
-            else 1 - self._simulation_state.last_player_reward
+            simulation_state.last_player_reward
+            if (simulation_state.game.get_last_player() == self._player)
+            else 1 - simulation_state.last_player_reward
         )
 
         ##backpropagation
         mcts_backpropagation(
             self._tree,
             player_reward,
-            self._simulation_state.visited_state_hashes,
-            self._simulation_state.actions,
-            self._simulation_state.new_row_heights,
+            simulation_state.path,
             self._use_rave,
         )
 
-    def _selection(self: "MonteCarloTreeSearchEngine") -> None:
-        self._simulation_state.terminal_bool, self._simulation_state.last_player_reward = check_game_over(
-            self._simulation_state.game,
-        )
-
-        while (not self._simulation_state.terminal_bool) and (
-            len(
-                self._simulation_state.visited_state_hashes,
-            )
-            <= self._config.max_depth
-        ):
-            current_state_hash = self._simulation_state.game.get_state_hash()
-            self._simulation_state.visited_state_hashes.append(current_state_hash)
-            no_visited_states = len(self._simulation_state.visited_state_hashes)
-
-            if no_visited_states > 1:
-                self._tree.update_next_state_hash(
-                    self._simulation_state.visited_state_hashes[-2],
-                    self._simulation_state.actions[-1],
-                    current_state_hash,
-                )
-
-            ##expansion and stop selection
-            if not self._tree.is_node_in_tree(current_state_hash):
-                self._expansion(current_state_hash)
-                break
-
-            self._simulation_state.current_node = self._tree.get_node(current_state_hash)
-
-            ##selection continued
-            (
-                self._simulation_state.terminal_bool,
-                self._simulation_state.last_player_reward,
-            ) = mcts_selection_find_and_perform_action(
-                self._simulation_state.game,
-                self._config.confidence_value,
-                self._config.rave_param,
-                self._player,
-                self._simulation_state.current_node,
-                self._simulation_state.actions,
-                self._simulation_state.new_row_heights,
-            )
-
-    def _expansion(self: "MonteCarloTreeSearchEngine", state_hash: int) -> None:
-        clever_available_actions = self._simulation_state.game.get_clever_available_actions()
-        # find priors and win_prediction from evaluator
-        priors, win_prediction = self._evaluator(self._simulation_state.game)
-        filtered_priors = priors[clever_available_actions]
-        filtered_priors = filtered_priors / sum(filtered_priors)
-
-        next_row_heights = self._simulation_state.game.next_row_height[clever_available_actions]
-        self._tree.new_node(
-            state_hash,
-            clever_available_actions,
-            next_row_heights,
-            filtered_priors,
-            win_prediction,
-        )
-        self._simulation_state.current_node = self._tree.get_node(state_hash)
-
-
-def mcts_single_simulation(
-    game: Connect4Game.Connect4,
-    tree: Tree,
-    confidence_value: float,
-    rave_param: float | None,
-    use_rave: bool,
-    max_depth: int,
-    player: int,
-    evaluator: Callable,
-    rollout_weight: float,
-    rollout_player: IPlayer,
-) -> None:
-    # Reset game and variables for new round
-    game_copy = game.copy()
-    visited_state_hashes: list[int] = []
-    actions: list[int] = []
-    new_row_heights: list[int] = []
-    terminal_bool = False
-
-    ##selection
-    terminal_bool, last_player_reward, current_node = mcts_selection(
-        game_copy,
-        tree,
-        confidence_value,
-        rave_param,
-        max_depth,
-        player,
-        evaluator,
-        actions,
-        new_row_heights,
-        visited_state_hashes,
-    )
-
-    ##simulation
-    if not terminal_bool:
-        last_player_reward = mcts_simulation(
-            game_copy,
-            rollout_weight,
-            rollout_player,
-            actions,
-            new_row_heights,
-            current_node,
-        )
-
-    player_reward = last_player_reward if (game_copy.get_last_player() == player) else 1 - last_player_reward
+    def _remove_virtual_losses(self: "MonteCarloTreeSearchEngine", simulation_state: MctsSimulationState) -> None:
+        if self._config.virtual_loss <= 0:
+            return
 
-    ##backpropagation
-    mcts_backpropagation(
-        tree,
-        player_reward,
-        visited_state_hashes,
-        actions,
-        new_row_heights,
-        use_rave,
-    )
+        path = simulation_state.path
+        for idx in range(simulation_state.no_selected_actions):
+            node = self._tree.get_node(path.state_hashes[idx])
+            action = mirror_action_if(simulation_state.game, int(path.actions[idx]), path.states_mirrored[idx])
+            self._tree.remove_virtual_loss(node, action)
 
 
 def mcts_selection(
     game: Connect4Game.Connect4,
-    tree: Tree,
+    tree: Tree | ArrayTree,
     confidence_value: float,
     rave_param: float | None,
     max_depth: int,
     player: int,
     evaluator: Callable,
-    actions: list[int],
-    new_row_heights: list[int],
-    visited_state_hashes: list[int],
-) -> Tuple[bool, float, dict]:
+    path: SimulationPath,
+    virtual_loss: float = 0.0,
+    symmetric_tree: bool = False,
+    defer_expansion: bool = False,
+    search_statistics: Optional[SearchStatistics] = None,
+) -> Tuple[bool, float, dict | int | None]:
+    # with a symmetric tree, nodes of mirrored positions store mirrored actions (see get_tree_state_hash)
     terminal_bool, last_player_reward = check_game_over(game)
 
-    while (not terminal_bool) and len(visited_state_hashes) <= max_depth:
-        current_state_hash = game.get_state_hash()
-        visited_state_hashes.append(current_state_hash)
-        no_visited_states = len(visited_state_hashes)
+    while (not terminal_bool) and path.no_states <= max_depth:
+        current_state_hash, is_mirrored = get_tree_state_hash(game, symmetric_tree)
+        path.add_state(current_state_hash, is_mirrored)
+
+        ##expansion
+        is_node_in_tree = tree.is_node_in_tree(current_state_hash)
+        if search_statistics is not None:
+            search_statistics.add_tree_lookup(is_node_in_tree)
+        if not is_node_in_tree and defer_expansion:
+            # the leaf is expanded by mcts_deferred_expansion, after it is evaluated
+            return terminal_bool, last_player_reward, None
+        if is_node_in_tree:
+            current_node = tree.get_node(current_state_hash)
+        elif search_statistics is None:
+            current_node = mcts_expansion(game, tree, evaluator, current_state_hash, is_mirrored)
+        else:
+            expansion_start_time = time.perf_counter()
+            current_node = mcts_expansion(game, tree, evaluator, current_state_hash, is_mirrored)
+            search_statistics.add_expansion(time.perf_counter() - expansion_start_time)
 
-        if no_visited_states > 1:
-            tree.update_next_state_hash(visited_state_hashes[-2], actions[-1], current_state_hash)
+        if path.no_states > 1:
+            prev_action = mirror_action_if(game, path.get_last_action(), path.states_mirrored[path.no_states - 2])
+            tree.update_next_state_hash(path.state_hashes[path.no_states - 2], prev_action, current_state_hash)
 
-        ##expansion and stop selection
-        if not tree.is_node_in_tree(current_state_hash):
-            current_node = mcts_expansion(game, tree, evaluator, current_state_hash)
+        ##stop selection after expansion
+        if not is_node_in_tree:
             break
-        else:
-            current_node = tree.get_node(current_state_hash)
 
         ##selection continued
         terminal_bool, last_player_reward = mcts_selection_find_and_perform_action(
             game,
+            tree,
             confidence_value,
             rave_param,
             player,
             current_node,
-            actions,
-            new_row_heights,
+            path,
+            virtual_loss,
+            is_mirrored,
         )
 
     return terminal_bool, last_player_reward, current_node
@@ -299,17 +483,24 @@ def mcts_selection(
 
 def mcts_expansion(
     game: Connect4Game.Connect4,
-    tree: Tree,
-    evaluator: Callable,
+    tree: Tree | ArrayTree,
+    evaluator: Optional[Callable],
     state_hash: int,
-) -> dict:
+    is_mirrored: bool = False,
+    evaluation: Optional[Tuple[npt.NDArray[np.float64], float]] = None,
+) -> dict | int:
     clever_available_actions = game.get_clever_available_actions()
-    # find priors and win_prediction from evaluator
-    priors, win_prediction = evaluator(game)
+    # find priors and win_prediction from evaluator, unless the position is evaluated already
+    priors, win_prediction = evaluator(game) if evaluation is None else evaluation
     filtered_priors = priors[clever_available_actions]
     filtered_priors = filtered_priors / sum(filtered_priors)
 
     next_row_heights = game.next_row_height[clever_available_actions]
+    if is_mirrored:
+        # the node stores the actions of the mirrored position, in ascending order as well
+        clever_available_actions = mirror_action_if(game, np.asarray(clever_available_actions), True)[::-1]
+        next_row_heights = next_row_heights[::-1]
+        filtered_priors = filtered_priors[::-1]
     tree.new_node(
         state_hash,
         clever_available_actions,
@@ -321,34 +512,56 @@ def mcts_expansion(
     return current_node
 
 
+def mcts_deferred_expansion(
+    game: Connect4Game.Connect4,
+    tree: Tree | ArrayTree,
+    evaluation: Tuple[npt.NDArray[np.float64], float],
+    path: SimulationPath,
+) -> dict | int:
+    # expands the last visited state with its evaluation, unless another thread expanded it in the meantime
+    state_hash = path.state_hashes[path.no_states - 1]
+    if tree.is_node_in_tree(state_hash):
+        current_node = tree.get_node(state_hash)
+    else:
+        is_mirrored = path.states_mirrored[path.no_states - 1]
+        current_node = mcts_expansion(game, tree, None, state_hash, is_mirrored, evaluation)
+
+    if path.no_states > 1:
+        prev_action = mirror_action_if(game, path.get_last_action(), path.states_mirrored[path.no_states - 2])
+        tree.update_next_state_hash(path.state_hashes[path.no_states - 2], prev_action, state_hash)
+    return current_node
+
+
 def mcts_selection_find_and_perform_action(
     game: Connect4Game.Connect4,
+    tree: Tree | ArrayTree,
     confidence_value: float,
     rave_param: float | None,
     player: int,
-    current_node: dict,
-    actions: list[int],
-    new_row_heights: list[int],
+    current_node: dict | int,
+    path: SimulationPath,
+    virtual_loss: float = 0.0,
+    is_mirrored: bool = False,
 ) -> Tuple[bool, float]:
     # get node and find ucb1 optimal action
-    selected_action = select_node_action_ucb1(
+    selected_action = tree.select_node_action(
         current_node,
         confidence_value,
         rave_param,
         max_bool=game.get_current_player() == player,
+        virtual_loss=virtual_loss,
     )
+    if virtual_loss > 0:
+        tree.add_virtual_loss(current_node, selected_action)
+    selected_action = mirror_action_if(game, selected_action, is_mirrored)
 
-    actions.append(selected_action)
-    new_row_heights.append(game.next_row_height[selected_action])
+    path.add_action(selected_action, game.next_row_height[selected_action])
 
-    # perform action
+    # perform action, the side to move follows from the round of the game
     game.place_disc(selected_action)
     # check if game is over
     terminal_bool, last_player_reward = check_game_over(game)
 
-    # update turn
-    game.next_turn()
-
     return terminal_bool, last_player_reward
 
 
@@ -356,27 +569,25 @@ def mcts_simulation(
     game: Connect4Game.Connect4,
     rollout_weight: float,
     rollout_player: IPlayer,
-    actions: list[int],
-    new_row_heights: list[int],
-    current_node: dict,
+    path: SimulationPath,
+    prior_win_prediction: float,
+    compiled_rollout: bool = False,
 ) -> float:
+    reward = 0.0
     if rollout_weight > 0:
-        reward = mcts_rollout(
-            game,
-            rollout_player,
-            actions,
-            new_row_heights,
-        )
+        if compiled_rollout:
+            reward = mcts_rollout_compiled(game, path)
+        else:
+            reward = mcts_rollout(game, rollout_player, path)
 
-    reward = rollout_weight * reward + (1 - rollout_weight) * current_node["prior_win_prediction"]
+    reward = rollout_weight * reward + (1 - rollout_weight) * prior_win_prediction
     return reward
 
 
 def mcts_rollout(
     game: Connect4Game.Connect4,
     rollout_player: IPlayer,
-    actions: list[int],
-    new_row_heights: list[int],
+    path: SimulationPath,
 ) -> float:
     terminal_bool, last_player_reward = check_game_over(game)
     while not terminal_bool:
@@ -385,37 +596,60 @@ def mcts_rollout(
 
         # get and simulate action
         sim_action = rollout_player.make_action(game, clever_available_actions)
-        actions.append(sim_action)
-        new_row_heights.append(game.next_row_height[sim_action])
+        path.add_action(sim_action, game.next_row_height[sim_action])
         game.place_disc(sim_action)
 
         # check if game is over
         terminal_bool, last_player_reward = check_game_over(game)
 
-        # update turn
-        game.next_turn()
+    return last_player_reward
+
 
+def mcts_rollout_compiled(game: Connect4Game.Connect4, path: SimulationPath) -> float:
+    # random rollout performed entirely by the game's compiled rollout kernel
+    last_player_reward, rollout_actions, rollout_row_heights = game.random_rollout()
+    path.add_actions(rollout_actions, rollout_row_heights)
     return last_player_reward
 
 
 def mcts_backpropagation(
-    tree: Tree,
+    tree: Tree | ArrayTree,
     reward: float,
-    visited_states: list[int],
-    actions: list[int],
-    new_row_heights: list[int],
+    path: SimulationPath,
     use_rave: bool,
 ) -> None:
-    # update player rewards
-    for idx in range(0, len(visited_states)):
-        tree.update_node(
-            visited_states[idx],
-            actions[idx],
-            reward,
-            following_actions=np.array(actions[idx + 2 :: 2]),
-            following_row_heights=np.array(new_row_heights[idx + 2 :: 2]),
-            use_rave=use_rave,
-        )
+    # actions of mirrored nodes are mirrored by the tree
+    # without a rollout (rollout_weight = 0) the new leaf has no following action, its value is its win prediction
+    # update player rewards of the whole path in one call
+    tree.update_path(
+        path.state_hashes,
+        path.states_mirrored,
+        path.no_states,
+        path.actions,
+        path.row_heights,
+        path.no_actions,
+        reward,
+        use_rave,
+    )
+
+
+def get_tree_state_hash(game: Connect4Game.Connect4, symmetric_tree: bool) -> Tuple[int, bool]:
+    # a position and its mirror image share the node of the smaller state hash
+    state_hash = game.get_state_hash()
+    if not symmetric_tree:
+        return state_hash, False
+
+    mirrored_state_hash = game.get_mirrored_state_hash()
+    if mirrored_state_hash < state_hash:
+        return mirrored_state_hash, True
+    return state_hash, False
+
+
+def mirror_action_if(game: Connect4Game.Connect4, action: Any, is_mirrored: bool) -> Any:
+    # maps actions (or arrays of actions) between a position and its mirror image
+    if not is_mirrored:
+        return action
+    return game.get_number_of_actions() - 1 - action
 
 
 def check_game_over(game: Connect4Game.Connect4) -> Tuple[bool, float]:
@@ -434,66 +668,3 @@ def check_game_over(game: Connect4Game.Connect4) -> Tuple[bool, float]:
         reward = 0.0
 
     return terminal_bool, reward
-
-
-def select_node_action_ucb1(
-    node: dict,
-    confidence_value: float,
-    rave_param: Optional[float],
-    max_bool: bool = True,
-) -> int:
-    if rave_param is None:
-        rave_bool = False
-        rave_param = 0
-    else:
-        rave_bool = True
-
-    return select_node_action_ucb1_numba(
-        node["q_values"],
-        node["no_visits"],
-        node["no_visits_actions"],
-        confidence_value,
-        node["amaf_q_values"],
-        node["amaf_no_visits_actions"],
-        rave_bool,
-        rave_param,
-        node["actions"],
-        max_bool,
-        node["priors"],
-    )
-
-
-@numba.njit
-def select_node_action_ucb1_numba(  # noqa: PLR0913
-    q_values: npt.NDArray[np.float64],
-    no_visits: list[int],
-    no_visits_actions: npt.NDArray[np.float64],
-    confidence_value: float,
-    amaf_q_values: list[int],
-    amaf_no_visits_actions: npt.NDArray[np.float64],
-    rave_bool: bool,
-    rave_param: float,
-    actions: list[int],
-    max_bool: bool,
-    priors: npt.NDArray[np.float64],
-) -> int:
-    exploration_term = priors * np.sqrt(no_visits) / (no_visits_actions + 1)
-
-    if rave_bool:
-        beta = amaf_no_visits_actions / (
-            no_visits_actions + amaf_no_visits_actions + 4 * no_visits_actions * amaf_no_visits_actions * rave_param**2
-        )
-        adjusted_q_values = (1 - beta) * q_values + beta * amaf_q_values
-    else:
-        adjusted_q_values = q_values
-
-    if max_bool:
-        ucb1_vals = adjusted_q_values + confidence_value * exploration_term
-        select_action_idx = np.argmax(ucb1_vals)
-    else:
-        ucb1_vals = adjusted_q_values - confidence_value * exploration_term
-        select_action_idx = np.argmin(ucb1_vals)
-
-    select_action = actions[select_action_idx]
-
-    return select_action
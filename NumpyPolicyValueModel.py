@@ -0,0 +1,78 @@
+from typing import Callable, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from NumpyQModel import ACTIVATIONS
+
+
+class NumpyPolicyValueModel:
+    """Forward pass of a PolicyValueModel network from weights exported with PolicyValueModel.export_weights.
+
+    The dense trunk is shared by a softmax policy head and a tanh value head. The value is the expected outcome in
+    [-1, 1] for the player to move, whose discs are 1 in the input boards.
+    """
+
+    _kernels: list[npt.NDArray[np.float64]]
+    _biases: list[npt.NDArray[np.float64]]
+    _policy_kernel: npt.NDArray[np.float64]
+    _policy_bias: npt.NDArray[np.float64]
+    _value_kernel: npt.NDArray[np.float64]
+    _value_bias: npt.NDArray[np.float64]
+    _activation: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+    input_dim: int
+    output_dim: int
+
+    def __init__(self: "NumpyPolicyValueModel", path: str) -> None:
+        with np.load(path) as weights:
+            no_layers = int(weights["no_layers"])
+            self._kernels = [weights[f"kernel_{layer}"].astype(np.float64) for layer in range(no_layers)]
+            self._biases = [weights[f"bias_{layer}"].astype(np.float64) for layer in range(no_layers)]
+            self._policy_kernel = weights["policy_kernel"].astype(np.float64)
+            self._policy_bias = weights["policy_bias"].astype(np.float64)
+            self._value_kernel = weights["value_kernel"].astype(np.float64)
+            self._value_bias = weights["value_bias"].astype(np.float64)
+            self._activation = ACTIVATIONS[str(weights["activation"])]
+
+        self.input_dim = self._kernels[0].shape[0]
+        self.output_dim = self._policy_kernel.shape[1]
+
+    def predict(
+        self: "NumpyPolicyValueModel",
+        states: npt.ArrayLike,
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        # policies of shape (no_states, output_dim) and values of shape (no_states,) of a batch of states
+        outputs = np.asarray(states, dtype=np.float64)
+        for kernel, bias in zip(self._kernels, self._biases):
+            outputs = self._activation(outputs @ kernel + bias)
+
+        logits = outputs @ self._policy_kernel + self._policy_bias
+        logits = logits - np.max(logits, axis=-1, keepdims=True)
+        policies = np.exp(logits) / np.sum(np.exp(logits), axis=-1, keepdims=True)
+        values = np.tanh(outputs @ self._value_kernel + self._value_bias)[..., 0]
+        return policies, values
+
+
+def save_policy_value_weights(
+    path: str,
+    kernels: list[npt.NDArray[np.float64]],
+    biases: list[npt.NDArray[np.float64]],
+    policy_weights: Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]],
+    value_weights: Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]],
+    activation: str,
+) -> None:
+    # kernels of the trunk and (kernel, bias) of the heads, with shape (input units, output units) as in keras
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unknown activation [{activation}].")
+
+    np.savez(
+        path,
+        no_layers=len(kernels),
+        activation=activation,
+        policy_kernel=policy_weights[0],
+        policy_bias=policy_weights[1],
+        value_kernel=value_weights[0],
+        value_bias=value_weights[1],
+        **{f"kernel_{layer}": kernel for layer, kernel in enumerate(kernels)},
+        **{f"bias_{layer}": bias for layer, bias in enumerate(biases)},
+    )
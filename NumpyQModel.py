@@ -0,0 +1,69 @@
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+# activations of the Dense layers of DeepQModel.create_NN, evaluated with numpy
+ACTIVATIONS: dict[str, Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]] = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "elu": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "softsign": lambda x: x / (1 + np.abs(x)),
+}
+
+
+class NumpyQModel:
+    """Forward pass of a DeepQModel network from weights exported with DeepQModel.export_weights.
+
+    Only numpy is needed, so players and workers which do not train can use a trained network without tensorflow.
+    predict has the interface of the keras model, so it can replace DeepQModel.model at play time.
+    """
+
+    _kernels: list[npt.NDArray[np.float64]]
+    _biases: list[npt.NDArray[np.float64]]
+    _activation: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+    _output_activation: Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+    input_dim: int
+    output_dim: int
+
+    def __init__(self: "NumpyQModel", path: str) -> None:
+        with np.load(path) as weights:
+            no_layers = int(weights["no_layers"])
+            self._kernels = [weights[f"kernel_{layer}"].astype(np.float64) for layer in range(no_layers)]
+            self._biases = [weights[f"bias_{layer}"].astype(np.float64) for layer in range(no_layers)]
+            self._activation = ACTIVATIONS[str(weights["activation"])]
+            self._output_activation = ACTIVATIONS[str(weights["output_activation"])]
+
+        self.input_dim = self._kernels[0].shape[0]
+        self.output_dim = self._kernels[-1].shape[1]
+
+    def predict(self: "NumpyQModel", states: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        # q values of a batch of states of shape (no_states, input_dim), or of a single state of shape (input_dim,)
+        q_values = np.asarray(states, dtype=np.float64)
+        for kernel, bias in zip(self._kernels[:-1], self._biases[:-1]):
+            q_values = self._activation(q_values @ kernel + bias)
+        return self._output_activation(q_values @ self._kernels[-1] + self._biases[-1])
+
+
+def save_q_model_weights(
+    path: str,
+    kernels: list[npt.NDArray[np.float64]],
+    biases: list[npt.NDArray[np.float64]],
+    activation: str,
+    output_activation: str,
+) -> None:
+    # kernels have shape (input units, output units) as in keras Dense layers
+    for name in (activation, output_activation):
+        if name not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation [{name}].")
+
+    np.savez(
+        path,
+        no_layers=len(kernels),
+        activation=activation,
+        output_activation=output_activation,
+        **{f"kernel_{layer}": kernel for layer, kernel in enumerate(kernels)},
+        **{f"bias_{layer}": bias for layer, bias in enumerate(biases)},
+    )
@@ -0,0 +1,85 @@
+from typing import Optional, Tuple
+
+import numba  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+from Connect4Bitboard import NO_COLS, board_to_bitboard, mirror_bitboard
+from Connect4Game import Connect4
+
+# Entries of the open addressing hash table. Empty slots have key -1.
+OPENING_BOOK_DTYPE = np.dtype([("key", np.int64), ("action", np.int8), ("value", np.float32)])
+EMPTY_KEY = -1
+
+
+class OpeningBook:
+    """Table of best actions and values for the first plies of a game, stored as a .npy file.
+
+    Positions are keyed from the perspective of the player to move (own discs + all discs), and a position
+    and its mirror image share one entry. The table is memory mapped, so processes share its memory.
+    """
+
+    _table: npt.NDArray
+
+    def __init__(self: "OpeningBook", path: str) -> None:
+        self._table = np.load(path, mmap_mode="r")
+
+    def get_number_of_entries(self: "OpeningBook") -> int:
+        return int(np.count_nonzero(self._table["key"] != EMPTY_KEY))
+
+    def lookup(self: "OpeningBook", game: Connect4) -> Optional[Tuple[int, float]]:
+        # returns the best action and its value for the player to move, or None if the position is not in the book
+        key, is_mirrored = get_opening_book_key(game)
+        slot = find_slot(self._table["key"], key)
+        if self._table["key"][slot] != key:
+            return None
+
+        action = int(self._table["action"][slot])
+        if is_mirrored:
+            action = NO_COLS - 1 - action
+        return action, float(self._table["value"][slot])
+
+
+def get_opening_book_key(game: Connect4) -> Tuple[int, bool]:
+    # own discs + all discs of the player to move, the smaller key of the position and its mirror image is used
+    position, mask = board_to_bitboard(game._get_board())
+    own_position = position if game.get_current_player() == 1 else mask ^ position
+    key = own_position + mask
+    mirrored_key = mirror_bitboard(key)
+    if mirrored_key < key:
+        return mirrored_key, True
+    return key, False
+
+
+def create_table(no_entries: int) -> npt.NDArray:
+    # power of two size with a load factor of at most one half
+    size = 1 << max(int(np.ceil(np.log2(max(2 * no_entries, 1)))), 1)
+    table = np.zeros(size, dtype=OPENING_BOOK_DTYPE)
+    table["key"] = EMPTY_KEY
+    return table
+
+
+@numba.njit
+def find_slot(keys: npt.NDArray[np.int64], key: int) -> int:
+    # slot holding the key, or the empty slot where it would be inserted (linear probing)
+    size_mask = np.uint64(len(keys) - 1)
+    slot = (np.uint64(key) * np.uint64(11400714819323198485)) & size_mask
+    while keys[slot] != key and keys[slot] != EMPTY_KEY:
+        slot = (slot + np.uint64(1)) & size_mask
+    return slot
+
+
+@numba.njit
+def insert_entry(
+    keys: npt.NDArray[np.int64],
+    actions: npt.NDArray[np.int8],
+    values: npt.NDArray[np.float32],
+    key: int,
+    action: int,
+    value: float,
+) -> None:
+    slot = find_slot(keys, key)
+    keys[slot] = key
+    actions[slot] = action
+    values[slot] = value
+
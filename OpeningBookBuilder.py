@@ -0,0 +1,86 @@
+import logging
+
+import numpy as np
+import numpy.typing as npt
+
+from ConfigHandler import ConfigHandler, OpeningBookConfig
+from Connect4Bitboard import NO_COLS
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory
+from OpeningBook import create_table, get_opening_book_key, insert_entry
+
+
+class OpeningBookBuilder:
+    """Builds an opening book with deep searches of an MCTS player from every position of the first plies."""
+
+    _config: OpeningBookConfig
+    _config_handler: ConfigHandler
+    _logger_handler: LoggerHandler
+    _logger: logging.Logger
+
+    def __init__(self: "OpeningBookBuilder", config_handler: ConfigHandler, logger_handler: LoggerHandler) -> None:
+        self._config = OpeningBookConfig(config_handler)
+        self._config_handler = config_handler
+        self._logger_handler = logger_handler
+        self._logger = logger_handler.get_logger(type(self).__name__)
+
+    def build(self: "OpeningBookBuilder") -> npt.NDArray:
+        positions = get_opening_positions(self._config.no_plies)
+        self._logger.info(f"Searching [{len(positions)}] positions of the first [{self._config.no_plies}] plies.")
+
+        table = create_table(len(positions))
+        for number, (key, game) in enumerate(positions.items()):
+            player = game.get_current_player()
+            mcts_player = MCTSPlayerFactory.create_player(
+                game,
+                player,
+                -player,
+                self._config.player_name,
+                self._config_handler,
+                self._logger_handler,
+            )
+            action = mcts_player.make_action(game, game.get_clever_available_actions())
+            value = mcts_player.winning_probability if mcts_player.winning_probability is not None else 0.5
+            mcts_player.close()
+
+            # actions are stored for the orientation of the canonical key
+            _, is_mirrored = get_opening_book_key(game)
+            if is_mirrored:
+                action = NO_COLS - 1 - action
+            insert_entry(table["key"], table["action"], table["value"], key, action, value)
+            self._logger.debug(f"Position [{number}] with key=[{key}]: best action=[{action}] value=[{value}]")
+
+        return table
+
+    def build_and_save(self: "OpeningBookBuilder") -> None:
+        np.save(self._config.path, self.build())
+        self._logger.info(f"Saved opening book to [{self._config.path}].")
+
+
+def get_opening_positions(no_plies: int) -> dict[int, Connect4]:
+    # every position (up to mirroring) reached within no_plies plies which is not yet decided
+    game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+    positions = {get_opening_book_key(game)[0]: game}
+    frontier = [game]
+    for _ in range(no_plies):
+        next_frontier = []
+        for game in frontier:
+            for action in game.get_available_actions():
+                next_game = game.copy()
+                if next_game.place_disc(action):
+                    continue
+                next_game.next_turn()
+                key, _ = get_opening_book_key(next_game)
+                if key not in positions:
+                    positions[key] = next_game
+                    next_frontier.append(next_game)
+        frontier = next_frontier
+    return positions
+
+
+if __name__ == "__main__":
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    OpeningBookBuilder(config_handler, logger_handler).build_and_save()
@@ -7,7 +7,9 @@ import numpy as np
 import Connect4Game
 import Connect4Players
 import GameTurnHandler
-from ConfigHandler import ConfigHandler
+from ConfigHandler import ConfigHandler, GameConfig, SolverConfig
+from Connect4GameFactory import Connect4GameFactory
+from GameRecord import GameRecordWriter
 from IPlayer import IPlayer
 from LoggerHandler import LoggerHandler
 from MCTSPlayerFactory import MCTSPlayerFactory, MCTSPlayerNames
@@ -24,6 +26,9 @@ class PlayConnect4:
     _debug: bool = False
     _logger: logging.Logger
     _logger_handler: LoggerHandler
+    _game_record_writer: GameRecordWriter | None
+    _starting_player: int
+    _moves: list[int]
     player: IPlayer
 
     def __init__(
@@ -39,6 +44,10 @@ class PlayConnect4:
         self._logger = self._logger_handler.get_logger(type(self).__name__)
         self._config_handler = config_handler
 
+        # finished games are appended to the game records
+        record_path = GameConfig(config_handler).record_path
+        self._game_record_writer = GameRecordWriter(record_path) if record_path is not None else None
+
     def setup_game(self: "PlayConnect4") -> None:
         self._does_human_want_to_play()
 
@@ -63,6 +72,8 @@ class PlayConnect4:
 
         # Reset Game
         self._game.reset()
+        self._starting_player = self._game.get_current_player()
+        self._moves = []
 
     def start_game(self: "PlayConnect4") -> None:
         action: int
@@ -75,6 +86,7 @@ class PlayConnect4:
         for _ in range(self._game.get_max_rounds()):
             # if human turn then ask human for action else ask AI player
             if self._game.get_current_player() == self.human_color_wish:
+                self._start_ai_pondering()
                 action = self._get_human_action()
             else:
                 action = self._get_nonhuman_player_action()
@@ -82,6 +94,7 @@ class PlayConnect4:
 
             # perform action and plot game
             self.game_over = self._game.place_disc(action)
+            self._moves.append(action)
             self._game.plot_board_state(update=True)
 
             # Check if game is over
@@ -90,6 +103,7 @@ class PlayConnect4:
             # Go to next turn
             self._game.next_turn()
 
+        self._write_game_record()
         self._message_to_human_player("We are draw... Good game.")
         self._question_to_human_player("Press Escape to stop the game: ")
         self._close_game()
@@ -166,7 +180,7 @@ class PlayConnect4:
     def _get_human_difficulty_wish(self: "PlayConnect4") -> None:
         time.sleep(0.25)
         difficulty: str = self._question_to_human_player(
-            "Choose a difficulty [easy,normal,hard,god]: ",
+            "Choose a difficulty [easy,normal,hard,god,perfect]: ",
         )
 
         while not isinstance(difficulty, str) or difficulty.lower() not in [
@@ -174,14 +188,16 @@ class PlayConnect4:
             "normal",
             "hard",
             "god",
+            "perfect",
             "e",
             "n",
             "h",
             "g",
+            "p",
         ]:
             time.sleep(0.25)
             difficulty = self._question_to_human_player(
-                "Answer not valid. Please choose a valid difficulty [easy,normal,hard,god]: ",
+                "Answer not valid. Please choose a valid difficulty [easy,normal,hard,god,perfect]: ",
             )
 
         self.difficulty: str = difficulty.lower()
@@ -193,6 +209,10 @@ class PlayConnect4:
             self.player = Connect4Players.RandomPlayer()
             self._message_to_human_player("Ok... pussy. Let's play...")
             return
+        if self.difficulty in ["perfect", "p"]:
+            self.player = Connect4Players.SolverPlayer(SolverConfig(self._config_handler), self._logger_handler)
+            self._message_to_human_player("There is no hope for you. Let's go!")
+            return
 
         use_mcts_player = False
         if self.difficulty in ["normal", "n"]:
@@ -254,11 +274,17 @@ class PlayConnect4:
         action = self.player.make_action(self._game, clever_available_actions)
         return action
 
+    # Let AI player search while human is thinking
+    def _start_ai_pondering(self: "PlayConnect4") -> None:
+        if isinstance(self.player, Connect4Players.MCTSPlayer):
+            self.player.start_pondering(self._game)
+
     # Check if game is over and who has won
     def _check_game_over(self: "PlayConnect4") -> None:
         if not self.game_over:
             return
 
+        self._write_game_record()
         if self._game.get_winner() == self.human_color_wish:
             self._message_to_human_player("God damn it... You are the master.")
         else:
@@ -268,10 +294,23 @@ class PlayConnect4:
 
     def _log_player_action(self: "PlayConnect4", action: int) -> None:
         self._message_to_human_player(f"I will play column {action+1}")
-        if hasattr(self.player, "winning_probability"):
+        # the solver has no estimate if it could not solve the position in time
+        winning_probability = getattr(self.player, "winning_probability", None)
+        if winning_probability is not None:
             self._message_to_human_player(
-                f"I estimate that my probability of winning is: {round(self.player.winning_probability, 4) * 100}%",
+                f"I estimate that my probability of winning is: {round(winning_probability, 4) * 100}%",
             )
+        search_statistics = getattr(self.player, "search_statistics", None)
+        if search_statistics is not None:
+            self._logger.info(f"Search statistics: {search_statistics}")
+
+    def _write_game_record(self: "PlayConnect4") -> None:
+        if self._game_record_writer is None:
+            return
+
+        self._game_record_writer.write(self._starting_player, self._moves, self._game.get_winner())
+        self._game_record_writer.flush()
+        self._logger.info(f"Game record written with [{len(self._moves)}] moves.")
 
     def _question_to_human_player(self: "PlayConnect4", question: str) -> str:
         self._logger.info(f"Question to player: '{question}'")
@@ -285,6 +324,10 @@ class PlayConnect4:
 
     def _close_game(self: "PlayConnect4") -> None:
         self._logger.info("Stopping game.")
+        if hasattr(self, "player") and isinstance(self.player, Connect4Players.MCTSPlayer):
+            self.player.close()
+        if self._game_record_writer is not None:
+            self._game_record_writer.close()
         sys.exit()
 
 
@@ -292,7 +335,8 @@ def main() -> None:
     config_handler = ConfigHandler()
     logger_handler = LoggerHandler(config_handler)
     game_turn_handler = GameTurnHandler.GameTurnHandler()
-    game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+    game_config = GameConfig(config_handler)
+    game = Connect4GameFactory.create_game(game_config.engine, game_turn_handler=game_turn_handler)
     playconnect4 = PlayConnect4(game, game_turn_handler, logger_handler, config_handler)
 
     playconnect4.setup_game()
@@ -0,0 +1,61 @@
+#two-headed network for AlphaZero style training, the numpy version is NumpyPolicyValueModel
+
+import tensorflow as tf
+
+from NumpyPolicyValueModel import save_policy_value_weights
+
+
+def create_policy_value_NN(input_dim, output_dim, no_layers, units, activation = "elu"):
+        inputs = tf.keras.Input(shape=(input_dim,))
+        outputs = inputs
+        for _ in range(no_layers):
+            outputs = tf.keras.layers.Dense(units, activation=activation,kernel_regularizer="l2")(outputs)
+
+        policies = tf.keras.layers.Dense(output_dim,activation="softmax",kernel_regularizer="l2")(outputs)
+        values = tf.keras.layers.Dense(1,activation="tanh",kernel_regularizer="l2")(outputs)
+
+        return tf.keras.Model(inputs=inputs, outputs=[policies, values])
+
+class PolicyValueModel:
+    def __init__(self,input_dim, output_dim, no_layers, units, activation = "elu",learning_rate = 0.001):
+        self.output_dim = output_dim
+        self.activation = activation
+
+        self.model = create_policy_value_NN(input_dim, output_dim, no_layers, units, activation)
+
+        self.optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+
+        self.policy_loss_function = tf.keras.losses.CategoricalCrossentropy()
+        self.value_loss_function = tf.keras.losses.MeanSquaredError()
+
+    def predict(self, states):
+        #policies and values of a batch of states
+        policies, values = self.model(states, training=False)
+        return policies.numpy(), values.numpy()[:, 0]
+
+    def do_gradient_step(self, states, policies, values):
+        #policies are the visit distributions of the searches, values the outcomes for the player to move
+        with tf.GradientTape() as tape:
+            predicted_policies, predicted_values = self.model(states, training=True)
+            loss = self.policy_loss_function(policies, predicted_policies) + self.value_loss_function(
+                values, predicted_values[:, 0],
+            )
+
+        # Backpropagation
+        grads = tape.gradient(loss, self.model.trainable_variables)
+        self.optimizer.apply_gradients(zip(grads, self.model.trainable_variables))
+        return float(loss)
+
+    def save_weights(self, path):
+        self.model.save_weights(path)
+
+    def load_weights(self, path):
+        self.model.load_weights(path)
+
+    def export_weights(self, path):
+        #save weights as .npz, which NumpyPolicyValueModel can load without tensorflow
+        #the trunk layers come first, followed by the policy head and the value head
+        weights = self.model.get_weights()
+        policy_weights = (weights[-4], weights[-3])
+        value_weights = (weights[-2], weights[-1])
+        save_policy_value_weights(path, weights[0:-4:2], weights[1:-4:2], policy_weights, value_weights, self.activation)
@@ -0,0 +1,101 @@
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+Transitions = Tuple[
+    npt.NDArray[np.float32],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.float32],
+    npt.NDArray[np.float32],
+    npt.NDArray[np.float32],
+]
+
+
+class ReplayBuffer:
+    """Ring buffer of (state, action, reward, next_state, termination) transitions in preallocated arrays.
+
+    Batches of transitions are written with one assignment per array. Once the buffer is full, the oldest
+    transitions are overwritten.
+    """
+
+    _capacity: int
+    _states: npt.NDArray[np.float32]
+    _actions: npt.NDArray[np.int64]
+    _rewards: npt.NDArray[np.float32]
+    _next_states: npt.NDArray[np.float32]
+    _terminations: npt.NDArray[np.float32]
+    _next_idx: int
+    _no_transitions: int
+
+    def __init__(self: "ReplayBuffer", capacity: int, state_dim: int) -> None:
+        self._capacity = capacity
+        self._states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self._actions = np.zeros(capacity, dtype=np.int64)
+        self._rewards = np.zeros(capacity, dtype=np.float32)
+        self._next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self._terminations = np.zeros(capacity, dtype=np.float32)
+        self._next_idx = 0
+        self._no_transitions = 0
+
+    def get_capacity(self: "ReplayBuffer") -> int:
+        return self._capacity
+
+    def get_number_of_transitions(self: "ReplayBuffer") -> int:
+        return self._no_transitions
+
+    def add_transitions(
+        self: "ReplayBuffer",
+        states: npt.ArrayLike,
+        actions: npt.NDArray[np.int64],
+        rewards: npt.ArrayLike,
+        next_states: npt.ArrayLike,
+        terminations: npt.ArrayLike,
+    ) -> None:
+        # only the newest transitions are kept if there are more than fit
+        skip = max(len(actions) - self._capacity, 0)
+        no_new_transitions = len(actions) - skip
+
+        idx = (self._next_idx + np.arange(no_new_transitions)) % self._capacity
+        self._states[idx] = np.asarray(states)[skip:]
+        self._actions[idx] = np.asarray(actions)[skip:]
+        self._rewards[idx] = np.asarray(rewards)[skip:]
+        self._next_states[idx] = np.asarray(next_states)[skip:]
+        self._terminations[idx] = np.asarray(terminations)[skip:]
+
+        self._next_idx = (self._next_idx + no_new_transitions) % self._capacity
+        self._no_transitions = min(self._no_transitions + no_new_transitions, self._capacity)
+
+    def sample(self: "ReplayBuffer", batch_size: int, rng: np.random.Generator) -> Transitions:
+        # uniformly sampled transitions (with replacement)
+        idx = rng.integers(0, self._no_transitions, size=batch_size)
+        return (
+            self._states[idx],
+            self._actions[idx],
+            self._rewards[idx],
+            self._next_states[idx],
+            self._terminations[idx],
+        )
+
+    def save(self: "ReplayBuffer", path: str) -> None:
+        np.savez(
+            path,
+            states=self._states[: self._no_transitions],
+            actions=self._actions[: self._no_transitions],
+            rewards=self._rewards[: self._no_transitions],
+            next_states=self._next_states[: self._no_transitions],
+            terminations=self._terminations[: self._no_transitions],
+            next_idx=self._next_idx,
+        )
+
+    def load(self: "ReplayBuffer", path: str) -> None:
+        # transitions saved from a buffer of the same capacity keep their positions in the ring
+        with np.load(path) as transitions:
+            no_transitions = min(len(transitions["actions"]), self._capacity)
+            self._states[:no_transitions] = transitions["states"][:no_transitions]
+            self._actions[:no_transitions] = transitions["actions"][:no_transitions]
+            self._rewards[:no_transitions] = transitions["rewards"][:no_transitions]
+            self._next_states[:no_transitions] = transitions["next_states"][:no_transitions]
+            self._terminations[:no_transitions] = transitions["terminations"][:no_transitions]
+            self._next_idx = int(transitions["next_idx"]) % self._capacity
+            self._no_transitions = no_transitions
@@ -0,0 +1,110 @@
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Tuple
+
+import numba  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+from ConfigHandler import MCTSPlayerConfig
+from Connect4Game import Connect4
+from IPlayer import IPlayer
+from MonteCarloTreeSearch import MonteCarloTreeSearchEngine
+from TreeFactory import TreeFactory
+
+RootStatistics = Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.float64]]
+
+
+class RootParallelSearch:
+    """Root parallel monte carlo tree search.
+
+    Every worker process searches its own tree from the same root position with an independent seed.
+    The calling process searches a share of the playouts as well, and merges the root statistics of the workers.
+    """
+
+    _player: int
+    _config: MCTSPlayerConfig
+    _rollout_player: IPlayer
+    _evaluator: Callable
+    _number_of_workers: int
+    _executor: ProcessPoolExecutor | None
+
+    def __init__(
+        self: "RootParallelSearch",
+        player: int,
+        config: MCTSPlayerConfig,
+        rollout_player: IPlayer,
+        evaluator: Callable,
+    ) -> None:
+        self._player = player
+        self._config = config
+        self._rollout_player = rollout_player
+        self._evaluator = evaluator
+        self._number_of_workers = config.root_parallel_workers
+        self._executor = None
+
+    def get_number_of_workers(self: "RootParallelSearch") -> int:
+        return self._number_of_workers
+
+    def get_number_of_rounds_per_worker(self: "RootParallelSearch", number_of_rounds: int) -> int:
+        return math.ceil(number_of_rounds / self._number_of_workers)
+
+    def start_search(self: "RootParallelSearch", game: Connect4, number_of_rounds: int) -> list[Future]:
+        # the calling process is one of the workers, so only number_of_workers - 1 processes are started
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._number_of_workers - 1)
+
+        seeds = np.random.randint(0, 2**31 - 1, size=self._number_of_workers - 1)  # noqa: NPY002
+        return [
+            self._executor.submit(
+                search_root_statistics,
+                game.copy(),
+                self._player,
+                self._config,
+                self._rollout_player,
+                self._evaluator,
+                number_of_rounds,
+                int(seed),
+            )
+            for seed in seeds
+        ]
+
+    @staticmethod
+    def get_results(futures: list[Future]) -> list[RootStatistics]:
+        return [future.result() for future in futures]
+
+    def close(self: "RootParallelSearch") -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def search_root_statistics(
+    game: Connect4,
+    player: int,
+    config: MCTSPlayerConfig,
+    rollout_player: IPlayer,
+    evaluator: Callable,
+    number_of_rounds: int,
+    seed: int,
+) -> RootStatistics:
+    # runs in a worker process
+    np.random.seed(seed)  # noqa: NPY002
+    seed_numba_random_generator(seed)
+
+    tree = TreeFactory.create_tree(config.tree_type, game.get_number_of_actions())
+    mcts_engine = MonteCarloTreeSearchEngine(game, player, config, rollout_player, tree, evaluator)
+    mcts_engine.perform_search(number_of_rounds, config.time_limit_ms)
+
+    actions, no_visits_actions, q_values = mcts_engine.get_root_statistics()
+    return (
+        np.array(actions, dtype=np.int64),
+        np.array(no_visits_actions, dtype=np.int64),
+        np.array(q_values, dtype=np.float64),
+    )
+
+
+@numba.njit
+def seed_numba_random_generator(seed: int) -> None:
+    # numba keeps its own random state, which is not affected by seeding numpy outside compiled code
+    np.random.seed(seed)  # noqa: NPY002
@@ -0,0 +1,126 @@
+import numpy as np
+import numpy.typing as npt
+
+
+class SearchStatistics:
+    """Counters of one search of MonteCarloTreeSearchEngine, collected if collect_statistics is set.
+
+    Times are in seconds. The selection time does not include the expansion of new leaves, which is counted as
+    expansion time. Transposition hits are lookups of is_node_in_tree during selection that found an existing node.
+    """
+
+    max_depth: int
+    number_of_simulations: int
+    search_time: float
+    selection_time: float
+    expansion_time: float
+    rollout_time: float
+    backpropagation_time: float
+    total_selection_depth: int
+    max_selection_depth: int
+    total_rollout_length: int
+    number_of_nodes_created: int
+    number_of_transposition_hits: int
+    tree_size: int
+    root_visit_distribution: npt.NDArray[np.float64] | None
+
+    def __init__(self: "SearchStatistics", max_depth: int) -> None:
+        self.max_depth = max_depth
+        self.number_of_simulations = 0
+        self.search_time = 0.0
+        self.selection_time = 0.0
+        self.expansion_time = 0.0
+        self.rollout_time = 0.0
+        self.backpropagation_time = 0.0
+        self.total_selection_depth = 0
+        self.max_selection_depth = 0
+        self.total_rollout_length = 0
+        self.number_of_nodes_created = 0
+        self.number_of_transposition_hits = 0
+        self.tree_size = 0
+        self.root_visit_distribution = None
+
+    def add_tree_lookup(self: "SearchStatistics", is_node_in_tree: bool) -> None:
+        self.number_of_transposition_hits += is_node_in_tree
+
+    def add_expansion(self: "SearchStatistics", expansion_time: float) -> None:
+        self.number_of_nodes_created += 1
+        self.expansion_time += expansion_time
+
+    def add_simulation(
+        self: "SearchStatistics",
+        selection_time: float,
+        rollout_time: float,
+        backpropagation_time: float,
+        selection_depth: int,
+        rollout_length: int,
+    ) -> None:
+        self.number_of_simulations += 1
+        self.selection_time += selection_time
+        self.rollout_time += rollout_time
+        self.backpropagation_time += backpropagation_time
+        self.total_selection_depth += selection_depth
+        self.max_selection_depth = max(self.max_selection_depth, selection_depth)
+        self.total_rollout_length += rollout_length
+
+    def finish(
+        self: "SearchStatistics",
+        search_time: float,
+        tree_size: int,
+        root_visit_distribution: npt.NDArray[np.float64] | None,
+    ) -> None:
+        self.search_time = search_time
+        self.tree_size = tree_size
+        self.root_visit_distribution = root_visit_distribution
+
+    def get_simulations_per_second(self: "SearchStatistics") -> float:
+        return self.number_of_simulations / self.search_time if self.search_time > 0 else 0.0
+
+    def get_mean_selection_depth(self: "SearchStatistics") -> float:
+        return self.total_selection_depth / max(self.number_of_simulations, 1)
+
+    def get_mean_rollout_length(self: "SearchStatistics") -> float:
+        return self.total_rollout_length / max(self.number_of_simulations, 1)
+
+    def get_time_shares(self: "SearchStatistics") -> dict[str, float]:
+        # share of the search time spent in every phase, the rest is bookkeeping between the phases
+        search_time = max(self.search_time, 1e-12)
+        return {
+            "selection": self.selection_time / search_time,
+            "expansion": self.expansion_time / search_time,
+            "rollout": self.rollout_time / search_time,
+            "backpropagation": self.backpropagation_time / search_time,
+        }
+
+    def to_dict(self: "SearchStatistics") -> dict:
+        return {
+            "number_of_simulations": self.number_of_simulations,
+            "simulations_per_second": self.get_simulations_per_second(),
+            "search_time": self.search_time,
+            "time_shares": self.get_time_shares(),
+            "mean_selection_depth": self.get_mean_selection_depth(),
+            "max_selection_depth": self.max_selection_depth,
+            "max_depth": self.max_depth,
+            "mean_rollout_length": self.get_mean_rollout_length(),
+            "number_of_nodes_created": self.number_of_nodes_created,
+            "number_of_transposition_hits": self.number_of_transposition_hits,
+            "tree_size": self.tree_size,
+            "root_visit_distribution": (
+                None if self.root_visit_distribution is None else self.root_visit_distribution.tolist()
+            ),
+        }
+
+    def __str__(self: "SearchStatistics") -> str:
+        time_shares = "/".join(f"{share:.2f}" for share in self.get_time_shares().values())
+        root_visit_distribution = (
+            None if self.root_visit_distribution is None else np.round(self.root_visit_distribution, 3).tolist()
+        )
+        return (
+            f"simulations=[{self.number_of_simulations}] "
+            f"simulations per second=[{self.get_simulations_per_second():.0f}] "
+            f"selection/expansion/rollout/backpropagation time shares=[{time_shares}] "
+            f"selection depth mean/max=[{self.get_mean_selection_depth():.1f}/{self.max_selection_depth}] "
+            f"of max depth=[{self.max_depth}] mean rollout length=[{self.get_mean_rollout_length():.1f}] "
+            f"nodes created=[{self.number_of_nodes_created}] transposition hits=[{self.number_of_transposition_hits}] "
+            f"tree size=[{self.tree_size}] root visit distribution={root_visit_distribution}"
+        )
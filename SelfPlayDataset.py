@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+Samples = Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32], npt.NDArray[np.float32]]
+
+SHARD_SUFFIX = ".npz"
+
+
+class SelfPlayDataset:
+    """Streaming on-disk dataset of (state, visit distribution, outcome) samples of self-play games.
+
+    Every writer appends shards to the directory, one npz file per call of write_shard. A shard is written to a
+    temporary file and renamed when complete, so readers in other processes never see partial shards. Shard names
+    start with the time they were written, so the newest samples can be read without opening older shards.
+    """
+
+    _path: str
+
+    def __init__(self: "SelfPlayDataset", path: str) -> None:
+        self._path = path
+        os.makedirs(self._path, exist_ok=True)
+
+    def write_shard(
+        self: "SelfPlayDataset",
+        states: npt.ArrayLike,
+        policies: npt.ArrayLike,
+        values: npt.ArrayLike,
+    ) -> str:
+        # returns the path of the new shard
+        name = f"{time.time_ns():020d}_{os.getpid()}"
+        temporary_path = os.path.join(self._path, f".{name}.tmp{SHARD_SUFFIX}")
+        shard_path = os.path.join(self._path, f"{name}_{len(np.asarray(values))}{SHARD_SUFFIX}")
+        np.savez(
+            temporary_path,
+            states=np.asarray(states, dtype=np.float32),
+            policies=np.asarray(policies, dtype=np.float32),
+            values=np.asarray(values, dtype=np.float32),
+        )
+        os.replace(temporary_path, shard_path)
+        return shard_path
+
+    def get_shard_paths(self: "SelfPlayDataset") -> list[str]:
+        # complete shards from oldest to newest
+        names = sorted(
+            name for name in os.listdir(self._path) if name.endswith(SHARD_SUFFIX) and not name.startswith(".")
+        )
+        return [os.path.join(self._path, name) for name in names]
+
+    def get_number_of_samples(self: "SelfPlayDataset") -> int:
+        # the number of samples is part of the shard names, so no shard has to be opened
+        return sum(get_shard_size(path) for path in self.get_shard_paths())
+
+    def read_latest(self: "SelfPlayDataset", max_number_of_samples: int) -> Samples:
+        # the newest samples of the dataset, for training on a sliding window of recent games
+        shards = []
+        number_of_samples = 0
+        for path in reversed(self.get_shard_paths()):
+            if number_of_samples >= max_number_of_samples:
+                break
+            with np.load(path) as shard:
+                shards.append((shard["states"], shard["policies"], shard["values"]))
+            number_of_samples += len(shards[-1][2])
+
+        if not shards:
+            return np.zeros((0, 0), dtype=np.float32), np.zeros((0, 0), dtype=np.float32), np.zeros(0, np.float32)
+
+        states, policies, values = (np.concatenate(arrays[::-1]) for arrays in zip(*shards))
+        return states[-max_number_of_samples:], policies[-max_number_of_samples:], values[-max_number_of_samples:]
+
+
+def get_shard_size(path: str) -> int:
+    return int(os.path.basename(path)[: -len(SHARD_SUFFIX)].rsplit("_", 1)[1])
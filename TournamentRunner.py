@@ -0,0 +1,211 @@
+import logging
+import math
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler, GameConfig, SolverConfig, TournamentConfig
+from Connect4Game import Connect4
+from Connect4GameFactory import Connect4GameFactory
+from Connect4GameHandler import Connect4GameHandler
+from Connect4Players import RandomPlayer, SolverPlayer
+from GameTurnHandler import GameTurnHandler
+from IPlayer import IPlayer
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory
+from RootParallelSearch import seed_numba_random_generator
+
+RANDOM_PLAYER_NAME = "random"
+SOLVER_PLAYER_NAME = "perfect"
+
+
+class MatchResult:
+    """Results of a match between two players, from the perspective of player0."""
+
+    player0_name: str
+    player1_name: str
+    no_wins: int
+    no_draws: int
+    no_losses: int
+    _game_lengths: list[int]
+
+    def __init__(self: "MatchResult", player0_name: str, player1_name: str) -> None:
+        self.player0_name = player0_name
+        self.player1_name = player1_name
+        self.no_wins = 0
+        self.no_draws = 0
+        self.no_losses = 0
+        self._game_lengths = []
+
+    def add_game(self: "MatchResult", winner: int, game_length: int) -> None:
+        # player0 has player value 1
+        if winner == 1:
+            self.no_wins += 1
+        elif winner == -1:
+            self.no_losses += 1
+        else:
+            self.no_draws += 1
+        self._game_lengths.append(game_length)
+
+    def get_number_of_games(self: "MatchResult") -> int:
+        return self.no_wins + self.no_draws + self.no_losses
+
+    def get_win_rate(self: "MatchResult") -> float:
+        return self.no_wins / self.get_number_of_games()
+
+    def get_draw_rate(self: "MatchResult") -> float:
+        return self.no_draws / self.get_number_of_games()
+
+    def get_loss_rate(self: "MatchResult") -> float:
+        return self.no_losses / self.get_number_of_games()
+
+    def get_average_game_length(self: "MatchResult") -> float:
+        return float(np.mean(self._game_lengths))
+
+    def get_score(self: "MatchResult") -> float:
+        return (self.no_wins + 0.5 * self.no_draws) / self.get_number_of_games()
+
+    def get_score_standard_error(self: "MatchResult") -> float:
+        score = self.get_score()
+        variance = (
+            self.no_wins * (1 - score) ** 2 + self.no_draws * (0.5 - score) ** 2 + self.no_losses * score**2
+        ) / self.get_number_of_games()
+        return math.sqrt(variance / self.get_number_of_games())
+
+    def get_elo_difference(self: "MatchResult") -> float:
+        return score_to_elo(self.get_score())
+
+    def get_elo_confidence_interval(self: "MatchResult", confidence_z: float) -> Tuple[float, float]:
+        score = self.get_score()
+        score_margin = confidence_z * self.get_score_standard_error()
+        return score_to_elo(score - score_margin), score_to_elo(score + score_margin)
+
+    def is_result_clear(self: "MatchResult", confidence_z: float) -> bool:
+        # the confidence interval of the score does not contain equal strength
+        score_margin = confidence_z * self.get_score_standard_error()
+        return abs(self.get_score() - 0.5) > score_margin
+
+    def __str__(self: "MatchResult") -> str:
+        return (
+            f"{self.player0_name} vs {self.player1_name}: games=[{self.get_number_of_games()}] "
+            f"win/draw/loss=[{self.get_win_rate():.3f}/{self.get_draw_rate():.3f}/{self.get_loss_rate():.3f}] "
+            f"elo=[{self.get_elo_difference():.1f}] average game length=[{self.get_average_game_length():.1f}]"
+        )
+
+
+class TournamentRunner:
+    """Plays matches between named players on a pool of worker processes.
+
+    Every game is played by a worker with its own players, created from the player names as in PlayConnect4.
+    The starting player alternates with the game number as in Connect4GameHandler.play_n_games.
+    """
+
+    _config: TournamentConfig
+    _logger: logging.Logger
+
+    def __init__(self: "TournamentRunner", config_handler: ConfigHandler, logger_handler: LoggerHandler) -> None:
+        self._config = TournamentConfig(config_handler)
+        self._logger = logger_handler.get_logger(type(self).__name__)
+
+    def play_match(
+        self: "TournamentRunner",
+        player0_name: str,
+        player1_name: str,
+        no_games: int,
+        stop_early: bool = False,
+        on_game_finished: Optional[Callable[[MatchResult], None]] = None,
+    ) -> MatchResult:
+        match_result = MatchResult(player0_name, player1_name)
+        seeds = np.random.randint(0, 2**31 - 1, size=no_games)  # noqa: NPY002
+
+        with ProcessPoolExecutor(max_workers=self._config.number_of_workers) as executor:
+            futures: set[Future] = {
+                executor.submit(play_tournament_game, player0_name, player1_name, game_number, int(seeds[game_number]))
+                for game_number in range(no_games)
+            }
+
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    winner, game_length = future.result()
+                    match_result.add_game(winner, game_length)
+                    if on_game_finished is not None:
+                        on_game_finished(match_result)
+
+                if stop_early and self._is_match_decided(match_result):
+                    self._logger.debug(f"Stopping match early: {match_result}")
+                    for future in futures:
+                        future.cancel()
+                    break
+
+        self._logger.info(str(match_result))
+        return match_result
+
+    def play_round_robin(
+        self: "TournamentRunner",
+        player_names: list[str],
+        no_games: int,
+        stop_early: bool = False,
+    ) -> list[MatchResult]:
+        match_results = []
+        for idx, player0_name in enumerate(player_names):
+            for player1_name in player_names[idx + 1 :]:
+                match_results.append(self.play_match(player0_name, player1_name, no_games, stop_early))
+        return match_results
+
+    def _is_match_decided(self: "TournamentRunner", match_result: MatchResult) -> bool:
+        return match_result.get_number_of_games() >= self._config.min_number_of_games and match_result.is_result_clear(
+            self._config.confidence_z,
+        )
+
+
+def play_tournament_game(player0_name: str, player1_name: str, game_number: int, seed: int) -> Tuple[int, int]:
+    # runs in a worker process, returns the winner (0 if draw) and the number of moves played
+    np.random.seed(seed)  # noqa: NPY002
+    seed_numba_random_generator(seed)
+
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    game_turn_handler = GameTurnHandler([1, -1])
+    game = Connect4GameFactory.create_game(GameConfig(config_handler).engine, game_turn_handler=game_turn_handler)
+
+    player0 = create_tournament_player(player0_name, game, 1, -1, config_handler, logger_handler)
+    player1 = create_tournament_player(player1_name, game, -1, 1, config_handler, logger_handler)
+    game_handler = Connect4GameHandler(game, player0, player1, logger_handler, config_handler)
+
+    try:
+        winner, end_round = game_handler.play_single_game(game_number)
+    finally:
+        game_handler.close()
+    return winner, end_round + 1
+
+
+def create_tournament_player(
+    name: str,
+    game: Connect4,
+    player: int,
+    next_player: int,
+    config_handler: ConfigHandler,
+    logger_handler: LoggerHandler,
+) -> IPlayer:
+    if name == RANDOM_PLAYER_NAME:
+        return RandomPlayer()
+    if name == SOLVER_PLAYER_NAME:
+        return SolverPlayer(SolverConfig(config_handler), logger_handler)
+    return MCTSPlayerFactory.create_player(game, player, next_player, name, config_handler, logger_handler)
+
+
+def score_to_elo(score: float) -> float:
+    # elo difference corresponding to an expected score, clipped to avoid infinite values
+    clipped_score = min(max(score, 1e-3), 1 - 1e-3)
+    return -400 * math.log10(1 / clipped_score - 1)
+
+
+if __name__ == "__main__":
+    config_handler = ConfigHandler()
+    logger_handler = LoggerHandler(config_handler)
+    confidence_z = TournamentConfig(config_handler).confidence_z
+    tournament_runner = TournamentRunner(config_handler, logger_handler)
+    for match_result in tournament_runner.play_round_robin(["normal", "hard", "god"], 100, stop_early=True):
+        print(match_result, match_result.get_elo_confidence_interval(confidence_z))
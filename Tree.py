@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 import numba
 import numpy as np
 import numpy.typing as npt
@@ -22,8 +24,11 @@ class Node:
 
 
 class Tree:
-    def __init__(self: "Tree") -> None:
+    def __init__(self: "Tree", no_actions: int = 7) -> None:
         self.nodes: dict = {}
+        self._no_actions = no_actions
+        # first occurrences of the actions of both sides, reused by every update_path
+        self._first_following_actions = np.full((2, no_actions), -1, dtype=np.int64)
 
     def new_node(
         self: "Tree",
@@ -42,7 +47,9 @@ class Tree:
             "q_values": np.zeros(len(available_actions)),
             "amaf_q_values": np.zeros(len(available_actions)),
             "amaf_no_visits_actions": np.zeros(len(available_actions), dtype=np.int64),
-            "next_state_hash": np.zeros(len(available_actions), dtype=np.int64),
+            # -1 marks unknown children, 0 is the hash of the empty board
+            "next_state_hash": np.full(len(available_actions), -1, dtype=np.int64),
+            "virtual_losses": np.zeros(len(available_actions), dtype=np.int64),
             "priors": priors,
             "prior_win_prediction": prior_win_prediction,
         }
@@ -91,17 +98,142 @@ class Tree:
                             "amaf_no_visits_actions"
                         ][action_idx]
 
+    def update_path(
+        self: "Tree",
+        state_hashes: list[int],
+        states_mirrored: npt.NDArray[np.bool_],
+        no_states: int,
+        path_actions: npt.NDArray[np.int64],
+        path_row_heights: npt.NDArray[np.int64],
+        no_actions: int,
+        reward: float,
+        use_rave: bool = True,
+    ) -> None:
+        # same statistics as update_node for the first no_states states of the path with an action, the following
+        # actions of a state are the later actions of its side, whose first occurrences are tracked while walking
+        # the first no_actions actions of the path backwards
+        first_following_actions = self._first_following_actions
+        first_following_actions[:] = -1
+        for path_idx in range(no_actions - 1, -1, -1):
+            side = path_idx % 2
+            if path_idx < no_states:
+                node = self.nodes[state_hashes[path_idx]]
+                is_mirrored = states_mirrored[path_idx]
+                action = self._no_actions - 1 - path_actions[path_idx] if is_mirrored else path_actions[path_idx]
+                action_idx = node["actions_idx"][action]
+
+                node["no_visits"] += 1
+                node["no_visits_actions"][action_idx] += 1
+                node["q_values"][action_idx] += (reward - node["q_values"][action_idx]) / node["no_visits_actions"][
+                    action_idx
+                ]
+
+                # update amaf
+                if use_rave and path_idx + 2 < no_actions:
+                    for node_action_idx, node_action in enumerate(node["actions"]):
+                        if node_action == action:
+                            break
+
+                        column = self._no_actions - 1 - node_action if is_mirrored else node_action
+                        following_idx = first_following_actions[side, column]
+                        if following_idx >= 0 and (
+                            path_row_heights[following_idx] == node["next_row_height"][node_action_idx]
+                        ):
+                            node["amaf_no_visits_actions"][node_action_idx] += 1
+                            node["amaf_q_values"][node_action_idx] += (
+                                reward - node["amaf_q_values"][node_action_idx]
+                            ) / node["amaf_no_visits_actions"][node_action_idx]
+
+            first_following_actions[side, path_actions[path_idx]] = path_idx
+
     def update_next_state_hash(self: "Tree", prev_state_hash: int, prev_action: int, current_state_hash: int) -> None:
         prev_node = self.get_node(prev_state_hash)
         prev_action_idx = prev_node["actions_idx"][prev_action]
         prev_node["next_state_hash"][prev_action_idx] = current_state_hash
 
+    def select_node_action(
+        self: "Tree",
+        node: dict,
+        confidence_value: float,
+        rave_param: Optional[float],
+        max_bool: bool = True,
+        virtual_loss: float = 0.0,
+    ) -> int:
+        return select_node_action_ucb1(node, confidence_value, rave_param, max_bool, virtual_loss)
+
+    def add_virtual_loss(self: "Tree", node: dict, action: int) -> None:
+        node["virtual_losses"][node["actions_idx"][action]] += 1
+
+    def remove_virtual_loss(self: "Tree", node: dict, action: int) -> None:
+        node["virtual_losses"][node["actions_idx"][action]] -= 1
+
+    def get_q_value(self: "Tree", node: dict, action: int) -> float:
+        return node["q_values"][node["actions_idx"][action]]
+
+    def get_prior_win_prediction(self: "Tree", node: dict) -> float:
+        return node["prior_win_prediction"]
+
+    def get_number_of_nodes(self: "Tree") -> int:
+        return len(self.nodes)
+
+    def get_action_statistics(
+        self: "Tree",
+        node: dict,
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        return node["actions"], node["no_visits_actions"], node["q_values"]
+
+    def add_action_statistics(
+        self: "Tree",
+        node: dict,
+        actions: npt.NDArray[np.int64],
+        no_visits_actions: npt.NDArray[np.int64],
+        q_values: npt.NDArray[np.float64],
+    ) -> None:
+        actions_idx = np.array([node["actions_idx"][action] for action in actions], dtype=np.int64)
+        node["no_visits"] += merge_action_statistics_numba(
+            node["no_visits_actions"],
+            node["q_values"],
+            actions_idx,
+            no_visits_actions,
+            q_values,
+        )
+
+    def prune(self: "Tree", root_state_hash: int, max_number_of_nodes: Optional[int] = None) -> int:
+        # keep only nodes reachable from the root, and at most max_number_of_nodes of the most visited of them
+        # returns the number of removed nodes
+        reachable_state_hashes = {root_state_hash} if root_state_hash in self.nodes else set()
+        frontier = list(reachable_state_hashes)
+        while frontier:
+            node = self.nodes[frontier.pop()]
+            for next_state_hash in node["next_state_hash"]:
+                next_state_hash = int(next_state_hash)
+                if next_state_hash == -1:
+                    continue
+                if next_state_hash in self.nodes and next_state_hash not in reachable_state_hashes:
+                    reachable_state_hashes.add(next_state_hash)
+                    frontier.append(next_state_hash)
+
+        if max_number_of_nodes is not None and len(reachable_state_hashes) > max_number_of_nodes:
+            # least visited nodes are evicted, the root is always kept
+            reachable_state_hashes.discard(root_state_hash)
+            most_visited_state_hashes = sorted(
+                reachable_state_hashes,
+                key=lambda state_hash: self.nodes[state_hash]["no_visits"],
+                reverse=True,
+            )
+            reachable_state_hashes = {root_state_hash, *most_visited_state_hashes[: max_number_of_nodes - 1]}
+
+        no_nodes = len(self.nodes)
+        self.nodes = {state_hash: self.nodes[state_hash] for state_hash in reachable_state_hashes}
+        return no_nodes - len(self.nodes)
+
     def get_action_probabilities(
         self: "Tree",
         game: Connect4Game.Connect4,
         temperature: float = 1,
+        state_hash: Optional[int] = None,
     ) -> npt.NDArray[np.float64]:
-        start_state_hash = game.get_state_hash()
+        start_state_hash = game.get_state_hash() if state_hash is None else state_hash
         current_node = self.get_node(start_state_hash)
         no_visits = np.zeros(game.get_number_of_actions())
         no_visits[current_node["actions"]] = current_node["no_visits_actions"]
@@ -109,6 +241,493 @@ class Tree:
         return no_visits_temperature / sum(no_visits_temperature)
 
 
+class ArrayTree:
+    """Tree with all node statistics stored in preallocated contiguous arrays indexed by integer node id.
+
+    nodes maps a state hash to its node id. Per-action statistics are stored in rows of length no_actions,
+    of which the first no_available_actions[node] entries are used. The arrays double in size when full.
+    """
+
+    _node_array_specs: tuple = (
+        # name, dtype, one value per action, fill value
+        ("state_hashes", np.int64, False, 0),
+        ("no_visits", np.int64, False, 0),
+        ("no_available_actions", np.int64, False, 0),
+        ("prior_win_predictions", np.float64, False, 0),
+        ("actions", np.int8, True, -1),
+        ("actions_idx", np.int8, True, -1),
+        ("next_row_heights", np.int8, True, 0),
+        ("priors", np.float64, True, 0),
+        ("no_visits_actions", np.int32, True, 0),
+        ("q_values", np.float64, True, 0),
+        ("amaf_q_values", np.float64, True, 0),
+        ("amaf_no_visits_actions", np.int32, True, 0),
+        ("children", np.int32, True, -1),
+        ("virtual_losses", np.int32, True, 0),
+    )
+
+    def __init__(self: "ArrayTree", no_actions: int = 7, capacity: int = 1024) -> None:
+        self.nodes: dict = {}
+        self._no_actions = no_actions
+        self._no_nodes = 0
+        self._capacity = 0
+        self._resize(capacity)
+        # node ids of a path and first occurrences of the actions of both sides, reused by every update_path
+        self._path_nodes = np.zeros(64, dtype=np.int64)
+        self._first_following_actions = np.full((2, no_actions), -1, dtype=np.int64)
+
+    def _resize(self: "ArrayTree", capacity: int) -> None:
+        for name, dtype, per_action, fill_value in self._node_array_specs:
+            shape = (capacity, self._no_actions) if per_action else (capacity,)
+            new_array = np.full(shape, fill_value, dtype=dtype)
+            if self._no_nodes > 0:
+                new_array[: self._no_nodes] = getattr(self, name)[: self._no_nodes]
+            setattr(self, name, new_array)
+        self._capacity = capacity
+
+    def get_capacity(self: "ArrayTree") -> int:
+        return self._capacity
+
+    def get_number_of_nodes(self: "ArrayTree") -> int:
+        return self._no_nodes
+
+    def get_bytes_per_node(self: "ArrayTree") -> int:
+        return sum(
+            np.dtype(dtype).itemsize * (self._no_actions if per_action else 1)
+            for _, dtype, per_action, _ in self._node_array_specs
+        )
+
+    def get_memory_usage(self: "ArrayTree") -> int:
+        # bytes allocated for node statistics (the hash to id dict is not included)
+        return self._capacity * self.get_bytes_per_node()
+
+    def new_node(
+        self: "ArrayTree",
+        state_hash: int,
+        available_actions: list[int],
+        next_row_height: npt.NDArray[np.float64],
+        priors: npt.NDArray[np.float64],
+        prior_win_prediction: float,
+    ) -> int:
+        if self._no_nodes == self._capacity:
+            self._resize(2 * self._capacity)
+
+        node = self._no_nodes
+        no_available_actions = len(available_actions)
+        self.state_hashes[node] = state_hash
+        self.no_available_actions[node] = no_available_actions
+        self.prior_win_predictions[node] = prior_win_prediction
+        self.actions[node, :no_available_actions] = available_actions
+        self.actions_idx[node, available_actions] = np.arange(no_available_actions)
+        self.next_row_heights[node, :no_available_actions] = next_row_height
+        self.priors[node, :no_available_actions] = priors
+
+        self.nodes[state_hash] = node
+        self._no_nodes += 1
+
+        return node
+
+    def is_node_in_tree(self: "ArrayTree", state_hash: int) -> bool:
+        return state_hash in self.nodes
+
+    def get_node(self: "ArrayTree", state_hash: int) -> int:
+        return self.nodes[state_hash]
+
+    def update_node(
+        self: "ArrayTree",
+        state_hash: int,
+        action: int,
+        reward: float,
+        following_actions: npt.NDArray[np.float64],
+        following_row_heights: npt.NDArray[np.float64],
+        use_rave: bool = True,
+    ) -> None:
+        node = self.nodes[state_hash]
+
+        action_idx = self.actions_idx[node, action]
+
+        self.no_visits[node] += 1
+        self.no_visits_actions[node, action_idx] += 1
+        self.q_values[node, action_idx] += (reward - self.q_values[node, action_idx]) / self.no_visits_actions[
+            node, action_idx
+        ]
+
+        # update amaf
+        if use_rave:
+            no_available_actions = self.no_available_actions[node]
+            update_amaf_numba(
+                self.actions[node, :no_available_actions],
+                self.next_row_heights[node, :no_available_actions],
+                self.amaf_q_values[node, :no_available_actions],
+                self.amaf_no_visits_actions[node, :no_available_actions],
+                action,
+                reward,
+                following_actions,
+                following_row_heights,
+            )
+
+    def update_path(
+        self: "ArrayTree",
+        state_hashes: list[int],
+        states_mirrored: npt.NDArray[np.bool_],
+        no_states: int,
+        path_actions: npt.NDArray[np.int64],
+        path_row_heights: npt.NDArray[np.int64],
+        no_actions: int,
+        reward: float,
+        use_rave: bool = True,
+    ) -> None:
+        # same statistics as update_node for the first no_states states of the path with an action, in one compiled
+        # call over the first no_actions actions of the path
+        no_nodes = min(no_states, no_actions)
+        if len(self._path_nodes) < no_nodes:
+            self._path_nodes = np.zeros(2 * no_nodes, dtype=np.int64)
+        for idx in range(no_nodes):
+            self._path_nodes[idx] = self.nodes[state_hashes[idx]]
+        update_path_numba(
+            self._path_nodes,
+            no_nodes,
+            path_actions,
+            path_row_heights,
+            no_actions,
+            states_mirrored,
+            reward,
+            use_rave,
+            self._first_following_actions,
+            self.actions,
+            self.actions_idx,
+            self.next_row_heights,
+            self.no_available_actions,
+            self.no_visits,
+            self.no_visits_actions,
+            self.q_values,
+            self.amaf_q_values,
+            self.amaf_no_visits_actions,
+        )
+
+    def update_next_state_hash(
+        self: "ArrayTree",
+        prev_state_hash: int,
+        prev_action: int,
+        current_state_hash: int,
+    ) -> None:
+        prev_node = self.nodes[prev_state_hash]
+        prev_action_idx = self.actions_idx[prev_node, prev_action]
+        self.children[prev_node, prev_action_idx] = self.nodes.get(current_state_hash, -1)
+
+    def select_node_action(
+        self: "ArrayTree",
+        node: int,
+        confidence_value: float,
+        rave_param: Optional[float],
+        max_bool: bool = True,
+        virtual_loss: float = 0.0,
+    ) -> int:
+        if rave_param is None:
+            rave_bool = False
+            rave_param = 0
+        else:
+            rave_bool = True
+
+        no_available_actions = self.no_available_actions[node]
+        return select_node_action_ucb1_numba(
+            self.q_values[node, :no_available_actions],
+            self.no_visits[node],
+            self.no_visits_actions[node, :no_available_actions],
+            confidence_value,
+            self.amaf_q_values[node, :no_available_actions],
+            self.amaf_no_visits_actions[node, :no_available_actions],
+            rave_bool,
+            rave_param,
+            self.actions[node, :no_available_actions],
+            max_bool,
+            self.priors[node, :no_available_actions],
+            self.virtual_losses[node, :no_available_actions],
+            virtual_loss,
+        )
+
+    def add_virtual_loss(self: "ArrayTree", node: int, action: int) -> None:
+        self.virtual_losses[node, self.actions_idx[node, action]] += 1
+
+    def remove_virtual_loss(self: "ArrayTree", node: int, action: int) -> None:
+        self.virtual_losses[node, self.actions_idx[node, action]] -= 1
+
+    def get_q_value(self: "ArrayTree", node: int, action: int) -> float:
+        return self.q_values[node, self.actions_idx[node, action]]
+
+    def get_prior_win_prediction(self: "ArrayTree", node: int) -> float:
+        return self.prior_win_predictions[node]
+
+    def get_action_statistics(
+        self: "ArrayTree",
+        node: int,
+    ) -> Tuple[npt.NDArray[np.int8], npt.NDArray[np.int32], npt.NDArray[np.float64]]:
+        no_available_actions = self.no_available_actions[node]
+        return (
+            self.actions[node, :no_available_actions],
+            self.no_visits_actions[node, :no_available_actions],
+            self.q_values[node, :no_available_actions],
+        )
+
+    def add_action_statistics(
+        self: "ArrayTree",
+        node: int,
+        actions: npt.NDArray[np.int64],
+        no_visits_actions: npt.NDArray[np.int64],
+        q_values: npt.NDArray[np.float64],
+    ) -> None:
+        self.no_visits[node] += merge_action_statistics_numba(
+            self.no_visits_actions[node],
+            self.q_values[node],
+            self.actions_idx[node, actions].astype(np.int64),
+            no_visits_actions,
+            q_values,
+        )
+
+    def prune(self: "ArrayTree", root_state_hash: int, max_number_of_nodes: Optional[int] = None) -> int:
+        # keep only nodes reachable from the root, and at most max_number_of_nodes of the most visited of them
+        # kept nodes are moved to the front of the arrays, returns the number of removed nodes
+        no_nodes = self._no_nodes
+        is_reachable = np.zeros(no_nodes, dtype=np.bool_)
+        root = self.nodes.get(root_state_hash, -1)
+        frontier = np.array([root] if root >= 0 else [], dtype=np.int64)
+        is_reachable[frontier] = True
+        while len(frontier) > 0:
+            children = self.children[frontier].ravel()
+            children = np.unique(children[children >= 0])
+            frontier = children[~is_reachable[children]]
+            is_reachable[frontier] = True
+
+        kept_nodes = np.flatnonzero(is_reachable)
+        if max_number_of_nodes is not None and len(kept_nodes) > max_number_of_nodes:
+            # least visited nodes are evicted, the root is always kept
+            visits = self.no_visits[kept_nodes].astype(np.float64)
+            visits[kept_nodes == root] = np.inf
+            most_visited = np.argsort(-visits, kind="stable")[:max_number_of_nodes]
+            kept_nodes = np.sort(kept_nodes[most_visited])
+
+        no_kept_nodes = len(kept_nodes)
+        new_node_ids = np.full(no_nodes, -1, dtype=np.int32)
+        new_node_ids[kept_nodes] = np.arange(no_kept_nodes)
+
+        for name, _, _, fill_value in self._node_array_specs:
+            array = getattr(self, name)
+            array[:no_kept_nodes] = array[kept_nodes]
+            array[no_kept_nodes:no_nodes] = fill_value
+
+        # children which are removed are unknown again
+        children = self.children[:no_kept_nodes]
+        self.children[:no_kept_nodes] = np.where(children >= 0, new_node_ids[np.maximum(children, 0)], -1)
+
+        self._no_nodes = no_kept_nodes
+        self.nodes = {int(state_hash): node for node, state_hash in enumerate(self.state_hashes[:no_kept_nodes])}
+        return no_nodes - no_kept_nodes
+
+    def get_action_probabilities(
+        self: "ArrayTree",
+        game: Connect4Game.Connect4,
+        temperature: float = 1,
+        state_hash: Optional[int] = None,
+    ) -> npt.NDArray[np.float64]:
+        current_node = self.get_node(game.get_state_hash() if state_hash is None else state_hash)
+        no_available_actions = self.no_available_actions[current_node]
+        no_visits = np.zeros(game.get_number_of_actions())
+        no_visits[self.actions[current_node, :no_available_actions]] = self.no_visits_actions[
+            current_node, :no_available_actions
+        ]
+        no_visits_temperature = no_visits ** (1 / temperature)
+        return no_visits_temperature / sum(no_visits_temperature)
+
+
+def select_node_action_ucb1(
+    node: dict,
+    confidence_value: float,
+    rave_param: Optional[float],
+    max_bool: bool = True,
+    virtual_loss: float = 0.0,
+) -> int:
+    if rave_param is None:
+        rave_bool = False
+        rave_param = 0
+    else:
+        rave_bool = True
+
+    return select_node_action_ucb1_numba(
+        node["q_values"],
+        node["no_visits"],
+        node["no_visits_actions"],
+        confidence_value,
+        node["amaf_q_values"],
+        node["amaf_no_visits_actions"],
+        rave_bool,
+        rave_param,
+        node["actions"],
+        max_bool,
+        node["priors"],
+        node["virtual_losses"],
+        virtual_loss,
+    )
+
+
+@numba.njit
+def select_node_action_ucb1_numba(  # noqa: PLR0913
+    q_values: npt.NDArray[np.float64],
+    no_visits: list[int],
+    no_visits_actions: npt.NDArray[np.float64],
+    confidence_value: float,
+    amaf_q_values: list[int],
+    amaf_no_visits_actions: npt.NDArray[np.float64],
+    rave_bool: bool,
+    rave_param: float,
+    actions: list[int],
+    max_bool: bool,
+    priors: npt.NDArray[np.float64],
+    virtual_losses: npt.NDArray[np.int64],
+    virtual_loss: float,
+) -> int:
+    if virtual_loss > 0:
+        # simulations in flight count as lost for the selecting player, so parallel searches spread out
+        in_flight = virtual_loss * virtual_losses
+        total_no_visits = no_visits + np.sum(in_flight)
+        total_no_visits_actions = no_visits_actions + in_flight
+        loss_value = 0.0 if max_bool else 1.0
+        visited_q_values = np.where(
+            total_no_visits_actions > 0,
+            (q_values * no_visits_actions + loss_value * in_flight) / np.maximum(total_no_visits_actions, 1),
+            q_values,
+        )
+    else:
+        total_no_visits = no_visits * 1.0
+        total_no_visits_actions = no_visits_actions * 1.0
+        visited_q_values = q_values
+
+    exploration_term = priors * np.sqrt(total_no_visits) / (total_no_visits_actions + 1)
+
+    if rave_bool:
+        beta = amaf_no_visits_actions / (
+            no_visits_actions + amaf_no_visits_actions + 4 * no_visits_actions * amaf_no_visits_actions * rave_param**2
+        )
+        adjusted_q_values = (1 - beta) * visited_q_values + beta * amaf_q_values
+    else:
+        adjusted_q_values = visited_q_values
+
+    if max_bool:
+        ucb1_vals = adjusted_q_values + confidence_value * exploration_term
+        select_action_idx = np.argmax(ucb1_vals)
+    else:
+        ucb1_vals = adjusted_q_values - confidence_value * exploration_term
+        select_action_idx = np.argmin(ucb1_vals)
+
+    select_action = actions[select_action_idx]
+
+    return select_action
+
+
+@numba.njit
+def merge_action_statistics_numba(
+    no_visits_actions: npt.NDArray[np.int64],
+    q_values: npt.NDArray[np.float64],
+    actions_idx: npt.NDArray[np.int64],
+    other_no_visits_actions: npt.NDArray[np.int64],
+    other_q_values: npt.NDArray[np.float64],
+) -> int:
+    # merges visits and q values of another search into the node (in place), returns the number of added visits
+    added_no_visits = 0
+    for idx in range(len(actions_idx)):
+        action_idx = actions_idx[idx]
+        other_no_visits = other_no_visits_actions[idx]
+        total_no_visits = no_visits_actions[action_idx] + other_no_visits
+        if total_no_visits > 0:
+            q_values[action_idx] = (
+                q_values[action_idx] * no_visits_actions[action_idx] + other_q_values[idx] * other_no_visits
+            ) / total_no_visits
+        no_visits_actions[action_idx] = total_no_visits
+        added_no_visits += other_no_visits
+    return added_no_visits
+
+
+@numba.njit(nogil=True)
+def update_amaf_numba(
+    node_actions: npt.NDArray[np.int8],
+    node_next_row_heights: npt.NDArray[np.int8],
+    amaf_q_values: npt.NDArray[np.float64],
+    amaf_no_visits_actions: npt.NDArray[np.int32],
+    action: int,
+    reward: float,
+    following_actions: npt.NDArray[np.float64],
+    following_row_heights: npt.NDArray[np.float64],
+) -> None:
+    for action_idx in range(len(node_actions)):
+        node_action = node_actions[action_idx]
+        if len(following_actions) == 0 or node_action == action:
+            break
+
+        first_following_action_idx = find_first_in_array(following_actions, node_action)
+
+        if first_following_action_idx >= 0:
+            f_row_height = following_row_heights[first_following_action_idx]
+            if f_row_height == node_next_row_heights[action_idx]:
+                amaf_no_visits_actions[action_idx] += 1
+                amaf_q_values[action_idx] += (reward - amaf_q_values[action_idx]) / amaf_no_visits_actions[action_idx]
+
+
+@numba.njit(nogil=True)
+def update_path_numba(  # noqa: PLR0913
+    nodes: npt.NDArray[np.int64],
+    no_nodes: int,
+    path_actions: npt.NDArray[np.int64],
+    path_row_heights: npt.NDArray[np.int64],
+    no_path_actions: int,
+    states_mirrored: npt.NDArray[np.bool_],
+    reward: float,
+    use_rave: bool,
+    first_following_actions: npt.NDArray[np.int64],
+    actions: npt.NDArray[np.int8],
+    actions_idx: npt.NDArray[np.int8],
+    next_row_heights: npt.NDArray[np.int8],
+    no_available_actions: npt.NDArray[np.int64],
+    no_visits: npt.NDArray[np.int64],
+    no_visits_actions: npt.NDArray[np.int32],
+    q_values: npt.NDArray[np.float64],
+    amaf_q_values: npt.NDArray[np.float64],
+    amaf_no_visits_actions: npt.NDArray[np.int32],
+) -> None:
+    # walks the path backwards, so first_following_actions[side, column] is the first later index at which the side
+    # of the current state played column (-1 if never), which replaces searching the following actions of every node
+    no_actions = first_following_actions.shape[1]
+    first_following_actions[:] = -1
+    for path_idx in range(no_path_actions - 1, -1, -1):
+        side = path_idx % 2
+        if path_idx < no_nodes:
+            node = nodes[path_idx]
+            is_mirrored = states_mirrored[path_idx]
+            action = no_actions - 1 - path_actions[path_idx] if is_mirrored else path_actions[path_idx]
+            action_idx = actions_idx[node, action]
+
+            no_visits[node] += 1
+            no_visits_actions[node, action_idx] += 1
+            q_values[node, action_idx] += (reward - q_values[node, action_idx]) / no_visits_actions[node, action_idx]
+
+            # the amaf actions of a node are the actions before the selected one, as in update_amaf_numba
+            if use_rave and path_idx + 2 < no_path_actions:
+                for node_action_idx in range(no_available_actions[node]):
+                    node_action = actions[node, node_action_idx]
+                    if node_action == action:
+                        break
+
+                    column = no_actions - 1 - node_action if is_mirrored else node_action
+                    following_idx = first_following_actions[side, column]
+                    if following_idx < 0 or path_row_heights[following_idx] != next_row_heights[node, node_action_idx]:
+                        continue
+
+                    amaf_no_visits_actions[node, node_action_idx] += 1
+                    amaf_q_values[node, node_action_idx] += (
+                        reward - amaf_q_values[node, node_action_idx]
+                    ) / amaf_no_visits_actions[node, node_action_idx]
+
+        first_following_actions[side, path_actions[path_idx]] = path_idx
+
+
 @numba.njit
 def find_first_in_array(array: npt.ArrayLike, element: float) -> float:
     first_following_action_idx = np.where(array == element)[0]
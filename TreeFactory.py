@@ -0,0 +1,17 @@
+from Tree import ArrayTree, Tree
+
+
+class TreeFactory:
+    @staticmethod
+    def create_tree(tree_type: str, no_actions: int) -> Tree | ArrayTree:
+        if tree_type == TreeTypes.array:
+            return ArrayTree(no_actions)
+        elif tree_type == TreeTypes.dictionary:
+            return Tree(no_actions)
+
+        raise ValueError(f"Unknown tree type [{tree_type}].")
+
+
+class TreeTypes:
+    dictionary: str = "dict"
+    array: str = "array"
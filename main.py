@@ -2,11 +2,11 @@ import cProfile
 import pstats
 
 import ConfigHandler
-import Connect4Game
 import Connect4GameHandler
 import GameTurnHandler
 import LoggerHandler
 import MCTSPlayerFactory
+from Connect4GameFactory import Connect4GameFactory
 
 
 def run_one_game() -> None:
@@ -14,7 +14,8 @@ def run_one_game() -> None:
     logger_handler = LoggerHandler.LoggerHandler(config_handler)
 
     game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
-    game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+    game_config = ConfigHandler.GameConfig(config_handler)
+    game = Connect4GameFactory.create_game(game_config.engine, game_turn_handler=game_turn_handler)
 
     player0 = MCTSPlayerFactory.MCTSPlayerFactory.create_player(
         game,
@@ -28,7 +29,10 @@ def run_one_game() -> None:
     game_handler = Connect4GameHandler.Connect4GameHandler(game, player0, player1, logger_handler, config_handler)
     number_of_games = 1
 
-    game_handler.play_n_games(number_of_games)
+    try:
+        game_handler.play_n_games(number_of_games)
+    finally:
+        game_handler.close()
 
 
 def main() -> None:
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.typing as npt
+
+from AlphaZeroTrainer import (
+    NO_CELLS,
+    AlphaZeroTrainer,
+    create_self_play_players,
+    get_best_weights_path,
+    play_self_play_game,
+    run_self_play_worker,
+)
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from InferenceQueue import create_policy_value_evaluator
+from LoggerHandler import LoggerHandler
+from NumpyPolicyValueModel import NumpyPolicyValueModel, save_policy_value_weights
+from SelfPlayDataset import SelfPlayDataset
+
+
+class LinearPolicyValueNetwork:
+    # linear heads on a fixed random layer with the interface of PolicyValueModel, trained with numpy
+    def __init__(self: "LinearPolicyValueNetwork") -> None:
+        rng = np.random.default_rng(0)
+        self.kernel = rng.normal(scale=0.2, size=(NO_CELLS, 16))
+        self.bias = np.zeros(16)
+        self.policy_kernel = np.zeros((16, 7))
+        self.policy_bias = np.zeros(7)
+        self.value_kernel = np.zeros((16, 1))
+        self.value_bias = np.zeros(1)
+        self.number_of_gradient_steps = 0
+
+    def do_gradient_step(
+        self: "LinearPolicyValueNetwork",
+        states: npt.NDArray[np.float32],
+        policies: npt.NDArray[np.float32],
+        values: npt.NDArray[np.float32],
+    ) -> float:
+        outputs = np.tanh(states @ self.kernel + self.bias)
+        logits = outputs @ self.policy_kernel + self.policy_bias
+        predicted_policies = np.exp(logits) / np.sum(np.exp(logits), axis=1, keepdims=True)
+        predicted_values = np.tanh(outputs @ self.value_kernel + self.value_bias)[:, 0]
+
+        policy_errors = (predicted_policies - policies) / len(values)
+        value_errors = ((predicted_values - values) * (1 - predicted_values**2))[:, None] / len(values)
+        self.policy_kernel -= 0.1 * outputs.T @ policy_errors
+        self.policy_bias -= 0.1 * np.sum(policy_errors, axis=0)
+        self.value_kernel -= 0.1 * outputs.T @ value_errors
+        self.value_bias -= 0.1 * np.sum(value_errors, axis=0)
+        self.number_of_gradient_steps += 1
+        return float(np.mean((predicted_values - values) ** 2))
+
+    def save_weights(self: "LinearPolicyValueNetwork", path: str) -> None:
+        with open(path, "wb") as file:
+            np.savez(file, policy_kernel=self.policy_kernel, value_kernel=self.value_kernel)
+
+    def load_weights(self: "LinearPolicyValueNetwork", path: str) -> None:
+        pass
+
+    def export_weights(self: "LinearPolicyValueNetwork", path: str) -> None:
+        save_policy_value_weights(
+            path,
+            [self.kernel],
+            [self.bias],
+            (self.policy_kernel, self.policy_bias),
+            (self.value_kernel, self.value_bias),
+            "tanh",
+        )
+
+
+class AlphaZeroTrainerTests(unittest.TestCase):
+    def setUp(self: "AlphaZeroTrainerTests") -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_handler = ConfigHandler()
+        for key, value in [
+            ("no_self_play_workers", "1"),
+            ("dataset_path", os.path.join(self.directory.name, "dataset")),
+            ("games_per_shard", "2"),
+            ("min_dataset_size", "20"),
+            ("minibatch_size", "8"),
+            ("training_steps_per_generation", "5"),
+            ("no_gating_games", "2"),
+            ("gating_threshold", "0.0"),
+            ("checkpoint_path", os.path.join(self.directory.name, "alphazero")),
+        ]:
+            self.config_handler._config_parser.set("alphazero", key, value)
+        self.config_handler._config_parser.set("MCTSPlayer.alphazero", "max_count", "30")
+        self.logger_handler = LoggerHandler(self.config_handler)
+
+    def tearDown(self: "AlphaZeroTrainerTests") -> None:
+        self.directory.cleanup()
+
+    def test_self_play_game(self: "AlphaZeroTrainerTests") -> None:
+        network = LinearPolicyValueNetwork()
+        AlphaZeroTrainer(self.config_handler, self.logger_handler, network)
+        best_weights_path = get_best_weights_path(os.path.join(self.directory.name, "alphazero"))
+        evaluator = create_policy_value_evaluator(NumpyPolicyValueModel(best_weights_path).predict)
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        players = create_self_play_players(game, "alphazero", self.config_handler, self.logger_handler, evaluator)
+
+        states, policies, values = play_self_play_game(game, players, 0)
+        self.assertEqual(len(states), game.get_round())
+        self.assertEqual(states.shape[1], NO_CELLS)
+        self.assertTrue(np.allclose(np.sum(policies, axis=1), 1.0))
+        # every state is seen from the player to move, who has as many discs as the opponent or one less
+        self.assertTrue(np.all(np.isin(np.sum(states, axis=1), [0, -1])))
+        # the outcomes alternate between the players and the last player won (or the game was drawn)
+        if game.get_winner() is None:
+            self.assertTrue(np.all(values == 0))
+        else:
+            self.assertEqual(values[-1], 1.0)
+            self.assertTrue(np.all(values[1:] == -values[:-1]))
+
+    def test_train_generation(self: "AlphaZeroTrainerTests") -> None:
+        network = LinearPolicyValueNetwork()
+        trainer = AlphaZeroTrainer(self.config_handler, self.logger_handler, network, seed=0)
+        self.assertEqual(run_self_play_worker(self.config_handler, 0, no_games=3), 3)
+
+        dataset = trainer.get_dataset()
+        self.assertEqual(len(dataset.get_shard_paths()), 2)
+        self.assertGreater(dataset.get_number_of_samples(), 3 * 6)
+
+        best_weights_path = get_best_weights_path(os.path.join(self.directory.name, "alphazero"))
+        initial_modification_time = os.path.getmtime(best_weights_path)
+        match_result = trainer.train_generation()
+        self.assertEqual(network.number_of_gradient_steps, 5)
+        self.assertEqual(match_result.get_number_of_games(), 2)
+        self.assertEqual(trainer.generation, 1)
+        # the candidate always passes a gating threshold of 0
+        self.assertNotEqual(os.path.getmtime(best_weights_path), initial_modification_time)
+
+    def test_run_with_self_play_worker(self: "AlphaZeroTrainerTests") -> None:
+        network = LinearPolicyValueNetwork()
+        trainer = AlphaZeroTrainer(self.config_handler, self.logger_handler, network, seed=0)
+        trainer.run(1)
+        self.assertEqual(trainer.generation, 1)
+        dataset = SelfPlayDataset(os.path.join(self.directory.name, "dataset"))
+        self.assertGreaterEqual(dataset.get_number_of_samples(), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
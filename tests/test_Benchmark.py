@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from Benchmark import Benchmark, compare_to_baseline, load_results, measure_rate, save_results
+from ConfigHandler import ConfigHandler
+from LoggerHandler import LoggerHandler
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_measure_rate(self: "BenchmarkTests") -> None:
+        calls = []
+        rate = measure_rate(lambda: calls.append(1), 0.01)
+        self.assertGreater(rate, 0)
+        # one warm-up call and rounds of 1, 2, 4, ... calls add up to a power of two
+        self.assertEqual(len(calls) & (len(calls) - 1), 0)
+
+    def test_compare_to_baseline(self: "BenchmarkTests") -> None:
+        baseline = {
+            "simulations_per_second.normal": 1000.0,
+            "games_per_second.random": 100.0,
+            "tree_bytes_per_node.array": 500.0,
+            "tree_bytes_per_node.dict": 2000.0,
+        }
+        results = {
+            "simulations_per_second.normal": 850.0,
+            "games_per_second.random": 95.0,
+            "tree_bytes_per_node.array": 600.0,
+            "tree_bytes_per_node.dict": 1000.0,
+            "copy_per_second.numpy": 1.0,
+        }
+        regressions = compare_to_baseline(results, baseline, 0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("simulations_per_second.normal"))
+        self.assertTrue(regressions[1].startswith("tree_bytes_per_node.array"))
+        self.assertEqual(compare_to_baseline(results, baseline, 0.25), [])
+
+    def test_run_and_save(self: "BenchmarkTests") -> None:
+        config_handler = ConfigHandler()
+        for key, value in [
+            ("min_time_s", "0.01"),
+            ("no_search_positions", "1"),
+            ("difficulties", "normal"),
+            ("game_player_names", "random"),
+            ("no_games", "2"),
+        ]:
+            config_handler._config_parser.set("benchmark", key, value)
+        config_handler._config_parser.set("MCTSPlayer.normal", "max_count", "50")
+
+        results = Benchmark(config_handler, LoggerHandler(config_handler)).run()
+        for metric in [
+            "place_disc_per_second.numpy",
+            "copy_per_second.bitboard",
+            "get_clever_available_actions_per_second.bitboard",
+            "select_node_action_ucb1_numba_per_second",
+            "simulations_per_second.normal",
+            "tree_bytes_per_node.dict",
+            "tree_bytes_per_node.array",
+            "games_per_second.random",
+        ]:
+            self.assertGreater(results[metric], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            save_results(path, results)
+            self.assertEqual(load_results(path), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,19 @@ class ConfigHandlerTests(unittest.TestCase):
             self.assertIsInstance(mctsplayer.reuse_tree, bool)
             self.assertIsInstance(mctsplayer.randomize_action, bool)
             self.assertIsInstance(mctsplayer.rollout_weight, float)
+            self.assertIsInstance(mctsplayer.game_engine, str)
+            self.assertIsInstance(mctsplayer.compiled_rollout, bool)
+            self.assertIn(mctsplayer.tree_type, ["dict", "array"])
+            self.assertGreaterEqual(mctsplayer.root_parallel_workers, 1)
+            self.assertGreaterEqual(mctsplayer.tree_parallel_threads, 1)
+            self.assertGreaterEqual(mctsplayer.virtual_loss, 0)
+            self.assertIsInstance(mctsplayer.time_limit_ms, (float, type(None)))
+            self.assertIsInstance(mctsplayer.ponder, bool)
+            self.assertIsInstance(mctsplayer.prune_tree, bool)
+            self.assertIsInstance(mctsplayer.max_number_of_nodes, (int, type(None)))
+            self.assertIsInstance(mctsplayer.opening_book_path, (str, type(None)))
+            self.assertIsInstance(mctsplayer.symmetric_tree, bool)
+            self.assertIsInstance(mctsplayer.collect_statistics, bool)
 
     def test_increase_difficulty(self: "ConfigHandlerTests") -> None:
         config_handler = ConfigHandler.ConfigHandler()
@@ -32,6 +45,67 @@ class ConfigHandlerTests(unittest.TestCase):
         self.assertGreater(god_player.max_count, hard_player.max_count)
         self.assertGreater(god_player.max_depth, hard_player.max_depth)
 
+    def test_game_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        game_config = ConfigHandler.GameConfig(config_handler)
+        self.assertIn(game_config.engine, ["numpy", "bitboard"])
+        self.assertIsInstance(game_config.record_path, (str, type(None)))
+
+    def test_tournament_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        tournament_config = ConfigHandler.TournamentConfig(config_handler)
+        self.assertGreaterEqual(tournament_config.number_of_workers, 1)
+        self.assertGreaterEqual(tournament_config.min_number_of_games, 1)
+        self.assertGreater(tournament_config.confidence_z, 0)
+
+    def test_opening_book_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        opening_book_config = ConfigHandler.OpeningBookConfig(config_handler)
+        self.assertTrue(opening_book_config.path.endswith(".npy"))
+        self.assertGreaterEqual(opening_book_config.no_plies, 0)
+        self.assertIn(opening_book_config.player_name, ["normal", "hard", "god"])
+
+    def test_solver_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        solver_config = ConfigHandler.SolverConfig(config_handler)
+        self.assertIsInstance(solver_config.time_limit_ms, (float, type(None)))
+        self.assertGreater(solver_config.transposition_table_size_log2, 0)
+
+    def test_dqn_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        dqn_config = ConfigHandler.DQNConfig(config_handler)
+        self.assertGreaterEqual(dqn_config.no_environments, 1)
+        self.assertGreaterEqual(dqn_config.replay_buffer_size, dqn_config.min_replay_buffer_size)
+        self.assertGreaterEqual(dqn_config.min_replay_buffer_size, dqn_config.minibatch_size)
+        self.assertGreaterEqual(dqn_config.discount, 0.0)
+        self.assertLessEqual(dqn_config.discount, 1.0)
+        self.assertGreaterEqual(dqn_config.epsilon_start, dqn_config.epsilon_end)
+        self.assertGreaterEqual(dqn_config.target_sync_interval, 1)
+        self.assertGreaterEqual(dqn_config.checkpoint_interval, 1)
+        self.assertIsInstance(dqn_config.checkpoint_path, str)
+
+    def test_alphazero_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        alphazero_config = ConfigHandler.AlphaZeroConfig(config_handler)
+        self.assertGreaterEqual(alphazero_config.no_self_play_workers, 1)
+        self.assertIn(f"MCTSPlayer.{alphazero_config.player_name}", config_handler.get_sections())
+        self.assertGreaterEqual(alphazero_config.window_size, alphazero_config.min_dataset_size)
+        self.assertGreaterEqual(alphazero_config.min_dataset_size, alphazero_config.minibatch_size)
+        self.assertGreaterEqual(alphazero_config.no_gating_games, 1)
+        self.assertGreaterEqual(alphazero_config.gating_threshold, 0.5)
+        self.assertIsInstance(alphazero_config.checkpoint_path, str)
+
+    def test_benchmark_config(self: "ConfigHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        benchmark_config = ConfigHandler.BenchmarkConfig(config_handler)
+        self.assertIsInstance(benchmark_config.seed, int)
+        self.assertGreater(benchmark_config.min_time_s, 0)
+        for name in benchmark_config.difficulties:
+            self.assertIn(f"MCTSPlayer.{name}", config_handler.get_sections())
+        self.assertGreaterEqual(benchmark_config.no_games, 1)
+        self.assertIsInstance(benchmark_config.baseline_path, (str, type(None)))
+        self.assertGreater(benchmark_config.regression_threshold, 0)
+
     def test_logger_config(self: "ConfigHandlerTests") -> None:
         config_handler = ConfigHandler.ConfigHandler()
         logger_config = ConfigHandler.LoggerConfig(config_handler, type(self).__name__)
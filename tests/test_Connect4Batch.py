@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from Connect4Batch import Connect4Batch, play_random_games
+from Connect4Bitboard import Connect4Bitboard
+from GameTurnHandler import GameTurnHandler
+from RootParallelSearch import seed_numba_random_generator
+
+
+class Connect4BatchTests(unittest.TestCase):
+    def test_same_as_single_games(self: "Connect4BatchTests") -> None:
+        seed_numba_random_generator(7)
+        batch_size = 16
+        batch = Connect4Batch(batch_size, starting_players=np.ones(batch_size, dtype=np.int64))
+        games = [Connect4Bitboard(game_turn_handler=GameTurnHandler([1, -1])) for _ in range(batch_size)]
+        starting_players = [1] * batch_size
+
+        for _ in range(200):
+            clever_available_actions = batch.get_clever_available_actions()
+            boards = batch.get_boards()
+            for idx, game in enumerate(games):
+                self.assertTrue(np.array_equal(boards[idx], game._get_board()))
+                self.assertEqual(
+                    list(np.flatnonzero(clever_available_actions[idx])),
+                    list(game.get_clever_available_actions()),
+                )
+
+            actions = batch.make_random_actions()
+            is_won, is_draw = batch.step(actions)
+            for idx, game in enumerate(games):
+                is_game_won = game.place_disc(actions[idx])
+                self.assertEqual(is_won[idx], is_game_won)
+                self.assertEqual(is_draw[idx], (not is_game_won) and game.is_draw())
+                if is_game_won or game.is_draw():
+                    # finished games are reset with the other player starting
+                    self.assertEqual(batch.get_last_players()[idx], game.get_last_player())
+                    starting_players[idx] *= -1
+                    game.reset()
+                    if starting_players[idx] == -1:
+                        game.next_turn()
+                    self.assertEqual(batch.get_current_players()[idx], game.get_current_player())
+                    self.assertEqual(batch.get_rounds()[idx], 0)
+                else:
+                    game.next_turn()
+
+    def test_skipped_actions(self: "Connect4BatchTests") -> None:
+        batch = Connect4Batch(2)
+        batch.step(np.array([3, -1]))
+        self.assertEqual(list(batch.get_rounds()), [1, 0])
+        self.assertEqual(list(batch.get_current_players()), [-1, -1])
+        self.assertEqual(batch.get_boards()[0, 0, 3], 1)
+        self.assertFalse(np.any(batch.get_boards()[1]))
+
+    def test_play_random_games(self: "Connect4BatchTests") -> None:
+        seed_numba_random_generator(11)
+        no_games = 1000
+        winners, starting_players = play_random_games(no_games, batch_size=128, clever=False)
+
+        self.assertEqual(len(winners), no_games)
+        self.assertTrue(np.all(np.isin(winners, [-1, 0, 1])))
+        self.assertAlmostEqual(np.sum(starting_players == 1), no_games // 2, delta=no_games // 20)
+
+        # the starting player has an advantage in random games
+        self.assertGreater(np.mean(winners == starting_players), 0.5)
@@ -0,0 +1,134 @@
+import unittest
+
+import numpy as np
+
+from Connect4Bitboard import Connect4Bitboard
+from Connect4Game import Connect4
+from Connect4GameFactory import Connect4GameEngines, Connect4GameFactory
+from GameTurnHandler import GameTurnHandler
+
+
+class Connect4BitboardTests(unittest.TestCase):
+    def test_place_discs(self: "Connect4BitboardTests") -> None:
+        game_turn_handler = GameTurnHandler([1, -1])
+        game = Connect4Bitboard(game_turn_handler=game_turn_handler)
+
+        for action in [3, 3, 0, 6]:
+            self.assertFalse(game.place_disc(action))
+            game.next_turn()
+
+        self.assertIsNone(game.get_winner())
+        self.assertEqual(game._get_board()[0, 3], 1)
+        self.assertEqual(game._get_board()[1, 3], -1)
+        self.assertEqual(game._get_board()[0, 0], 1)
+        self.assertEqual(game._get_board()[0, 6], -1)
+        self.assertEqual(game.get_round(), 4)
+
+    def test_diagonal_win(self: "Connect4BitboardTests") -> None:
+        game_turn_handler = GameTurnHandler([1, -1])
+        game = Connect4Bitboard(game_turn_handler=game_turn_handler)
+
+        for action in [0, 1, 1, 2, 2, 3, 2, 3, 3, 6]:
+            self.assertFalse(game.place_disc(action))
+            game.next_turn()
+
+        self.assertTrue(game.place_disc(3))
+        self.assertEqual(game.get_winner(), 1)
+
+    def test_copy_and_reset(self: "Connect4BitboardTests") -> None:
+        game_turn_handler = GameTurnHandler([1, -1])
+        game = Connect4Bitboard(game_turn_handler=game_turn_handler)
+
+        game.place_disc(3)
+        game.next_turn()
+
+        game_copy = game.copy()
+        game_copy.place_disc(3)
+        game_copy.next_turn()
+
+        self.assertEqual(game._get_board()[1, 3], 0)
+        self.assertEqual(game_copy._get_board()[1, 3], -1)
+        self.assertNotEqual(game.get_state_hash(), game_copy.get_state_hash())
+        self.assertEqual(game.get_current_player(), -1)
+        self.assertEqual(game_copy.get_current_player(), 1)
+
+        game.reset()
+        self.assertIsNone(game.get_last_player())
+        self.assertTrue(np.array_equal(game._get_board(), np.zeros((game._no_rows, game._no_cols))))
+        self.assertEqual(game.get_state_hash(), 0)
+
+    def test_same_behaviour_as_numpy_engine(self: "Connect4BitboardTests") -> None:
+        rng = np.random.default_rng(42)
+
+        for _ in range(200):
+            game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+            bitboard_game = Connect4Bitboard(game_turn_handler=GameTurnHandler([1, -1]))
+
+            while True:
+                self.assertTrue(np.array_equal(game._get_board(), bitboard_game._get_board()))
+                self.assertTrue(
+                    np.array_equal(game.get_clever_available_actions(), bitboard_game.get_clever_available_actions()),
+                )
+
+                action = rng.choice(game.get_available_actions())
+                is_game_won = game.place_disc(action)
+                self.assertEqual(is_game_won, bitboard_game.place_disc(action))
+                self.assertEqual(game.get_winner(), bitboard_game.get_winner())
+                self.assertEqual(game.is_draw(), bitboard_game.is_draw())
+                if is_game_won or game.is_draw():
+                    break
+
+                game.next_turn()
+                bitboard_game.next_turn()
+
+    def test_mirrored_state_hash(self: "Connect4BitboardTests") -> None:
+        game = Connect4Bitboard(game_turn_handler=GameTurnHandler([1, -1]))
+        mirrored_game = Connect4Bitboard(game_turn_handler=GameTurnHandler([1, -1]))
+        for action in [0, 3, 1, 1, 6]:
+            game.place_disc(action)
+            game.next_turn()
+            mirrored_game.place_disc(6 - action)
+            mirrored_game.next_turn()
+        self.assertEqual(game.get_mirrored_state_hash(), mirrored_game.get_state_hash())
+        self.assertEqual(mirrored_game.get_mirrored_state_hash(), game.get_state_hash())
+        self.assertNotEqual(game.get_state_hash(), mirrored_game.get_state_hash())
+
+    def test_create_game_from_other_engine(self: "Connect4BitboardTests") -> None:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        for action in [3, 2, 3, 2, 3]:
+            game.place_disc(action)
+            game.next_turn()
+
+        bitboard_game = Connect4GameFactory.create_game(Connect4GameEngines.bitboard, game=game)
+        self.assertIsInstance(bitboard_game, Connect4Bitboard)
+        self.assertTrue(np.array_equal(game._get_board(), bitboard_game._get_board()))
+        self.assertEqual(bitboard_game.get_current_player(), -1)
+        self.assertTrue(np.array_equal(bitboard_game.get_clever_available_actions(), [3]))
+
+        numpy_game = Connect4GameFactory.create_game(Connect4GameEngines.numpy, game=bitboard_game)
+        self.assertTrue(np.array_equal(numpy_game.get_clever_available_actions(), [3]))
+        self.assertTrue(numpy_game.place_disc(3) is False)
+        numpy_game.next_turn()
+        self.assertTrue(numpy_game.place_disc(2) is False)
+
+    def test_random_rollout(self: "Connect4BitboardTests") -> None:
+        for _ in range(20):
+            game = Connect4Bitboard(game_turn_handler=GameTurnHandler([1, -1]))
+            game.place_disc(3)
+            game.next_turn()
+
+            game_copy = Connect4(game)
+            last_player_reward, actions, row_heights = game.random_rollout()
+
+            self.assertTrue(game.get_winner() is not None or game.is_draw())
+            self.assertEqual(last_player_reward, 1.0 if game.get_winner() is not None else 0.5)
+
+            # replaying the rollout trace on the numpy engine gives the same game
+            for action, row_height in zip(actions, row_heights):
+                self.assertEqual(game_copy.next_row_height[action], row_height)
+                game_copy.place_disc(action)
+                game_copy.next_turn()
+            self.assertTrue(np.array_equal(game._get_board(), game_copy._get_board()))
+            self.assertEqual(game.get_winner(), game_copy.get_winner())
+            self.assertEqual(game.get_last_player(), game_copy.get_last_player())
+            self.assertEqual(game.get_current_player(), game_copy.get_current_player())
@@ -1,8 +1,18 @@
 import unittest
 
+import numba  # type: ignore
 import numpy as np
-
-from Connect4Game import Connect4
+import numpy.typing as npt
+
+from Connect4Game import (
+    ZOBRIST_KEYS,
+    Connect4,
+    get_clever_available_actions_state,
+    get_current_player_state,
+    get_zobrist_hash_from_board,
+    place_disc_state,
+)
+from Connect4GameFactory import Connect4GameEngines, Connect4GameFactory
 from GameTurnHandler import GameTurnHandler
 
 
@@ -17,18 +27,18 @@ class Connect4GameTests(unittest.TestCase):
         game_turn_handler = GameTurnHandler([1, -1])
         game = Connect4(game_turn_handler=game_turn_handler)
 
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.place_disc(3)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(3)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(0)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(6)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
 
         self.assertEqual(game._get_board()[0, 3], 1)
         self.assertEqual(game._get_board()[1, 3], -1)
@@ -40,50 +50,50 @@ class Connect4GameTests(unittest.TestCase):
         game = Connect4(game_turn_handler=game_turn_handler)
 
         game.place_disc(3)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(2)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(3)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(2)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(3)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(2)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(3)
-        self.assertEqual(game._winner, 1)
+        self.assertEqual(game.get_winner(), 1)
 
     def test_less_simple_win(self: "Connect4GameTests") -> None:
         game_turn_handler = GameTurnHandler([1, -1])
         game = Connect4(game_turn_handler=game_turn_handler)
 
         game.place_disc(1)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(0)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(4)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(0)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(2)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(0)
-        self.assertIsNone(game._winner)
+        self.assertIsNone(game.get_winner())
         game.next_turn()
         game.place_disc(3)
-        self.assertEqual(game._winner, 1)
+        self.assertEqual(game.get_winner(), 1)
 
     def test_copy(self: "Connect4GameTests") -> None:
         game_turn_handler = GameTurnHandler([1, -1])
@@ -122,6 +132,34 @@ class Connect4GameTests(unittest.TestCase):
         self.assertEqual(game_turn_handler.get_current_player_value(), 1)
         self.assertEqual(game.get_round(), 0)
 
+    def test_restore(self: "Connect4GameTests") -> None:
+        for engine in [Connect4GameEngines.numpy, Connect4GameEngines.bitboard]:
+            root_game = Connect4GameFactory.create_game(engine, game_turn_handler=GameTurnHandler([1, -1]))
+            for action in [3, 3, 4]:
+                root_game.place_disc(action)
+                root_game.next_turn()
+            game = root_game.copy()
+            next_row_height = game.next_row_height
+
+            for _ in range(2):
+                game.place_disc(0)
+                game.next_turn()
+                game.restore(root_game)
+
+                # the arrays of the game are reused, and it plays on from the position of the root game
+                self.assertIs(game.next_row_height, next_row_height)
+                self.assertTrue(np.array_equal(game._get_board(), root_game._get_board()))
+                self.assertTrue(np.array_equal(game.next_row_height, root_game.next_row_height))
+                self.assertEqual(game.get_state_hash(), root_game.get_state_hash())
+                self.assertEqual(game.get_round(), root_game.get_round())
+                self.assertEqual(game.get_last_player(), root_game.get_last_player())
+                self.assertEqual(game.get_current_player(), -1)
+                self.assertEqual(
+                    list(game.get_clever_available_actions()),
+                    list(root_game.get_clever_available_actions()),
+                )
+            self.assertEqual(root_game.get_round(), 3)
+
     def test_last_player(self: "Connect4GameTests") -> None:
         game_turn_handler = GameTurnHandler([1, -1])
         game = Connect4(game_turn_handler=game_turn_handler)
@@ -212,3 +250,149 @@ class Connect4GameTests(unittest.TestCase):
             game.next_turn()
 
         self.assertTrue(game.is_draw())
+
+    def test_random_rollout(self: "Connect4GameTests") -> None:
+        game_turn_handler = GameTurnHandler([1, -1])
+        game = Connect4(game_turn_handler=game_turn_handler)
+        game.place_disc(3)
+        game.next_turn()
+
+        game_copy = game.copy()
+        last_player_reward, actions, row_heights = game.random_rollout()
+
+        # game is over and rollout ended with the last player
+        self.assertTrue(game.get_winner() is not None or game.is_draw())
+        self.assertEqual(last_player_reward, 1.0 if game.get_winner() is not None else 0.5)
+        self.assertEqual(game.get_round(), 1 + len(actions))
+        if game.get_winner() is not None:
+            self.assertEqual(game.get_winner(), game.get_last_player())
+
+        # replaying the rollout trace gives the same game
+        for action, row_height in zip(actions, row_heights):
+            self.assertEqual(game_copy.next_row_height[action], row_height)
+            game_copy.place_disc(action)
+            game_copy.next_turn()
+        self.assertTrue(np.array_equal(game._get_board(), game_copy._get_board()))
+        self.assertEqual(game.get_winner(), game_copy.get_winner())
+        self.assertEqual(game.get_current_player(), game_copy.get_current_player())
+
+    def test_state_hash(self: "Connect4GameTests") -> None:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        other_game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+
+        # same position reached by different move orders has the same hash
+        for action, other_action in [(3, 4), (2, 2), (4, 3)]:
+            game.place_disc(action)
+            game.next_turn()
+            other_game.place_disc(other_action)
+            other_game.next_turn()
+        self.assertEqual(game.get_state_hash(), other_game.get_state_hash())
+        self.assertEqual(game.get_state_hash(), game.copy().get_state_hash())
+        self.assertEqual(game.get_state_hash(), get_zobrist_hash_from_board(game._get_board(), ZOBRIST_KEYS))
+
+        # colors matter
+        game.place_disc(0)
+        other_game._place_disc(0, 1)
+        self.assertNotEqual(game.get_state_hash(), other_game.get_state_hash())
+
+        # hash is kept up to date by the compiled rollout
+        game.random_rollout()
+        self.assertEqual(game.get_state_hash(), get_zobrist_hash_from_board(game._get_board(), ZOBRIST_KEYS))
+
+        game.reset()
+        self.assertEqual(game.get_state_hash(), 0)
+
+    def test_mirrored_state_hash(self: "Connect4GameTests") -> None:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        mirrored_game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        for action in [0, 3, 1, 1]:
+            game.place_disc(action)
+            game.next_turn()
+            mirrored_game.place_disc(6 - action)
+            mirrored_game.next_turn()
+        self.assertEqual(game.get_mirrored_state_hash(), mirrored_game.get_state_hash())
+        self.assertEqual(mirrored_game.get_mirrored_state_hash(), game.get_state_hash())
+        self.assertNotEqual(game.get_state_hash(), mirrored_game.get_state_hash())
+
+    def test_scalars_are_read_from_state(self: "Connect4GameTests") -> None:
+        np.random.seed(0)  # noqa: NPY002
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        self.assert_state_matches_game(game)
+        for action in [3, 2, 3, 2]:
+            game.place_disc(action)
+            game.next_turn()
+            self.assert_state_matches_game(game)
+
+        game_copy = game.copy()
+        game_copy.random_rollout()
+        self.assert_state_matches_game(game_copy)
+        game.restore(game_copy)
+        self.assert_state_matches_game(game)
+        self.assertEqual(game.get_winner(), game_copy.get_winner())
+        self.assertEqual(game.get_round(), game_copy.get_round())
+
+        # the getters follow changes of the state made by compiled code
+        game.reset()
+        place_disc_state(game._state, 3, ZOBRIST_KEYS)
+        self.assertEqual(game.get_round(), 1)
+        self.assertEqual(game.get_last_player(), 1)
+        self.assertEqual(game.get_current_player(), -1)
+        self.assertEqual(game.get_state_hash(), ZOBRIST_KEYS[0, 0, 3])
+
+    def test_side_to_move_follows_round(self: "Connect4GameTests") -> None:
+        for engine, other_engine in [
+            (Connect4GameEngines.numpy, Connect4GameEngines.bitboard),
+            (Connect4GameEngines.bitboard, Connect4GameEngines.numpy),
+        ]:
+            game = Connect4GameFactory.create_game(engine, game_turn_handler=GameTurnHandler([1, -1]))
+
+            # passing the first move lets the other player start
+            game.next_turn()
+            self.assertEqual(game.get_current_player(), -1)
+            self.assertEqual(game.get_current_player_turn(), 1)
+            game.place_disc(3)
+            self.assertEqual(game.get_last_player(), -1)
+            self.assertEqual(game.get_current_player(), 1)
+            self.assertEqual(game.get_current_player_turn(), 0)
+
+            # later turns follow from the round
+            game.next_turn()
+            game.place_disc(3)
+            self.assertEqual(game._get_board()[1, 3], 1)
+            self.assertEqual(game.get_current_player(), -1)
+            self.assertEqual(game.copy().get_current_player(), -1)
+            self.assertEqual(Connect4GameFactory.create_game(other_engine, game=game).get_current_player(), -1)
+
+            game.reset()
+            self.assertEqual(game.get_current_player(), 1)
+
+    def test_state_functions_are_callable_from_compiled_code(self: "Connect4GameTests") -> None:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        for action in [3, 3, 4, 4, 5]:
+            game.place_disc(action)
+            game.next_turn()
+
+        # player 1 threatens to win in columns 2 and 6, so -1 can block only one of them
+        self.assertEqual(list(get_clever_available_actions_state(game._state)), [2, 6])
+        self.assertEqual(play_first_clever_actions(game._state, 2, ZOBRIST_KEYS), 1)
+        self.assertEqual(game._state[0]["round"], 7)
+
+    def assert_state_matches_game(self: "Connect4GameTests", game: Connect4) -> None:
+        game_state = game._state[0]
+        self.assertEqual(game_state["round"], game.get_round())
+        self.assertEqual(game_state["winner"], game.get_winner() or 0)
+        self.assertEqual(game_state["last_player"], game.get_last_player() or 0)
+        self.assertEqual(get_current_player_state(game._state), game.get_current_player())
+        self.assertEqual(game_state["state_hash"], game.get_state_hash())
+        self.assertEqual(game.get_state_hash(), get_zobrist_hash_from_board(game._get_board(), ZOBRIST_KEYS))
+
+
+@numba.njit
+def play_first_clever_actions(state: npt.NDArray[np.void], no_actions: int, zobrist_keys: npt.NDArray[np.int64]) -> int:
+    # plays the first clever action for both players in turn, returns the winner (0 if none)
+    for _ in range(no_actions):
+        player = get_current_player_state(state)
+        action = get_clever_available_actions_state(state)[0]
+        if place_disc_state(state, action, zobrist_keys):
+            return player
+    return 0
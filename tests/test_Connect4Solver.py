@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler, SolverConfig
+from Connect4Bitboard import BOARD_MASK, BOTTOM_MASK, COLUMN_MASKS, board_to_bitboard, compute_winning_positions
+from Connect4Game import Connect4
+from Connect4Players import RandomPlayer, SolverPlayer
+from Connect4Solver import NO_CELLS, Connect4Solver
+from GameTurnHandler import GameTurnHandler
+from LoggerHandler import LoggerHandler
+
+
+def solve_by_brute_force(position: int, mask: int, no_moves: int) -> int:
+    # plain negamax over all moves with the scores of the solver
+    if no_moves == NO_CELLS:
+        return 0
+    possible = (mask + BOTTOM_MASK) & BOARD_MASK
+    moves = [possible & column_mask for column_mask in COLUMN_MASKS if possible & column_mask]
+    if any(move & compute_winning_positions(position) for move in moves):
+        return (NO_CELLS + 1 - no_moves) // 2
+    return max(-solve_by_brute_force(position ^ mask, mask | move, no_moves + 1) for move in moves)
+
+
+class Connect4SolverTests(unittest.TestCase):
+    def setUp(self: "Connect4SolverTests") -> None:
+        self.solver = Connect4Solver(16)
+
+    def _play(self: "Connect4SolverTests", actions: list[int]) -> Connect4:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        for action in actions:
+            game.place_disc(action)
+            game.next_turn()
+        return game
+
+    def test_win_directly(self: "Connect4SolverTests") -> None:
+        action, score, is_exact = self.solver.solve(self._play([0, 6, 0, 6, 0, 6]))
+        self.assertEqual(action, 0)
+        self.assertEqual(score, (NO_CELLS + 1 - 6) // 2)
+        self.assertTrue(is_exact)
+
+    def test_block_and_lose(self: "Connect4SolverTests") -> None:
+        # the threat in column 0 has to be blocked, the rest of the game is not solved in time
+        action, _, _ = self.solver.solve(self._play([0, 6, 0, 6, 0]), time_limit_ms=100)
+        self.assertEqual(action, 0)
+
+        # two threats on the bottom row can not both be blocked
+        _, score, is_exact = self.solver.solve(self._play([2, 2, 3, 3, 4]))
+        self.assertEqual(score, -((NO_CELLS + 1 - 6) // 2))
+        self.assertTrue(is_exact)
+
+    def test_scores_match_brute_force(self: "Connect4SolverTests") -> None:
+        rng = np.random.default_rng(42)
+        no_checked_positions = 0
+        while no_checked_positions < 4:
+            game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+            is_won = False
+            for _ in range(36):
+                is_won = game.place_disc(int(rng.choice(game.get_available_actions())))
+                if is_won:
+                    break
+                game.next_turn()
+            if is_won:
+                continue
+
+            position, mask = board_to_bitboard(game._get_board())
+            own_position = position if game.get_current_player() == 1 else mask ^ position
+            _, score, is_exact = self.solver.solve(game)
+            self.assertEqual(score, solve_by_brute_force(own_position, mask, game.get_round()))
+            self.assertTrue(is_exact)
+            no_checked_positions += 1
+
+    def test_time_limit(self: "Connect4SolverTests") -> None:
+        # the opening can not be solved in 100 ms, but an action is found nevertheless
+        game = self._play([])
+        self.solver.solve(game, time_limit_ms=100)
+        action, _, is_exact = self.solver.solve(game, time_limit_ms=100)
+        self.assertIn(action, game.get_available_actions())
+        self.assertFalse(is_exact)
+
+    def test_solver_player_beats_random_player(self: "Connect4SolverTests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("solver", "time_limit_ms", "50")
+        config_handler._config_parser.set("solver", "transposition_table_size_log2", "16")
+        solver_player = SolverPlayer(SolverConfig(config_handler), LoggerHandler(config_handler))
+        random_player = RandomPlayer()
+
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        winner = 0
+        for _ in range(game.get_max_rounds()):
+            player = solver_player if game.get_current_player() == 1 else random_player
+            if game.place_disc(player.make_action(game, game.get_clever_available_actions())):
+                winner = game.get_winner()
+                break
+            game.next_turn()
+
+        self.assertEqual(winner, 1)
+        self.assertEqual(solver_player.winning_probability, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
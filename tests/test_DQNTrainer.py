@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.typing as npt
+
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from Connect4Players import DQPlayer
+from DQNTrainer import NO_CELLS, DQNTrainer, SelfPlayEnvironment
+from GameTurnHandler import GameTurnHandler
+from LoggerHandler import LoggerHandler
+from NumpyQModel import NumpyQModel, save_q_model_weights
+
+
+class LinearQModel:
+    # linear q values with the interface of DeepQModel, trained with numpy
+    def __init__(self: "LinearQModel") -> None:
+        self.kernel = np.random.default_rng(0).normal(scale=0.1, size=(NO_CELLS, 7))
+        self.bias = np.zeros(7)
+        self.target_kernel = self.kernel.copy()
+        self.target_bias = self.bias.copy()
+        self.number_of_gradient_steps = 0
+        self.number_of_target_updates = 0
+
+    def predict(self: "LinearQModel", states: npt.NDArray[np.float32]) -> npt.NDArray[np.float64]:
+        return states @ self.kernel + self.bias
+
+    def do_gradient_step(
+        self: "LinearQModel",
+        init_states: npt.NDArray[np.float32],
+        actions: npt.NDArray[np.int64],
+        rewards: npt.NDArray[np.float32],
+        next_states: npt.NDArray[np.float32],
+        terminations: npt.NDArray[np.float32],
+        discount: float = 1.0,
+    ) -> float:
+        next_q_values = np.max(next_states @ self.target_kernel + self.target_bias, axis=1)
+        targets = rewards - discount * (1 - terminations) * next_q_values
+        errors = self.predict(init_states)[np.arange(len(actions)), actions] - targets
+
+        masks = np.eye(7)[actions] * errors[:, None]
+        self.kernel -= 0.01 * init_states.T @ masks / len(actions)
+        self.bias -= 0.01 * np.sum(masks, axis=0) / len(actions)
+        self.number_of_gradient_steps += 1
+        return float(np.mean(errors**2))
+
+    def update_target_model(self: "LinearQModel") -> None:
+        self.target_kernel = self.kernel.copy()
+        self.target_bias = self.bias.copy()
+        self.number_of_target_updates += 1
+
+    def save_weights(self: "LinearQModel", path: str) -> None:
+        with open(path, "wb") as file:
+            np.savez(file, kernel=self.kernel, bias=self.bias)
+
+    def load_weights(self: "LinearQModel", path: str) -> None:
+        with np.load(path) as weights:
+            self.kernel = weights["kernel"]
+            self.bias = weights["bias"]
+        self.update_target_model()
+
+    def export_weights(self: "LinearQModel", path: str) -> None:
+        save_q_model_weights(path, [self.kernel], [self.bias], "linear", "linear")
+
+
+class DQNTrainerTests(unittest.TestCase):
+    def setUp(self: "DQNTrainerTests") -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_handler = ConfigHandler()
+        for key, value in [
+            ("no_environments", "8"),
+            ("replay_buffer_size", "400"),
+            ("min_replay_buffer_size", "64"),
+            ("minibatch_size", "16"),
+            ("epsilon_decay_steps", "20"),
+            ("target_sync_interval", "5"),
+            ("checkpoint_interval", "10"),
+            ("checkpoint_path", os.path.join(self.directory.name, "dqn")),
+        ]:
+            self.config_handler._config_parser.set("dqn", key, value)
+        self.logger_handler = LoggerHandler(self.config_handler)
+
+    def tearDown(self: "DQNTrainerTests") -> None:
+        self.directory.cleanup()
+
+    def test_self_play_transitions(self: "DQNTrainerTests") -> None:
+        environment = SelfPlayEnvironment(16)
+        predict = LinearQModel().predict
+        rng = np.random.default_rng(0)
+
+        number_of_terminations = 0
+        for step in range(60):
+            states, actions, rewards, next_states, terminations = environment.step(predict, step % 2, rng)
+            self.assertEqual(states.shape, (16, NO_CELLS))
+            self.assertTrue(np.all((actions >= 0) & (actions < 7)))
+            # rewards are only given for finished games
+            self.assertTrue(np.all(rewards <= terminations))
+
+            # the next player sees the board with the new disc from the other side
+            running = terminations == 0
+            self.assertTrue(np.array_equal(np.sum(next_states[running], axis=1), -np.sum(states[running], axis=1) - 1))
+            self.assertTrue(np.array_equal(next_states, environment.get_states()))
+            number_of_terminations += int(np.sum(terminations))
+        self.assertGreater(number_of_terminations, 0)
+
+    def test_train_and_checkpoint(self: "DQNTrainerTests") -> None:
+        q_model = LinearQModel()
+        trainer = DQNTrainer(self.config_handler, self.logger_handler, q_model, seed=0)
+        self.assertEqual(trainer.get_epsilon(), 1.0)
+
+        trainer.train(20)
+        self.assertEqual(trainer.step, 20)
+        self.assertAlmostEqual(trainer.get_epsilon(), 0.05)
+        self.assertEqual(trainer.get_replay_buffer().get_number_of_transitions(), 160)
+        # gradient steps start once the replay buffer holds min_replay_buffer_size transitions
+        self.assertEqual(q_model.number_of_gradient_steps, 20 - 64 // 8 + 1)
+        self.assertEqual(q_model.number_of_target_updates, 4)
+        self.assertTrue(trainer.has_checkpoint())
+
+        loaded_q_model = LinearQModel()
+        loaded_trainer = DQNTrainer(self.config_handler, self.logger_handler, loaded_q_model)
+        loaded_trainer.load_checkpoint()
+        self.assertEqual(loaded_trainer.step, 20)
+        self.assertEqual(loaded_trainer.get_replay_buffer().get_number_of_transitions(), 160)
+        self.assertTrue(np.allclose(loaded_q_model.kernel, q_model.kernel))
+
+        # the exported weights can be played without the training model
+        numpy_q_model = NumpyQModel(os.path.join(self.directory.name, "dqn.npz"))
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        game.place_disc(3)
+        game.next_turn()
+        state = game._get_board().flatten() * game.get_current_player()
+        self.assertTrue(np.allclose(numpy_q_model.predict(state), q_model.predict(state)))
+
+        player = DQPlayer(numpy_q_model, 0.0)
+        action = player.make_action(game, game.get_available_actions())
+        self.assertEqual(action, int(np.argmax(q_model.predict(state))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import Connect4Players
 import GameTurnHandler
 import LoggerHandler
 import MCTSPlayerFactory
+from RootParallelSearch import seed_numba_random_generator
 
 
 class GameHandlerTests(unittest.TestCase):
@@ -34,6 +35,30 @@ class GameHandlerTests(unittest.TestCase):
 
         self.assertAlmostEqual(np.sum(winners), -1 * number_of_games)
 
+    def test_close_stops_root_parallel_workers(self: "GameHandlerTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "root_parallel_workers", "2")
+        logger_handler = LoggerHandler.LoggerHandler(config_handler)
+
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+
+        player0 = Connect4Players.RandomPlayer()
+        player1 = MCTSPlayerFactory.MCTSPlayerFactory.create_player(
+            game,
+            -1,
+            1,
+            "normal",
+            config_handler,
+            logger_handler,
+        )
+        game_handler = Connect4GameHandler.Connect4GameHandler(game, player0, player1, logger_handler, config_handler)
+        game_handler.play_n_games(1)
+        self.assertIsNotNone(player1._root_parallel_search._executor)
+
+        game_handler.close()
+        self.assertIsNone(player1._root_parallel_search._executor)
+
     def test_normal_vs_hard_mcts(self: "GameHandlerTests") -> None:
         config_handler = ConfigHandler.ConfigHandler()
         logger_handler = LoggerHandler.LoggerHandler(config_handler)
@@ -54,6 +79,7 @@ class GameHandlerTests(unittest.TestCase):
         number_of_games = 10
 
         np.random.seed(420)  # noqa: NPY002
+        seed_numba_random_generator(420)
         winners = game_handler.play_n_games(number_of_games)
 
         self.assertLess(np.sum(winners), -number_of_games/4)
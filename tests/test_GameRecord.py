@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import ConfigHandler
+import Connect4Game
+import Connect4GameHandler
+import Connect4Players
+import GameTurnHandler
+import LoggerHandler
+from Connect4GameFactory import Connect4GameEngines
+from GameRecord import (
+    FILE_HEADER,
+    GameRecord,
+    GameRecordWriter,
+    read_game_record_batches,
+    read_game_records,
+    replay_game_record,
+)
+
+
+class GameRecordTests(unittest.TestCase):
+    def setUp(self: "GameRecordTests") -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.c4gr")
+        self.game_records = [
+            GameRecord(1, [3, 3, 4, 4, 5, 5, 6], 1),
+            GameRecord(-1, [0, 1, 0, 1, 0, 1, 0], -1),
+            GameRecord(1, [], None),
+        ]
+
+    def tearDown(self: "GameRecordTests") -> None:
+        self.directory.cleanup()
+
+    def test_write_and_read(self: "GameRecordTests") -> None:
+        with GameRecordWriter(self.path) as game_record_writer:
+            for game_record in self.game_records:
+                game_record_writer.write_record(game_record)
+            self.assertEqual(game_record_writer.number_of_games, 3)
+
+        # a header plus three bytes and one byte per move for every game
+        expected_size = FILE_HEADER.size + sum(3 + len(game_record.moves) for game_record in self.game_records)
+        self.assertEqual(os.path.getsize(self.path), expected_size)
+        self.assertEqual(list(read_game_records(self.path)), self.game_records)
+
+        # later sessions append to the same file
+        with GameRecordWriter(self.path) as game_record_writer:
+            game_record_writer.write_record(self.game_records[0])
+        self.assertEqual(list(read_game_records(self.path)), [*self.game_records, self.game_records[0]])
+
+    def test_read_batches(self: "GameRecordTests") -> None:
+        with GameRecordWriter(self.path) as game_record_writer:
+            for game_record in self.game_records:
+                game_record_writer.write_record(game_record)
+
+        batches = list(read_game_record_batches(self.path, 2))
+        self.assertEqual([len(batch[0]) for batch in batches], [2, 1])
+
+        starting_players, moves, no_moves, winners = batches[0]
+        self.assertTrue(np.array_equal(starting_players, [1, -1]))
+        self.assertEqual(moves.shape, (2, 42))
+        self.assertTrue(np.array_equal(no_moves, [7, 7]))
+        self.assertTrue(np.array_equal(moves[1, :7], self.game_records[1].moves))
+        self.assertTrue(np.all(moves[:, 7:] == -1))
+        self.assertTrue(np.array_equal(winners, [1, -1]))
+        self.assertEqual(batches[1][3][0], 0)
+
+    def test_replay(self: "GameRecordTests") -> None:
+        for engine in [Connect4GameEngines.numpy, Connect4GameEngines.bitboard]:
+            game = replay_game_record(self.game_records[1], engine)
+            self.assertEqual(game.get_winner(), -1)
+            self.assertEqual(game.get_round(), 7)
+            self.assertTrue(np.array_equal(game._get_board()[:4, 0], [-1, -1, -1, -1]))
+
+    def test_unknown_format(self: "GameRecordTests") -> None:
+        with open(self.path, "wb") as file:
+            file.write(b"not a game record")
+        with self.assertRaises(ValueError):
+            list(read_game_records(self.path))
+        with self.assertRaises(ValueError):
+            GameRecordWriter(self.path)
+
+    def test_game_handler_writes_records(self: "GameRecordTests") -> None:
+        config_handler = ConfigHandler.ConfigHandler()
+        logger_handler = LoggerHandler.LoggerHandler(config_handler)
+        game = Connect4Game.Connect4(game_turn_handler=GameTurnHandler.GameTurnHandler([1, -1]))
+
+        with GameRecordWriter(self.path) as game_record_writer:
+            game_handler = Connect4GameHandler.Connect4GameHandler(
+                game,
+                Connect4Players.RandomPlayer(),
+                Connect4Players.RandomPlayer(),
+                logger_handler,
+                config_handler,
+                game_record_writer,
+            )
+            winners = game_handler.play_n_games(6)
+
+        game_records = list(read_game_records(self.path))
+        self.assertEqual([game_record.winner for game_record in game_records], winners)
+        self.assertEqual([game_record.starting_player for game_record in game_records], [1, -1] * 3)
+        for game_record, end_round in zip(game_records, game_handler.rounds):
+            self.assertEqual(len(game_record.moves), end_round + 1)
+            self.assertEqual(replay_game_record(game_record).get_winner(), game_record.winner or None)
+
+
+if __name__ == "__main__":
+    unittest.main()
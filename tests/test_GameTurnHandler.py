@@ -32,3 +32,22 @@ class GameTurnHandlerTests(unittest.TestCase):
         # Also check that the original game_turn_handler did not go to the next turn
         self.assertEqual(game_turn_handler.get_current_player_value(), 5)
         self.assertEqual(game_turn_handler.get_next_player_value(), 6)
+
+    def test_restore_and_reset(self: "GameTurnHandlerTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1], 3)
+        self.assertEqual(game_turn_handler.get_current_player_value(), -1)
+        self.assertEqual(game_turn_handler.get_current_player_turn(), 1)
+
+        other_game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        for _ in range(3):
+            other_game_turn_handler.next_turn()
+        game_turn_handler.next_turn()
+        game_turn_handler.restore(other_game_turn_handler)
+        self.assertEqual(game_turn_handler.get_current_player_value(), -1)
+        self.assertEqual(game_turn_handler.get_next_player_value(), 1)
+
+        # like a copy, the restored handler resets to the turn it was restored to
+        game_turn_handler.next_turn()
+        game_turn_handler.reset()
+        self.assertEqual(game_turn_handler.get_current_player_value(), -1)
+        self.assertEqual(other_game_turn_handler.get_current_player_value(), -1)
@@ -0,0 +1,111 @@
+import threading
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from InferenceQueue import InferenceQueue, create_q_value_batch_evaluator, uniform_batch_evaluator
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory, MCTSPlayerNames
+
+
+class InferenceQueueTests(unittest.TestCase):
+    def test_evaluations_are_batched(self: "InferenceQueueTests") -> None:
+        batch_sizes = []
+
+        def batch_evaluator(games: list[Connect4]) -> tuple:
+            batch_sizes.append(len(games))
+            return np.array([np.arange(7) + game.get_round() for game in games]), np.full(len(games), 0.25)
+
+        inference_queue = InferenceQueue(batch_evaluator, batch_size=4, max_wait_ms=5000)
+        games = [Connect4(game_turn_handler=GameTurnHandler([1, -1])) for _ in range(4)]
+        for round_number, game in enumerate(games):
+            for _ in range(round_number):
+                game.place_disc(0)
+                game.next_turn()
+
+        evaluations: dict = {}
+
+        def evaluate(game: Connect4) -> None:
+            evaluations[game.get_round()] = inference_queue.evaluate(game)
+
+        threads = [threading.Thread(target=evaluate, args=(game,)) for game in games]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        inference_queue.close()
+
+        # one batch of all positions, every thread gets the evaluation of its own position
+        self.assertEqual(batch_sizes, [4])
+        for round_number in range(4):
+            priors, win_prediction = evaluations[round_number]
+            self.assertTrue(np.array_equal(priors, np.arange(7) + round_number))
+            self.assertEqual(win_prediction, 0.25)
+
+    def test_incomplete_batch_is_evaluated_after_max_wait(self: "InferenceQueueTests") -> None:
+        inference_queue = InferenceQueue(uniform_batch_evaluator, batch_size=8, max_wait_ms=10)
+        priors, win_prediction = inference_queue.evaluate(Connect4(game_turn_handler=GameTurnHandler([1, -1])))
+        inference_queue.close()
+        self.assertTrue(np.allclose(priors, np.ones(7) / 7))
+        self.assertEqual(win_prediction, 0.5)
+        self.assertEqual(inference_queue.number_of_batches, 1)
+
+    def test_exceptions_are_raised_by_waiting_threads(self: "InferenceQueueTests") -> None:
+        def failing_batch_evaluator(games: list[Connect4]) -> tuple:
+            raise ValueError("no model")
+
+        inference_queue = InferenceQueue(failing_batch_evaluator, batch_size=1, max_wait_ms=0)
+        with self.assertRaises(ValueError):
+            inference_queue.evaluate(Connect4(game_turn_handler=GameTurnHandler([1, -1])))
+        inference_queue.close()
+
+    def test_q_value_batch_evaluator(self: "InferenceQueueTests") -> None:
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        game.place_disc(3)
+        game.next_turn()
+
+        seen_boards = []
+
+        def predict(boards: np.ndarray) -> np.ndarray:
+            seen_boards.append(boards)
+            return np.tile(np.array([-1.0, 0, 0, 0.5, 0, 0, 0]), (len(boards), 1))
+
+        priors, win_predictions = create_q_value_batch_evaluator(predict)([game])
+        # the board is seen from the player to move
+        self.assertEqual(seen_boards[0].shape, (1, 42))
+        self.assertEqual(np.min(seen_boards[0]), -1)
+        self.assertAlmostEqual(np.sum(priors), 1.0)
+        self.assertEqual(np.argmax(priors[0]), 3)
+        self.assertEqual(win_predictions[0], 0.25)
+
+    def test_tree_parallel_search_with_inference_queue(self: "InferenceQueueTests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "tree_parallel_threads", "4")
+        config_handler._config_parser.set("MCTSPlayer.normal", "ponder", "False")
+        logger_handler = LoggerHandler(config_handler)
+        inference_queue = InferenceQueue(uniform_batch_evaluator, batch_size=4, max_wait_ms=20)
+
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        player = MCTSPlayerFactory.create_player(
+            game,
+            1,
+            -1,
+            MCTSPlayerNames.normal,
+            config_handler,
+            logger_handler,
+            evaluator=inference_queue.evaluate,
+        )
+        action = player.make_action(game, game.get_available_actions())
+        inference_queue.close()
+
+        self.assertIn(action, game.get_available_actions())
+        # every node was evaluated (threads reaching the same new leaf both evaluate it), in batches of several leaves
+        self.assertGreaterEqual(inference_queue.number_of_evaluations, player._tree.get_number_of_nodes())
+        self.assertGreater(inference_queue.get_average_batch_size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
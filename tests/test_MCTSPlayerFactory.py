@@ -1,3 +1,4 @@
+import time
 import unittest
 
 import numpy as np
@@ -104,4 +105,146 @@ class MCTSPlayerFactoryTests(unittest.TestCase):
             game.place_disc(action)
             game.next_turn()
 
+    def test_root_parallel_search(self: "MCTSPlayerFactoryTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "root_parallel_workers", "2")
+        logger_handler = LoggerHandler(config_handler)
+        player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.normal, config_handler, logger_handler)
+        self.assertEqual(player._mcts_config.root_parallel_workers, 2)
+        available_actions = game.get_available_actions()
+        action = player.make_action(game, available_actions)
+        player.close()
+        self.assertIn(action, available_actions)
+
+        # root visits of both searches are merged
+        _, no_visits_actions, q_values = player._mcts_engine.get_root_statistics()
+        self.assertEqual(np.sum(no_visits_actions), player._mcts_config.max_count)
+        self.assertTrue(np.all((q_values >= 0) & (q_values <= 1)))
+
+    def test_tree_parallel_search(self: "MCTSPlayerFactoryTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.hard", "tree_parallel_threads", "4")
+        # the virtual losses of all nodes are checked at once on the array tree
+        config_handler._config_parser.set("MCTSPlayer.hard", "tree_type", "array")
+        logger_handler = LoggerHandler(config_handler)
+        player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.hard, config_handler, logger_handler)
+        self.assertEqual(player._mcts_config.tree_parallel_threads, 4)
+        available_actions = game.get_available_actions()
+        action = player.make_action(game, available_actions)
+        self.assertIn(action, available_actions)
+
+        # every round is backpropagated through the shared root, and all virtual losses are removed again
+        _, no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        self.assertEqual(np.sum(no_visits_actions), player._mcts_config.max_count)
+        self.assertEqual(np.sum(player._tree.virtual_losses), 0)
+
+    def test_time_limited_search(self: "MCTSPlayerFactoryTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.god", "time_limit_ms", "50")
+        logger_handler = LoggerHandler(config_handler)
+        player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.god, config_handler, logger_handler)
+        self.assertEqual(player._mcts_config.time_limit_ms, 50)
+
+        # compile before timing
+        player.make_action(game, game.get_available_actions())
+        player.reset()
+
+        start_time = time.perf_counter()
+        action = player.make_action(game, game.get_available_actions())
+        elapsed_time = time.perf_counter() - start_time
+        self.assertIn(action, game.get_available_actions())
+        self.assertLess(elapsed_time, 1.0)
+        self.assertGreater(player.number_of_playouts, 0)
+        self.assertLess(player.number_of_playouts, player._mcts_config.max_count)
+
+        # every performed playout passes through the root
+        _, no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        self.assertEqual(np.sum(no_visits_actions), player.number_of_playouts)
+
+    def test_pondering_reuses_tree(self: "MCTSPlayerFactoryTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "ponder", "True")
+        logger_handler = LoggerHandler(config_handler)
+        player = MCTSPlayerFactory.create_player(game, -1, 1, MCTSPlayerNames.normal, config_handler, logger_handler)
+
+        # compile before pondering
+        player.make_action(game, game.get_available_actions())
+        player.reset()
+
+        # ponder while the opponent (player 1) is to move
+        player.start_pondering(game)
+        time.sleep(0.5)
+        game.place_disc(3)
+        game.next_turn()
+        player.stop_pondering()
+        self.assertGreater(player.number_of_ponder_playouts, 0)
+
+        # the subtree of the actual opponent move is reused by the next search
+        player._mcts_engine.set_game(game)
+        _, no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        no_ponder_visits = np.sum(no_visits_actions)
+        self.assertGreater(no_ponder_visits, 0)
+
+        action = player.make_action(game, game.get_available_actions())
+        self.assertIn(action, game.get_available_actions())
+        _, no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        self.assertEqual(np.sum(no_visits_actions), no_ponder_visits + player.number_of_playouts)
+
+    def test_tree_is_pruned_between_moves(self: "MCTSPlayerFactoryTests") -> None:
+        game_turn_handler = GameTurnHandler.GameTurnHandler([1, -1])
+        game = Connect4Game.Connect4(game_turn_handler=game_turn_handler)
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "max_number_of_nodes", "100")
+        logger_handler = LoggerHandler(config_handler)
+        player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.normal, config_handler, logger_handler)
+
+        for _ in range(2):
+            action = player.make_action(game, game.get_available_actions())
+            game.place_disc(action)
+            game.next_turn()
+            game.place_disc(0)
+            game.next_turn()
+
+        # only the capped subtree of the current position is kept before the search
+        no_nodes = player._tree.get_number_of_nodes()
+        player._prune_tree()
+        self.assertLessEqual(player._tree.get_number_of_nodes(), 100)
+        self.assertLessEqual(no_nodes, 100 + player._mcts_config.max_count)
+
+    def test_symmetric_tree_shares_mirrored_nodes(self: "MCTSPlayerFactoryTests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.hard", "symmetric_tree", "True")
+        config_handler._config_parser.set("MCTSPlayer.hard", "ponder", "False")
+        logger_handler = LoggerHandler(config_handler)
+        game = Connect4Game.Connect4(game_turn_handler=GameTurnHandler.GameTurnHandler([1, -1]))
+        player = MCTSPlayerFactory.create_player(game, -1, 1, MCTSPlayerNames.hard, config_handler, logger_handler)
+
+        # search after the opponent played in column 0, then look at the position after column 6
+        game.place_disc(0)
+        game.next_turn()
+        player.make_action(game, game.get_available_actions())
+        actions, no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        no_nodes = player._tree.get_number_of_nodes()
+
+        mirrored_game = Connect4Game.Connect4(game_turn_handler=GameTurnHandler.GameTurnHandler([1, -1]))
+        mirrored_game.place_disc(6)
+        mirrored_game.next_turn()
+        player._mcts_engine.set_game(mirrored_game)
+        mirrored_actions, mirrored_no_visits_actions, _ = player._mcts_engine.get_root_statistics()
+        self.assertEqual(player._tree.get_number_of_nodes(), no_nodes)
+
+        # the statistics of an action are those of the mirrored action
+        no_visits = dict(zip(actions, no_visits_actions))
+        for action, no_visits_action in zip(mirrored_actions, mirrored_no_visits_actions):
+            self.assertEqual(no_visits[6 - action], no_visits_action)
 
+        action = player.make_action(mirrored_game, mirrored_game.get_available_actions())
+        self.assertIn(action, mirrored_game.get_available_actions())
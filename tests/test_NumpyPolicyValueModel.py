@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from InferenceQueue import create_policy_value_batch_evaluator, create_policy_value_evaluator
+from NumpyPolicyValueModel import NumpyPolicyValueModel, save_policy_value_weights
+
+
+class NumpyPolicyValueModelTests(unittest.TestCase):
+    def setUp(self: "NumpyPolicyValueModelTests") -> None:
+        rng = np.random.default_rng(3)
+        self.kernels = [rng.normal(size=(42, 16)), rng.normal(size=(16, 16))]
+        self.biases = [rng.normal(size=16), rng.normal(size=16)]
+        self.policy_weights = (rng.normal(size=(16, 7)), rng.normal(size=7))
+        self.value_weights = (rng.normal(size=(16, 1)), rng.normal(size=1))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "policy_value_model.npz")
+        save_policy_value_weights(
+            self.path,
+            self.kernels,
+            self.biases,
+            self.policy_weights,
+            self.value_weights,
+            "relu",
+        )
+
+    def tearDown(self: "NumpyPolicyValueModelTests") -> None:
+        self.directory.cleanup()
+
+    def test_forward_pass(self: "NumpyPolicyValueModelTests") -> None:
+        model = NumpyPolicyValueModel(self.path)
+        self.assertEqual((model.input_dim, model.output_dim), (42, 7))
+
+        states = np.random.default_rng(0).choice([-1.0, 0.0, 1.0], size=(5, 42))
+        outputs = states
+        for kernel, bias in zip(self.kernels, self.biases):
+            outputs = np.maximum(outputs @ kernel + bias, 0)
+        logits = outputs @ self.policy_weights[0] + self.policy_weights[1]
+        expected_policies = np.exp(logits) / np.sum(np.exp(logits), axis=1, keepdims=True)
+        expected_values = np.tanh(outputs @ self.value_weights[0] + self.value_weights[1])[:, 0]
+
+        policies, values = model.predict(states)
+        self.assertTrue(np.allclose(policies, expected_policies))
+        self.assertTrue(np.allclose(values, expected_values))
+
+        # single states and batches give the same outputs
+        policy, value = model.predict(states[1])
+        self.assertTrue(np.allclose(policy, policies[1]))
+        self.assertAlmostEqual(float(value), values[1])
+
+    def test_unknown_activation(self: "NumpyPolicyValueModelTests") -> None:
+        with self.assertRaises(ValueError):
+            save_policy_value_weights(
+                self.path,
+                self.kernels,
+                self.biases,
+                self.policy_weights,
+                self.value_weights,
+                "swish",
+            )
+
+    def test_policy_value_evaluator(self: "NumpyPolicyValueModelTests") -> None:
+        model = NumpyPolicyValueModel(self.path)
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        game.place_disc(3)
+        game.next_turn()
+
+        priors, win_prediction = create_policy_value_evaluator(model.predict)(game)
+        policies, values = model.predict(game._get_board().flatten() * game.get_current_player())
+        self.assertTrue(np.allclose(priors, policies))
+        # the win prediction is that of the player who moved last
+        self.assertAlmostEqual(win_prediction, (1 - values) / 2)
+
+        batch_priors, batch_win_predictions = create_policy_value_batch_evaluator(model.predict)([game, game])
+        self.assertEqual(batch_priors.shape, (2, 7))
+        self.assertTrue(np.allclose(batch_win_predictions, win_prediction))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from InferenceQueue import create_q_value_evaluator
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory, MCTSPlayerNames
+from NumpyQModel import NumpyQModel, save_q_model_weights
+
+
+class NumpyQModelTests(unittest.TestCase):
+    def setUp(self: "NumpyQModelTests") -> None:
+        rng = np.random.default_rng(7)
+        self.kernels = [rng.normal(size=(42, 16)), rng.normal(size=(16, 16)), rng.normal(size=(16, 7))]
+        self.biases = [rng.normal(size=16), rng.normal(size=16), rng.normal(size=7)]
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "q_model.npz")
+        save_q_model_weights(self.path, self.kernels, self.biases, "elu", "softsign")
+
+    def tearDown(self: "NumpyQModelTests") -> None:
+        self.directory.cleanup()
+
+    def test_forward_pass(self: "NumpyQModelTests") -> None:
+        model = NumpyQModel(self.path)
+        self.assertEqual((model.input_dim, model.output_dim), (42, 7))
+
+        states = np.random.default_rng(0).choice([-1.0, 0.0, 1.0], size=(5, 42))
+        # dense layers with elu activations and a softsign output, as DeepQModel.create_NN
+        expected_q_values = states
+        for kernel, bias in zip(self.kernels[:-1], self.biases[:-1]):
+            outputs = expected_q_values @ kernel + bias
+            expected_q_values = np.where(outputs > 0, outputs, np.exp(outputs) - 1)
+        outputs = expected_q_values @ self.kernels[-1] + self.biases[-1]
+        expected_q_values = outputs / (1 + np.abs(outputs))
+
+        q_values = model.predict(states)
+        self.assertEqual(q_values.shape, (5, 7))
+        self.assertTrue(np.allclose(q_values, expected_q_values))
+        # single states and batches give the same q values
+        self.assertTrue(np.allclose(model.predict(states[2]), q_values[2]))
+
+    def test_unknown_activation(self: "NumpyQModelTests") -> None:
+        with self.assertRaises(ValueError):
+            save_q_model_weights(self.path, self.kernels, self.biases, "swish", "softsign")
+
+    def test_mcts_player_with_q_model_evaluator(self: "NumpyQModelTests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("MCTSPlayer.normal", "ponder", "False")
+        logger_handler = LoggerHandler(config_handler)
+        game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+        evaluator = create_q_value_evaluator(NumpyQModel(self.path).predict)
+
+        priors, win_prediction = evaluator(game)
+        self.assertAlmostEqual(np.sum(priors), 1.0)
+        self.assertGreaterEqual(win_prediction, 0.0)
+        self.assertLessEqual(win_prediction, 1.0)
+
+        player = MCTSPlayerFactory.create_player(
+            game,
+            1,
+            -1,
+            MCTSPlayerNames.normal,
+            config_handler,
+            logger_handler,
+            evaluator=evaluator,
+        )
+        self.assertIn(player.make_action(game, game.get_available_actions()), game.get_available_actions())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory, MCTSPlayerNames
+from OpeningBook import OpeningBook, create_table, get_opening_book_key, insert_entry
+from OpeningBookBuilder import OpeningBookBuilder, get_opening_positions
+
+
+class OpeningBookTests(unittest.TestCase):
+    def _play(self: "OpeningBookTests", actions: list[int], starting_player: int = 1) -> Connect4:
+        game = Connect4(game_turn_handler=GameTurnHandler([starting_player, -starting_player]))
+        for action in actions:
+            game.place_disc(action)
+            game.next_turn()
+        return game
+
+    def test_key_is_canonical(self: "OpeningBookTests") -> None:
+        key, is_mirrored = get_opening_book_key(self._play([0, 3]))
+        mirrored_key, is_mirrored_mirrored = get_opening_book_key(self._play([6, 3]))
+        self.assertEqual(key, mirrored_key)
+        self.assertNotEqual(is_mirrored, is_mirrored_mirrored)
+
+        # the key is relative to the player to move, so the colors do not matter
+        self.assertEqual(
+            get_opening_book_key(self._play([2, 4], starting_player=-1))[0],
+            get_opening_book_key(self._play([2, 4]))[0],
+        )
+        self.assertNotEqual(get_opening_book_key(self._play([2]))[0], get_opening_book_key(self._play([2, 4]))[0])
+
+    def test_lookup(self: "OpeningBookTests") -> None:
+        game = self._play([0])
+        key, is_mirrored = get_opening_book_key(game)
+        table = create_table(1)
+        insert_entry(table["key"], table["action"], table["value"], key, 5 if is_mirrored else 1, 0.75)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "opening_book.npy")
+            np.save(path, table)
+            opening_book = OpeningBook(path)
+
+            self.assertEqual(opening_book.get_number_of_entries(), 1)
+            self.assertEqual(opening_book.lookup(game), (1, 0.75))
+            self.assertEqual(opening_book.lookup(self._play([6])), (5, 0.75))
+            self.assertIsNone(opening_book.lookup(self._play([3])))
+
+    def test_opening_positions(self: "OpeningBookTests") -> None:
+        self.assertEqual(len(get_opening_positions(0)), 1)
+        # the 7 first moves are 4 positions up to mirroring
+        self.assertEqual(len(get_opening_positions(1)), 5)
+
+    def test_build_and_play_from_book(self: "OpeningBookTests") -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "opening_book.npy")
+            config_handler = ConfigHandler()
+            config_handler._config_parser.set("opening_book", "path", path)
+            config_handler._config_parser.set("opening_book", "no_plies", "1")
+            config_handler._config_parser.set("opening_book", "player_name", "normal")
+            logger_handler = LoggerHandler(config_handler)
+            OpeningBookBuilder(config_handler, logger_handler).build_and_save()
+
+            opening_book = OpeningBook(path)
+            self.assertEqual(opening_book.get_number_of_entries(), 5)
+
+            config_handler._config_parser.set("MCTSPlayer.normal", "opening_book_path", path)
+            game = self._play([])
+            player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.normal, config_handler, logger_handler)
+            action = player.make_action(game, game.get_available_actions())
+            self.assertEqual(action, opening_book.lookup(game)[0])
+            self.assertEqual(player.number_of_playouts, 0)
+
+            # positions outside the book are searched
+            game = self._play([3, 3])
+            action = player.make_action(game, game.get_available_actions())
+            self.assertIn(action, game.get_available_actions())
+            self.assertGreater(player.number_of_playouts, 0)
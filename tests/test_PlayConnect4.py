@@ -0,0 +1,48 @@
+import re
+import unittest
+from unittest import mock
+
+import matplotlib.pyplot as plt
+
+import GameTurnHandler
+from ConfigHandler import ConfigHandler, GameConfig
+from Connect4GameFactory import Connect4GameFactory
+from LoggerHandler import LoggerHandler
+from PlayConnect4 import PlayConnect4
+
+
+def answer_question(question: str) -> str:
+    # quick start with the AI starting, the human always plays the leftmost available column
+    if "play a game" in question:
+        return "q"
+    if "difficulty" in question:
+        return "p"
+    if "column" in question:
+        return re.findall(r"(\d+)\)?[,\]]", question)[0]
+    return ""
+
+
+class PlayConnect4Tests(unittest.TestCase):
+    def test_perfect_difficulty_from_empty_board(self: "PlayConnect4Tests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("solver", "time_limit_ms", "100")
+        logger_handler = LoggerHandler(config_handler)
+        game_turn_handler = GameTurnHandler.GameTurnHandler()
+        game = Connect4GameFactory.create_game(GameConfig(config_handler).engine, game_turn_handler=game_turn_handler)
+        playconnect4 = PlayConnect4(game, game_turn_handler, logger_handler, config_handler)
+
+        with mock.patch("builtins.input", side_effect=answer_question), mock.patch("builtins.print"):
+            playconnect4.setup_game()
+            playconnect4.prepare_game()
+            # the game ends with sys.exit
+            with self.assertRaises(SystemExit):
+                playconnect4.start_game()
+        plt.close("all")
+
+        self.assertEqual(playconnect4.difficulty, "p")
+        self.assertEqual(playconnect4._starting_player, -playconnect4.human_color_wish)
+        self.assertEqual(game.get_winner(), -playconnect4.human_color_wish)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ReplayBuffer import ReplayBuffer
+
+
+def create_transitions(first: int, number: int) -> tuple:
+    # transitions whose values identify them by their number
+    numbers = np.arange(first, first + number)
+    states = np.repeat(numbers[:, None], 3, axis=1).astype(np.float32)
+    return states, numbers, numbers.astype(np.float32), -states, (numbers % 2).astype(np.float32)
+
+
+class ReplayBufferTests(unittest.TestCase):
+    def test_add_and_sample(self: "ReplayBufferTests") -> None:
+        replay_buffer = ReplayBuffer(10, 3)
+        replay_buffer.add_transitions(*create_transitions(0, 4))
+        self.assertEqual(replay_buffer.get_number_of_transitions(), 4)
+
+        states, actions, rewards, next_states, terminations = replay_buffer.sample(50, np.random.default_rng(0))
+        self.assertEqual(states.shape, (50, 3))
+        self.assertTrue(set(actions) <= {0, 1, 2, 3})
+        # the arrays of a sample belong to the same transitions
+        self.assertTrue(np.array_equal(states[:, 0], actions))
+        self.assertTrue(np.array_equal(rewards, actions))
+        self.assertTrue(np.array_equal(next_states, -states))
+        self.assertTrue(np.array_equal(terminations, actions % 2))
+
+    def test_overwrite_oldest(self: "ReplayBufferTests") -> None:
+        replay_buffer = ReplayBuffer(10, 3)
+        replay_buffer.add_transitions(*create_transitions(0, 8))
+        replay_buffer.add_transitions(*create_transitions(8, 5))
+        self.assertEqual(replay_buffer.get_number_of_transitions(), 10)
+        _, actions, _, _, _ = replay_buffer.sample(500, np.random.default_rng(0))
+        self.assertEqual(set(actions), set(range(3, 13)))
+
+        # a batch larger than the capacity keeps its newest transitions
+        replay_buffer.add_transitions(*create_transitions(100, 25))
+        _, actions, _, _, _ = replay_buffer.sample(500, np.random.default_rng(0))
+        self.assertEqual(set(actions), set(range(115, 125)))
+
+    def test_save_and_load(self: "ReplayBufferTests") -> None:
+        replay_buffer = ReplayBuffer(10, 3)
+        replay_buffer.add_transitions(*create_transitions(0, 13))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replay_buffer.npz")
+            replay_buffer.save(path)
+            loaded_replay_buffer = ReplayBuffer(10, 3)
+            loaded_replay_buffer.load(path)
+
+        self.assertEqual(loaded_replay_buffer.get_number_of_transitions(), 10)
+        for expected, loaded in zip(
+            replay_buffer.sample(100, np.random.default_rng(1)),
+            loaded_replay_buffer.sample(100, np.random.default_rng(1)),
+        ):
+            self.assertTrue(np.array_equal(expected, loaded))
+
+        # new transitions continue to overwrite the oldest ones
+        loaded_replay_buffer.add_transitions(*create_transitions(13, 1))
+        _, actions, _, _, _ = loaded_replay_buffer.sample(500, np.random.default_rng(0))
+        self.assertEqual(set(actions), set(range(4, 14)))
+
+
+if __name__ == "__main__":
+    unittest.main()
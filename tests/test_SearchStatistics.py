@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from LoggerHandler import LoggerHandler
+from MCTSPlayerFactory import MCTSPlayerFactory, MCTSPlayerNames
+from SearchStatistics import SearchStatistics
+
+
+class SearchStatisticsTests(unittest.TestCase):
+    def test_counters(self: "SearchStatisticsTests") -> None:
+        statistics = SearchStatistics(max_depth=5)
+        statistics.add_tree_lookup(True)
+        statistics.add_tree_lookup(False)
+        statistics.add_expansion(0.5)
+        statistics.add_simulation(1.0, 2.0, 0.5, 3, 10)
+        statistics.add_simulation(1.0, 2.0, 0.5, 5, 0)
+        statistics.finish(10.0, 7, np.full(7, 1 / 7))
+
+        self.assertEqual(statistics.number_of_transposition_hits, 1)
+        self.assertEqual(statistics.number_of_nodes_created, 1)
+        self.assertEqual(statistics.number_of_simulations, 2)
+        self.assertEqual(statistics.max_selection_depth, 5)
+        self.assertAlmostEqual(statistics.get_mean_selection_depth(), 4)
+        self.assertAlmostEqual(statistics.get_mean_rollout_length(), 5)
+        self.assertAlmostEqual(statistics.get_simulations_per_second(), 0.2)
+        self.assertEqual(
+            statistics.get_time_shares(),
+            {"selection": 0.2, "expansion": 0.05, "rollout": 0.4, "backpropagation": 0.1},
+        )
+        self.assertEqual(statistics.to_dict()["tree_size"], 7)
+        self.assertIn("simulations=[2]", str(statistics))
+
+    def test_statistics_are_only_collected_if_enabled(self: "SearchStatisticsTests") -> None:
+        for collect_statistics in [False, True]:
+            player, game = create_player(collect_statistics)
+            player.make_action(game, game.get_available_actions())
+
+            self.assertEqual(player.search_statistics is not None, collect_statistics)
+            player.close()
+
+    def test_statistics_of_search(self: "SearchStatisticsTests") -> None:
+        player, game = create_player(True)
+        player.make_action(game, game.get_available_actions())
+        statistics = player.search_statistics
+        player.close()
+
+        self.assertIsNotNone(statistics)
+        self.assertEqual(statistics.number_of_simulations, player.number_of_playouts)
+        self.assertEqual(statistics.number_of_nodes_created, statistics.tree_size)
+        self.assertEqual(statistics.tree_size, player.get_number_of_nodes())
+        self.assertGreater(statistics.number_of_transposition_hits, 0)
+        self.assertLessEqual(statistics.max_selection_depth, statistics.max_depth + 1)
+        self.assertGreater(statistics.search_time, 0)
+        self.assertLessEqual(sum(statistics.get_time_shares().values()), 1)
+        self.assertAlmostEqual(float(np.sum(statistics.root_visit_distribution)), 1)
+
+    def test_statistics_of_tree_parallel_search(self: "SearchStatisticsTests") -> None:
+        player, game = create_player(True, tree_parallel_threads=4)
+        player.make_action(game, game.get_available_actions())
+        statistics = player.search_statistics
+        player.close()
+
+        self.assertIsNotNone(statistics)
+        self.assertEqual(statistics.number_of_simulations, player.number_of_playouts)
+        self.assertEqual(statistics.number_of_nodes_created, statistics.tree_size)
+
+
+def create_player(collect_statistics: bool, tree_parallel_threads: int = 1) -> tuple:
+    config_handler = ConfigHandler()
+    config_handler._config_parser.set("MCTSPlayer.normal", "collect_statistics", str(collect_statistics))
+    config_handler._config_parser.set("MCTSPlayer.normal", "tree_parallel_threads", str(tree_parallel_threads))
+    config_handler._config_parser.set("MCTSPlayer.normal", "ponder", "False")
+    logger_handler = LoggerHandler(config_handler)
+    game = Connect4(game_turn_handler=GameTurnHandler([1, -1]))
+    player = MCTSPlayerFactory.create_player(game, 1, -1, MCTSPlayerNames.normal, config_handler, logger_handler)
+    return player, game
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from SelfPlayDataset import SelfPlayDataset
+
+
+def create_samples(first: int, number: int) -> tuple:
+    # samples whose values identify them by their number
+    numbers = np.arange(first, first + number, dtype=np.float32)
+    return np.repeat(numbers[:, None], 42, axis=1), np.repeat(numbers[:, None], 7, axis=1), numbers
+
+
+class SelfPlayDatasetTests(unittest.TestCase):
+    def setUp(self: "SelfPlayDatasetTests") -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "dataset")
+
+    def tearDown(self: "SelfPlayDatasetTests") -> None:
+        self.directory.cleanup()
+
+    def test_write_and_read(self: "SelfPlayDatasetTests") -> None:
+        dataset = SelfPlayDataset(self.path)
+        self.assertEqual(dataset.get_number_of_samples(), 0)
+        self.assertEqual(len(dataset.read_latest(10)[2]), 0)
+
+        dataset.write_shard(*create_samples(0, 5))
+        dataset.write_shard(*create_samples(5, 3))
+        dataset.write_shard(*create_samples(8, 4))
+        self.assertEqual(len(dataset.get_shard_paths()), 3)
+        self.assertEqual(dataset.get_number_of_samples(), 12)
+
+        states, policies, values = dataset.read_latest(100)
+        self.assertTrue(np.array_equal(values, np.arange(12)))
+        self.assertEqual(states.shape, (12, 42))
+        self.assertEqual(policies.shape, (12, 7))
+
+        # only the newest samples are read
+        states, policies, values = dataset.read_latest(6)
+        self.assertTrue(np.array_equal(values, np.arange(6, 12)))
+        self.assertTrue(np.array_equal(states[:, 0], values))
+        self.assertTrue(np.array_equal(policies[:, 0], values))
+
+    def test_shared_directory(self: "SelfPlayDatasetTests") -> None:
+        # samples of other writers and unfinished shards
+        SelfPlayDataset(self.path).write_shard(*create_samples(0, 2))
+        SelfPlayDataset(self.path).write_shard(*create_samples(2, 2))
+        with open(os.path.join(self.path, ".unfinished.tmp.npz"), "wb") as file:
+            file.write(b"partial")
+
+        dataset = SelfPlayDataset(self.path)
+        self.assertEqual(dataset.get_number_of_samples(), 4)
+        self.assertTrue(np.array_equal(dataset.read_latest(10)[2], np.arange(4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from ConfigHandler import ConfigHandler
+from LoggerHandler import LoggerHandler
+from TournamentRunner import MatchResult, TournamentRunner, score_to_elo
+
+
+class TournamentRunnerTests(unittest.TestCase):
+    def test_match_result(self: "TournamentRunnerTests") -> None:
+        match_result = MatchResult("a", "b")
+        for winner, game_length in [(1, 7), (1, 9), (0, 42), (-1, 10)]:
+            match_result.add_game(winner, game_length)
+
+        self.assertEqual(match_result.get_number_of_games(), 4)
+        self.assertAlmostEqual(match_result.get_win_rate(), 0.5)
+        self.assertAlmostEqual(match_result.get_draw_rate(), 0.25)
+        self.assertAlmostEqual(match_result.get_loss_rate(), 0.25)
+        self.assertAlmostEqual(match_result.get_average_game_length(), 17)
+        self.assertAlmostEqual(match_result.get_score(), 0.625)
+        self.assertGreater(match_result.get_elo_difference(), 0)
+
+        lower_elo, upper_elo = match_result.get_elo_confidence_interval(1.96)
+        self.assertLess(lower_elo, match_result.get_elo_difference())
+        self.assertGreater(upper_elo, match_result.get_elo_difference())
+        self.assertFalse(match_result.is_result_clear(1.96))
+
+    def test_score_to_elo(self: "TournamentRunnerTests") -> None:
+        self.assertAlmostEqual(score_to_elo(0.5), 0)
+        self.assertAlmostEqual(score_to_elo(0.75), -score_to_elo(0.25))
+        self.assertTrue(np.isfinite(score_to_elo(1.0)))
+
+    def test_normal_vs_random_stops_early(self: "TournamentRunnerTests") -> None:
+        config_handler = ConfigHandler()
+        config_handler._config_parser.set("tournament", "number_of_workers", "2")
+        config_handler._config_parser.set("tournament", "min_number_of_games", "6")
+        logger_handler = LoggerHandler(config_handler)
+        tournament_runner = TournamentRunner(config_handler, logger_handler)
+
+        match_result = tournament_runner.play_match("normal", "random", 30, stop_early=True)
+
+        self.assertGreaterEqual(match_result.get_number_of_games(), 6)
+        self.assertLess(match_result.get_number_of_games(), 30)
+        self.assertGreater(match_result.get_win_rate(), 0.9)
+        self.assertTrue(match_result.is_result_clear(1.96))
@@ -0,0 +1,205 @@
+import unittest
+
+import numpy as np
+
+from Connect4Bitboard import Connect4Bitboard
+from Connect4Game import Connect4
+from GameTurnHandler import GameTurnHandler
+from Tree import ArrayTree, Tree
+
+
+class TreeTests(unittest.TestCase):
+    def _fill_tree(self: "TreeTests", tree: Tree | ArrayTree) -> None:
+        tree.new_node(11, np.array([0, 2, 3]), np.array([0, 1, 0]), np.ones(3) / 3, 0.5)
+        tree.new_node(22, np.array([1, 3]), np.array([2, 1]), np.array([0.25, 0.75]), 0.4)
+        tree.update_next_state_hash(11, 2, 22)
+
+        tree.update_node(11, 3, 1.0, np.array([0, 2]), np.array([0, 1]))
+        tree.update_node(11, 2, 0.0, np.array([0]), np.array([1]))
+        tree.update_node(22, 1, 1.0, np.array([]), np.array([]))
+
+    def test_same_statistics_for_dict_and_array_tree(self: "TreeTests") -> None:
+        tree = Tree()
+        array_tree = ArrayTree(7)
+        self._fill_tree(tree)
+        self._fill_tree(array_tree)
+
+        self.assertEqual(tree.get_number_of_nodes(), array_tree.get_number_of_nodes())
+        for state_hash in [11, 22]:
+            node = tree.get_node(state_hash)
+            array_node = array_tree.get_node(state_hash)
+            self.assertAlmostEqual(tree.get_prior_win_prediction(node), array_tree.get_prior_win_prediction(array_node))
+            for action in node["actions"]:
+                self.assertAlmostEqual(tree.get_q_value(node, action), array_tree.get_q_value(array_node, action))
+            for max_bool in [True, False]:
+                self.assertEqual(
+                    tree.select_node_action(node, 1.0, 1.0, max_bool),
+                    array_tree.select_node_action(array_node, 1.0, 1.0, max_bool),
+                )
+
+        # amaf of action 0 is updated by the first update, and is not by the second (wrong row height)
+        node = array_tree.get_node(11)
+        self.assertEqual(array_tree.amaf_no_visits_actions[node, 0], 1)
+        self.assertEqual(array_tree.no_visits[node], 2)
+        self.assertEqual(array_tree.children[node, array_tree.actions_idx[node, 2]], array_tree.get_node(22))
+
+    def test_array_tree_grows(self: "TreeTests") -> None:
+        tree = ArrayTree(7, capacity=2)
+        self.assertEqual(tree.get_memory_usage(), 2 * tree.get_bytes_per_node())
+
+        for state_hash in range(5):
+            tree.new_node(state_hash, np.array([state_hash % 7]), np.array([0]), np.ones(1), 0.5)
+            tree.update_node(state_hash, state_hash % 7, 1.0, np.array([]), np.array([]))
+
+        self.assertEqual(tree.get_number_of_nodes(), 5)
+        self.assertEqual(tree.get_capacity(), 8)
+        for state_hash in range(5):
+            node = tree.get_node(state_hash)
+            self.assertEqual(tree.no_visits[node], 1)
+            self.assertEqual(tree.get_q_value(node, state_hash % 7), 1.0)
+
+    def test_add_action_statistics(self: "TreeTests") -> None:
+        for tree in [Tree(), ArrayTree(7)]:
+            self._fill_tree(tree)
+            node = tree.get_node(11)
+            tree.add_action_statistics(node, np.array([3, 0]), np.array([3, 2]), np.array([0.0, 0.5]))
+
+            actions, no_visits_actions, q_values = tree.get_action_statistics(node)
+            self.assertEqual(list(actions), [0, 2, 3])
+            self.assertEqual(list(no_visits_actions), [2, 1, 4])
+            self.assertAlmostEqual(tree.get_q_value(node, 3), 0.25)
+            self.assertAlmostEqual(tree.get_q_value(node, 0), 0.5)
+            self.assertAlmostEqual(q_values[1], 0.0)
+
+    def test_update_path_equals_update_node(self: "TreeTests") -> None:
+        rng = np.random.default_rng(0)
+        for tree_type in [Tree, ArrayTree]:
+            for _ in range(20):
+                path_actions = rng.integers(0, 7, size=12)
+                path_row_heights = rng.integers(0, 3, size=12)
+                states_mirrored = rng.random(8) < 0.5
+                state_hashes = list(range(8))
+                tree, reference_tree = tree_type(7), tree_type(7)
+                for state_hash, path_action, is_mirrored in zip(state_hashes, path_actions, states_mirrored):
+                    # the available actions are in the frame of the node, and contain the action of the path
+                    action = 6 - path_action if is_mirrored else path_action
+                    available_actions = rng.permutation(np.setdiff1d(np.arange(7), [action]))[: rng.integers(0, 6)]
+                    available_actions = rng.permutation(np.append(available_actions, action))
+                    next_row_heights = rng.integers(0, 3, size=len(available_actions))
+                    priors = np.ones(len(available_actions)) / len(available_actions)
+                    for new_tree in [tree, reference_tree]:
+                        new_tree.new_node(state_hash, available_actions, next_row_heights, priors, 0.5)
+
+                tree.update_path(
+                    state_hashes,
+                    states_mirrored,
+                    len(state_hashes),
+                    path_actions,
+                    path_row_heights,
+                    len(path_actions),
+                    1.0,
+                )
+                for idx, state_hash in enumerate(state_hashes):
+                    following_actions = path_actions[idx + 2 :: 2]
+                    mirror = 6 if states_mirrored[idx] else 0
+                    reference_tree.update_node(
+                        state_hash,
+                        abs(mirror - path_actions[idx]),
+                        1.0,
+                        np.abs(mirror - following_actions),
+                        path_row_heights[idx + 2 :: 2],
+                    )
+
+                for state_hash in state_hashes:
+                    node, reference_node = tree.get_node(state_hash), reference_tree.get_node(state_hash)
+                    if tree_type is Tree:
+                        self.assertEqual(node["no_visits"], reference_node["no_visits"])
+                        np.testing.assert_array_equal(node["q_values"], reference_node["q_values"])
+                        np.testing.assert_array_equal(node["amaf_q_values"], reference_node["amaf_q_values"])
+                        np.testing.assert_array_equal(
+                            node["amaf_no_visits_actions"],
+                            reference_node["amaf_no_visits_actions"],
+                        )
+                    else:
+                        self.assertEqual(tree.no_visits[node], reference_tree.no_visits[reference_node])
+                        np.testing.assert_array_equal(tree.q_values[node], reference_tree.q_values[reference_node])
+                        np.testing.assert_array_equal(
+                            tree.amaf_q_values[node],
+                            reference_tree.amaf_q_values[reference_node],
+                        )
+                        np.testing.assert_array_equal(
+                            tree.amaf_no_visits_actions[node],
+                            reference_tree.amaf_no_visits_actions[reference_node],
+                        )
+
+    def test_prune(self: "TreeTests") -> None:
+        for tree in [Tree(), ArrayTree(7)]:
+            self._fill_tree(tree)
+            tree.new_node(33, np.array([4]), np.array([0]), np.ones(1), 0.5)
+            tree.new_node(44, np.array([5]), np.array([0]), np.ones(1), 0.5)
+            tree.update_next_state_hash(22, 3, 44)
+
+            # 33 is not reachable from 11
+            self.assertEqual(tree.prune(11), 1)
+            self.assertEqual(tree.get_number_of_nodes(), 3)
+            self.assertFalse(tree.is_node_in_tree(33))
+
+            # the least visited node (44) is evicted by the node cap
+            self.assertEqual(tree.prune(11, max_number_of_nodes=2), 1)
+            self.assertTrue(tree.is_node_in_tree(11))
+            self.assertTrue(tree.is_node_in_tree(22))
+            self.assertFalse(tree.is_node_in_tree(44))
+            self.assertAlmostEqual(tree.get_q_value(tree.get_node(22), 1), 1.0)
+
+            # the new root keeps its subtree
+            self.assertEqual(tree.prune(22), 1)
+            self.assertEqual(tree.get_number_of_nodes(), 1)
+
+            # the tree can grow again after pruning
+            tree.new_node(55, np.array([6]), np.array([0]), np.ones(1), 0.5)
+            tree.update_next_state_hash(22, 1, 55)
+            tree.update_node(55, 6, 1.0, np.array([]), np.array([]))
+            self.assertEqual(tree.prune(22), 0)
+            self.assertAlmostEqual(tree.get_q_value(tree.get_node(55), 6), 1.0)
+
+    def test_prune_with_empty_board_hash(self: "TreeTests") -> None:
+        for game_class in [Connect4, Connect4Bitboard]:
+            for tree in [Tree(), ArrayTree(7)]:
+                # empty board -> 3 -> 3 and empty board -> 0, the empty board has the hash 0
+                game = game_class(game_turn_handler=GameTurnHandler([1, -1]))
+                state_hashes = [game.get_state_hash()]
+                for action in [3, 3]:
+                    game.place_disc(action)
+                    game.next_turn()
+                    state_hashes.append(game.get_state_hash())
+                game = game_class(game_turn_handler=GameTurnHandler([1, -1]))
+                game.place_disc(0)
+                sibling_state_hash = game.get_state_hash()
+                self.assertEqual(state_hashes[0], 0)
+
+                actions = np.arange(7)
+                for state_hash in [*state_hashes, sibling_state_hash]:
+                    tree.new_node(state_hash, actions, np.zeros(7), np.ones(7) / 7, 0.5)
+                tree.update_next_state_hash(state_hashes[0], 3, state_hashes[1])
+                tree.update_next_state_hash(state_hashes[1], 3, state_hashes[2])
+                tree.update_next_state_hash(state_hashes[0], 0, sibling_state_hash)
+
+                # unknown children of the new root do not link back to the empty board
+                self.assertEqual(tree.prune(state_hashes[1]), 2)
+                self.assertFalse(tree.is_node_in_tree(state_hashes[0]))
+                self.assertFalse(tree.is_node_in_tree(sibling_state_hash))
+                self.assertTrue(tree.is_node_in_tree(state_hashes[2]))
+
+    def test_prune_keeps_array_tree_consistent(self: "TreeTests") -> None:
+        tree = ArrayTree(7)
+        self._fill_tree(tree)
+        tree.new_node(33, np.array([4]), np.array([0]), np.ones(1), 0.5)
+        tree.update_node(33, 4, 1.0, np.array([]), np.array([]))
+
+        tree.prune(22)
+        node = tree.get_node(22)
+        self.assertEqual(node, 0)
+        self.assertEqual(tree.no_visits[node], 1)
+        self.assertEqual(tree.no_visits[1], 0)
+        self.assertEqual(tree.state_hashes[1], 0)
+        self.assertTrue(np.all(tree.children[:1] == -1))